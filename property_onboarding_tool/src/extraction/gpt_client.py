@@ -1,13 +1,792 @@
 import openai
+import asyncio
+import copy
 import json
 import time
 import re
-from typing import Dict, Any, Optional, List, Tuple
+import sys
+import functools
+from collections import defaultdict
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional, List, Tuple, Collection
 from dataclasses import dataclass
 from src.utils.config import get_config
 from src.utils.logging_config import get_logger
 from src.extraction.scraper import crawl_site, build_context
 
+# Fields that count towards Node 2 completeness in _is_node2_sparse
+_SPARSE_PAYMENT_KEYS = ('booking_deposit', 'security_deposit', 'payment_installment_plan', 'mode_of_payment')
+_SPARSE_CANCELLATION_KEYS = ('cooling_off_period', 'no_visa_no_pay', 'no_place_no_pay')
+
+# Optional faster JSON codec for JSON-LD blocks and mock responses; falls back to the json module
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+def _json_dumps_pretty(data: Any) -> str:
+    """Serialize to two-space indented JSON, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+# Cancellation policy synonyms used by _postprocess_node2_enrich (pattern, policy key)
+_POLICY_SYNONYM_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    (r'cooling\s*off', 'cooling_off_period'),
+    (r'no\s*visa\s*no\s*pay|visa\s*(rejected|refused)', 'no_visa_no_pay'),
+    (r'no\s*place\s*no\s*pay', 'no_place_no_pay'),
+    (r'course\s*(cancel|change|modif)', 'university_course_cancellation_or_modification'),
+    (r'early\s*(termination|release|surrender)', 'early_termination_by_student'),
+    (r'delayed\s*arrivals|travel\s*restriction|quarantine', 'delayed_arrivals_or_travel_restrictions'),
+    (r'replacement\s*tenant|re[- ]?let|reassign', 'replacement_tenant_found'),
+    (r'defer|deferral|postpone', 'deferring_studies'),
+    (r'intake\s*delayed|semester\s*delayed|term\s*delayed', 'university_intake_delayed'),
+    (r'no\s*questions\s*asked', 'no_questions_asked'),
+    (r'extenuating\s*circumstances|exceptional\s*circumstances|medical\s*reason', 'extenuating_circumstances'),
+)
+
+
+class _RegexSpanMatcher:
+    """Finds the first match span per key, as one `re.search` per pattern would, in a single walk.
+
+    The combined alternation is a zero-width lookahead, so a match of one key never consumes text
+    that an overlapping match of another key needs; every position where some key matches is
+    visited, and the keys still missing are tried there with their own pattern.
+    """
+
+    def __init__(self, patterns: Tuple[Tuple[str, str], ...]):
+        self._keys = [key for _, key in patterns]
+        self._patterns = {key: re.compile(p, re.IGNORECASE) for p, key in patterns}
+        self._combined = re.compile("(?=" + "|".join(f"(?:{p})" for p, _ in patterns) + ")", re.IGNORECASE)
+
+    def scan(self, text: str, wanted: Collection[str]) -> Dict[str, Tuple[int, int]]:
+        spans: Dict[str, Tuple[int, int]] = {}
+        remaining = set(wanted).intersection(self._keys)
+        if not remaining:
+            return spans
+        for m in self._combined.finditer(text):
+            pos = m.start()
+            for key in tuple(remaining):
+                km = self._patterns[key].match(text, pos)
+                if km:
+                    spans[key] = km.span()
+                    remaining.discard(key)
+            if not remaining:
+                break
+        return spans
+
+
+@functools.cache
+def _get_policy_matcher():
+    """Build the policy synonym matcher once.
+
+    Plain `re` only: Hyperscan's caseless and \\s matching differ from `re`'s Unicode rules
+    (e.g. NBSP, dotted/dotless i), so a Hyperscan pre-pass could miss synonyms `re` finds.
+    """
+    return _RegexSpanMatcher(_POLICY_SYNONYM_PATTERNS)
+
+# Precompiled patterns for _derive_node1_hints_from_pages (scanned once per crawled page)
+_MARKER_BLOCK_KINDS = (
+    "STRUCTURED DATA", "MAP COORDINATES", "ADDRESS INFO", "PROPERTY TYPE",
+    "CONTACT INFO", "DEFINITION LIST", "FOOTER CONTENT", "TABLE", "LIST",
+)
+# Every open/close block marker emitted by the scraper; TABLE and LIST openers carry a ": TYPE]" suffix
+_ALL_MARKERS_RE = re.compile(
+    r"\[(?:(?P<open>STRUCTURED DATA|MAP COORDINATES|ADDRESS INFO|PROPERTY TYPE|CONTACT INFO|DEFINITION LIST|FOOTER CONTENT)\]"
+    r"|(?P<open_typed>TABLE|LIST): (?P<block_type>[^\]\n]*)\]"
+    r"|END (?P<close>STRUCTURED DATA|MAP COORDINATES|ADDRESS INFO|PROPERTY TYPE|CONTACT INFO|DEFINITION LIST|FOOTER CONTENT|TABLE|LIST)\])"
+)
+# "• item" lines inside a [LIST: TYPE] block; captures the item text without the bullet or padding
+_BULLET_LINE_RE = re.compile(r"(?m)^[^\S\n]*•[^\S\n]*(\S.*?)[^\S\n]*$")
+_JSON_OBJECT_RE = re.compile(r"\{[\s\S]*\}")
+_MAP_LAT_RE = re.compile(r"Latitude:\s*([-\d\.]+)")
+_MAP_LNG_RE = re.compile(r"Longitude:\s*([-\d\.]+)")
+_POSTCODE_RE = re.compile(r'\b[A-Z]{1,2}[0-9][A-Z0-9]?\s*[0-9][A-Z]{2}\b', re.IGNORECASE)
+_CITY_RES = [
+    re.compile(r'\b(?:in|at|near)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b', re.IGNORECASE),
+    re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*(?:West\s+)?(?:Yorkshire|England|UK|United\s+Kingdom)\b', re.IGNORECASE),
+]
+_STREET_RE = re.compile(r'\b\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Street|Road|Avenue|Lane|Drive|Close|Way)\b', re.IGNORECASE)
+_CONTACT_PHONE_RE = re.compile(r'Phone:\s*([+\d\s\(\)\-]+)')
+# Footer fields scanned together by _get_footer_matcher (pattern, footer key). Each pattern is
+# one whole-match group, so the match span is the value. Matched case-insensitively.
+_FOOTER_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    (r'(\+44\s*\d{1,4}\s*\d{1,4}\s*\d{1,4}|\(0\)\d{1,4}\s*\d{1,4}\s*\d{1,4}|0\d{1,4}\s*\d{1,4}\s*\d{1,4})', 'footer_phone'),
+    (r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', 'footer_email'),
+    (r'(\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Street|Road|Avenue|Lane|Drive|Close|Way))', 'footer_address'),
+)
+_FOOTER_KEYS = tuple(key for _, key in _FOOTER_PATTERNS)
+# Guarantor requirement patterns in priority order (pattern, hint key)
+_GUARANTOR_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    (r'guarantor\s+(?:is\s+)?(?:required|needed|mandatory)', 'guarantor_required'),
+    (r'(?:no|not\s+required)\s+guarantor', 'no_guarantor'),
+    (r'guarantor\s+(?:not\s+)?(?:required|needed)', 'guarantor_optional'),
+    (r'international\s+guarantor', 'international_guarantor'),
+    (r'local\s+guarantor\s+only', 'local_guarantor_only'),
+    (r'third\s+party\s+guarantor\s+service', 'third_party_guarantor'),
+    (r'parent.*signature.*required', 'parent_signature_required'),
+    (r'co.?signer', 'co_signer_required'),
+)
+# One alternation with a named group per hint key, so each page is walked once. It is a
+# lookahead so every start position is tried: each hit names the highest-priority pattern
+# matching there, and the best hit overall is the first pattern that matches anywhere.
+# Matched against the lowercased page text, hence no IGNORECASE.
+_GUARANTOR_COMBINED_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{key}>{p})" for p, key in _GUARANTOR_PATTERNS) + ")"
+)
+_GUARANTOR_PRIORITY = {key: rank for rank, (_, key) in enumerate(_GUARANTOR_PATTERNS)}
+# Free-text lat/lng fallback (avoid false positives); also matched against lowercased text
+_LATLNG_RES = [
+    re.compile(r"lat(?:itude)?\s*[:=]?\s*([\-\d\.]{2,})\s*[,;\s]+lng|long(?:itude)?\s*[:=]?\s*([\-\d\.]{2,})"),
+    re.compile(r"\b([-\d\.]{2,}),\s*([-\d\.]{2,})\b"),  # generic pair
+]
+
+# Cap on amenity features carried into node 1 hints
+_MAX_DERIVED_FEATURES = 50
+
+# Node-specific keywords that _highlight_key_information marks up in the crawled context
+_HIGHLIGHT_PATTERNS: Dict[str, List[str]] = {
+    'node1_basic_info': [
+        r'property\s+name', r'address', r'location', r'guarantor', 
+        r'feature', r'amenity', r'facility', r'rule', r'security'
+    ],
+    'node2_description': [
+        r'about', r'description', r'overview', r'feature', 
+        r'commute', r'location', r'payment', r'deposit', r'security\s+deposit', r'booking\s+deposit', r'holding\s+fee', r'installment|instalment', r'mode\s+of\s+payment', r'platform\s+fee', r'additional\s+fees',
+        r'policy', r'policies', r'house\s+rules', r'rules', r'cancellation', r'no\s+visa\s+no\s+pay', r'no\s+place\s+no\s+pay', r'refund', r'deferring', r'delayed\s+arrivals', r'extenuating', r'replacement\s+tenant', r'intake\s+delayed', r'pet\s+policy|pets', r'faq'
+    ],
+    'node3_configuration': [
+        r'room', r'studio', r'apartment', r'flat', r'accommodation',
+        r'price', r'cost', r'fee', r'rent', r'area', r'size', r'floor',
+        r'bedroom', r'bathroom', r'ensuite', r'en-suite', r'kitchen',
+        r'furniture', r'equipped', r'feature', r'amenity'
+    ],
+    'node4_tenancy': [
+        r'tenancy', r'contract', r'lease', r'term', r'duration',
+        r'week', r'month', r'year', r'availability', r'available',
+        r'start', r'end', r'date', r'price', r'cost', r'deposit'
+    ]
+}
+# "=== LABEL: url ===" source headers emitted by build_context
+_SOURCE_HEADER_RE = re.compile(r'===\s+[^=]+\s+===')
+
+
+@functools.lru_cache(maxsize=16)
+def _compiled_highlight_for(node_name: str) -> Optional[re.Pattern]:
+    """Compile a node's highlight keywords into one alternation, once per node name.
+    The context is then walked once instead of once per keyword. The trailing run is capped at
+    200 chars so one keyword cannot swallow a whole section and the backtracker's work per hit
+    stays bounded. Keep the bound if this is edited.
+    """
+    patterns = _HIGHLIGHT_PATTERNS.get(node_name)
+    if not patterns:
+        return None
+    return re.compile("(?:" + "|".join(patterns) + ")[\\w\\s\\-.,;:()]{1,200}", re.IGNORECASE)
+
+
+@functools.cache
+def _get_footer_matcher():
+    """Build the footer phone/email/address matcher once (plain `re`, see _get_policy_matcher)"""
+    return _RegexSpanMatcher(_FOOTER_PATTERNS)
+
+
+def _scan_page_markers(text: str) -> Dict[str, list]:
+    """Collect the raw body of every [KIND] ... [END KIND] block on a page in a single pass.
+    TABLE and LIST blocks are collected as (type, body) pairs, all others as the body alone.
+    An opener that is followed by another opener of the same kind before its END marker is dropped.
+    """
+    blocks: Dict[str, list] = {kind: [] for kind in _MARKER_BLOCK_KINDS}
+    # No block can be closed without an END marker; skip the regex walk for plain pages
+    if "[END " not in text:
+        return blocks
+    open_at: Dict[str, Tuple[int, Optional[str]]] = {}
+    for m in _ALL_MARKERS_RE.finditer(text):
+        kind = m.group('close')
+        if kind is None:
+            typed = m.group('open_typed')
+            if typed:
+                open_at[typed] = (m.end(), m.group('block_type').strip())
+            else:
+                open_at[m.group('open')] = (m.end(), None)
+            continue
+        opened = open_at.pop(kind, None)
+        if opened is not None and m.start() > opened[0]:
+            start, block_type = opened
+            body = text[start:m.start()]
+            blocks[kind].append(body if block_type is None else (block_type, body))
+    return blocks
+
+
+def _extract_jsonld_blocks(segments: List[str]) -> List[Dict[str, Any]]:
+    """Parse the JSON-LD payload of each [STRUCTURED DATA] block, best-effort"""
+    blocks: List[Dict[str, Any]] = []
+    for segment in segments:
+        payload = segment.strip()
+        # Some sites include multiple JSON objects; try to parse best-effort
+        try:
+            data = _json_loads(payload)
+            blocks.append(data)
+        except Exception:
+            # Attempt to locate first {...} JSON object
+            m = _JSON_OBJECT_RE.search(payload)
+            if m:
+                try:
+                    data = _json_loads(m.group(0))
+                    blocks.append(data)
+                except Exception:
+                    pass
+    return blocks
+
+
+def _extract_map_coordinates(segments: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Extract map coordinates from [MAP COORDINATES] markers"""
+    for segment in segments:
+        coord_text = segment.strip()
+        lat_match = _MAP_LAT_RE.search(coord_text)
+        lng_match = _MAP_LNG_RE.search(coord_text)
+        if lat_match and lng_match:
+            lat = lat_match.group(1)
+            lng = lng_match.group(1)
+            # Validate coordinates
+            try:
+                lat_f, lng_f = float(lat), float(lng)
+                if -90 <= lat_f <= 90 and -180 <= lng_f <= 180:
+                    return lat, lng
+            except ValueError:
+                pass
+    return None, None
+
+
+def _extract_address_info(segments: List[str]) -> Dict[str, str]:
+    """Extract address info from [ADDRESS INFO] markers"""
+    address_data = {}
+    for segment in segments:
+        address_text = segment.strip()
+        # Try to parse address components
+        # Look for postcode pattern (UK: A1A 1AA, US: 12345 or 12345-6789)
+        postcode_match = _POSTCODE_RE.search(address_text)
+        if postcode_match:
+            address_data['postcode'] = postcode_match.group(0)
+        
+        # Look for city/region patterns
+        for city_re in _CITY_RES:
+            city_match = city_re.search(address_text)
+            if city_match:
+                address_data['city'] = city_match.group(1).strip()
+                break
+        
+        # Look for street address
+        street_match = _STREET_RE.search(address_text)
+        if street_match:
+            address_data['street'] = street_match.group(0)
+    return address_data
+
+
+def _extract_property_type(segments: List[str]) -> Dict[str, str]:
+    """Extract property type information"""
+    property_data = {}
+    for segment in segments:
+        type_text = segment.strip()
+        if type_text:
+            property_data['property_type'] = type_text
+            break
+    return property_data
+
+
+def _extract_contact_info(segments: List[str]) -> Dict[str, str]:
+    """Extract contact information"""
+    contact_data = {}
+    for segment in segments[:1]:
+        contact_text = segment.strip()
+        # Extract phone number
+        phone_match = _CONTACT_PHONE_RE.search(contact_text)
+        if phone_match:
+            contact_data['phone'] = phone_match.group(1).strip()
+        # Extract other contact info
+        elif contact_text:
+            contact_data['contact_details'] = contact_text
+    return contact_data
+
+
+def _extract_table_data(segments: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Extract structured data from tables"""
+    table_data = {}
+    for table_type, body in segments:
+        table_rows = table_data.setdefault(table_type, [])
+        for row in body.split('\n'):
+            if row.strip():
+                table_rows.append(row.strip())
+    return table_data
+
+
+def _extract_list_data(segments: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Extract structured data from lists"""
+    list_data = {}
+    for list_type, body in segments:
+        list_data.setdefault(list_type, []).extend(_BULLET_LINE_RE.findall(body))
+    return list_data
+
+
+def _extract_definition_list_data(segments: List[str]) -> Dict[str, str]:
+    """Extract definition list data"""
+    definition_data = {}
+    for segment in segments:
+        for line in segment.strip().split('\n'):
+            if ':' in line:
+                key, value = line.split(':', 1)
+                key = key.strip()
+                value = value.strip()
+                if key and value:
+                    definition_data[key] = value
+    return definition_data
+
+
+def _extract_footer_data(segments: List[str]) -> Dict[str, str]:
+    """Extract footer content"""
+    footer_data = {}
+    for segment in segments:
+        footer_content = segment.strip()
+        if footer_content:
+            footer_data['footer_text'] = footer_content
+            
+            # Try to extract phone, email and address from the footer in one scan
+            spans = _get_footer_matcher().scan(footer_content, _FOOTER_KEYS)
+            for key in _FOOTER_KEYS:
+                if key in spans:
+                    start, end = spans[key]
+                    footer_data[key] = footer_content[start:end]
+    return footer_data
+
+
+def _extract_guarantor_info(text_lower: str) -> Dict[str, str]:
+    """Extract guarantor requirements"""
+    guarantor_data = {}
+    # Every pattern needs one of these words; most pages have none of them
+    if 'guarantor' not in text_lower and 'signer' not in text_lower and 'signature' not in text_lower:
+        return guarantor_data
+    
+    # Look for guarantor-related patterns; the earliest pattern in priority order wins
+    best_key = None
+    best_rank = len(_GUARANTOR_PATTERNS)
+    for m in _GUARANTOR_COMBINED_RE.finditer(text_lower):
+        rank = _GUARANTOR_PRIORITY[m.lastgroup]
+        if rank < best_rank:
+            best_key, best_rank = m.lastgroup, rank
+            if rank == 0:
+                break
+    if best_key:
+        guarantor_data[best_key] = 'true'
+    # If no specific pattern found, look for general guarantor mentions
+    elif 'guarantor' in text_lower:
+        guarantor_data['guarantor_mentioned'] = 'true'
+    
+    return guarantor_data
+
+
+def _merge_first_wins(merged: Dict[str, Any], page: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the page's keys to merged without overriding ones already present.
+    The trailing **merged restores earlier values while the leading one keeps merged's key order.
+    """
+    return {**merged, **page, **merged}
+
+
+# Extraction prompts, one per node; GPTExtractionClient.node_prompts maps node names to these
+# Node 1: Basic Info, Location, Features, Rules, Safety
+_NODE1_PROMPT = """You are a professional property data extraction assistant. Your task is to extract structured, authentic, and complete data from the provided student accommodation listing webpage and all linked content on that page.
+
+📌 Scope of Extraction:
+Parse the following sources:
+- The main webpage content.
+- All internal links, buttons, tabs, and expandable sections within the page that may contain additional content (e.g., amenities, policies, features, location).
+- Content loaded asynchronously via JavaScript, including dynamically rendered HTML elements.
+- Ensure everything is extracted as if rendered in a headless browser (with scrolling, clicking, expanding done).
+
+🧠 Your Objective:
+Return the extracted information in the following structured JSON format:
+{
+  "basic_info": {
+    "name": "",
+    "guarantor_required": "",
+    "source": "",
+    "source_link": "",
+    "property_type": "",
+    "contact": {
+      "phone": "",
+      "contact_details": ""
+    }
+  },
+  "location": {
+    "location_name": "",
+    "address": "",
+    "city": "",
+    "region": "",
+    "country": "",
+    "latitude": "",
+    "longitude": "",
+    "postcode": ""
+  },
+  "features": [
+    {
+      "type": "",
+      "name": ""
+    }
+  ],
+  "property_rules": [
+    {
+      "type": "",
+      "name": ""
+    }
+  ],
+  "safety_and_security": [
+    {
+      "type": "",
+      "name": ""
+    }
+  ]
+}
+
+🔍 Field-Level Details
+🟠 Basic Info
+- name: Full property name including city (e.g., "iQ Broderick House, Birmingham")
+- guarantor_required: Choose one from:
+  * No guarantor required
+  * International and local guarantors allowed
+  * Local guarantor only (third party guarantor service not allowed)
+  * Local guarantor only (third party guarantor service allowed)
+  * Information unavailable
+- source: Brand or operator name (e.g., "IQ Student Accommodation")
+- source_link: The original URL you are extracting from
+- property_type: Type of accommodation (e.g., "Student Accommodation", "Student Residence", "Purpose Built Student Residence")
+- contact: Contact information including phone and other details
+
+🟢 Location (ENHANCED - Extract ALL available fields)
+- location_name: Full name or address as mentioned
+- address: Complete street address if available
+- city: City name (e.g., "Leeds", "Birmingham")
+- region: State/County/Region (e.g., "West Yorkshire", "England")
+- country: Country name (e.g., "United Kingdom", "UK")
+- latitude: Extract from map, metadata, or page scripts (decimal format)
+- longitude: Extract from map, metadata, or page scripts (decimal format)
+- postcode: Postal/ZIP code if available
+
+🟡 Features
+Each item must contain:
+- type: Must match one from predefined dropdown (see below)
+- name: Amenity or label as shown on the page
+
+🔵 Property Rules
+Same structure as features.
+
+🔴 Safety and Security
+If the feature doesn't match any dropdown value, use:
+{
+  "type": "Others",
+  "name": "CCTV / Smart Entry / etc."
+}
+
+📎 Allowed Dropdown Values for type
+Air Conditioner & Heating, Balcony or Patios, Barbeque & Grill, Business Center, Cafe & Restaurant, Fan, Cinema Room, Clubhouse, Courtyard, Disability Access, Fireplace, Tile Flooring, Wooden Flooring, Carpet Flooring, Food & Meals, Garbage Disposal, Gas Stove, Gym & Fitness, Prayer Room, Internet Access, Wifi, Jogging, Kitchen with Appliance, Laundry Facility, Library & Study Area, Lounge, Maintenance, Medical Facility, Microwave, Parking, Electronic Payments, Pet Friendly, Playground, Snow Removal, Social Events, Spa & Salon, Sport Golf, Room Storage, Swimming Pool, Television, Sports, Pets Not Allowed, Blinds, Telephone, Breakfast Bar, Home Linen, Industry Accreditation & Awards, Common Social Area, Unfurnished Accommodations, Mattress, Games Area, Household Supplies, Sundeck, Vending Machine, Bean Bag, Terrace, Noticeboard, Property Rules, Content Insurance, Ironing Facility, Flatmate, Alarm Clock, Classroom, Den, Newly Refurbished, Fire Extinguisher, Coffee Machine, Basic Essentials, Parcel Collection, Location Benefit, Dining Area, Locker & Safes, Shuttle & Cab Service, Shops, Electric Vehicle Charging Station, Double Occupancy, Guarantor Requirement, Reception & Staff, Common Service, Fully Furnished, Fridge, Accommodation Features, Bathroom, Others
+
+⚠️ Extraction Rules
+❌ Do not guess values
+❌ Do not hallucinate information
+✅ Only extract what is explicitly available
+✅ Match dropdown values exactly
+✅ Leave missing data as empty string or "Information unavailable"
+✅ PRIORITIZE extracting coordinates and address information from any available source
+✅ Look for guarantor requirements in terms, FAQ, and application sections
+✅ Extract property type from meta tags, structured data, and page content
+✅ Look for contact information including phone numbers in contact sections"""
+
+# Node 2: Description Section (Detailed)
+_NODE2_PROMPT = """You are an expert data extraction agent for student accommodation platforms.
+Your task is to extract the entire description section, with all available sub-sections and nested tags, from a given student accommodation webpage.
+Return your output in strictly valid JSON format, as specified below.
+Maintain:
+- Original phrasing and language wherever possible
+- Full detail for all sections (do not truncate or paraphrase)
+- Empty string ("") or omit keys only if the data is truly not present
+
+📦 JSON Output Format
+{
+  "description": {
+    "about": "",
+    "features": "",
+    "highlights": [""],
+    "commute": "",
+    "location_and_whats_hot": "",
+    "distance": "",
+    "commute_pois": [
+      { "poi_name": "", "distance": "", "time": "", "transport": "" }
+    ],
+    "payments": {
+      "booking_deposit": "",
+      "security_deposit": "",
+      "payment_installment_plan": "",
+      "mode_of_payment": "",
+      "guarantor_requirement": "",
+      "fully_refundable_holding_fee": "",
+      "platform_fee": "",
+      "additional_fees": ""
+    },
+    "cancellation_policy": {
+      "cooling_off_period": "",
+      "no_visa_no_pay": "",
+      "no_place_no_pay": "",
+      "university_course_cancellation_or_modification": "",
+      "early_termination_by_student": "",
+      "delayed_arrivals_or_travel_restrictions": "",
+      "replacement_tenant_found": "",
+      "deferring_studies": "",
+      "university_intake_delayed": "",
+      "no_questions_asked": "",
+      "extenuating_circumstances": "",
+      "other_policies": ""
+    },
+    "pet_policy": "",
+    "faqs": [
+      {
+        "question": "",
+        "answer": ""
+      }
+    ],
+    "booking_disclaimer": "",
+    "email": ""
+  }
+}
+
+✅ Parsing Guidelines
+- Section Headings (Smart Mapping): Prefer content grouped under headings (About, Features, Payments, Policies, FAQs, Commute). Use heading boundaries when present. Map by title synonyms:
+  - About/Overview/Summary/Why this property → description.about
+  - Features/Amenities/Facilities/Inclusions → description.features
+  - Location/What's Hot/Nearby/Neighborhood/Area → description.location_and_whats_hot
+  - Distance/Commute/Transport/Travel → description.commute, description.distance, description.commute_pois
+  - Payments/Fees/Deposit/Charges/Installments/Instalments → description.payments (split into booking_deposit, security_deposit, installments, mode_of_payment, platform_fee, additional_fees, holding_fee)
+  - Policies/Terms/House Rules/Cancellation → description.cancellation_policy (map to specific keys using synonyms below)
+  - Pet Policy/Pets → description.pet_policy
+- Markers: Utilize content from markers produced by the scraper, including:
+  - [HEADING_SECTION title="..."] ... [END HEADING_SECTION]
+  - [WIDGET_SECTION type="..." selector="..."] ... [END WIDGET_SECTION]
+  - [LIST: TYPE] ... [END LIST], [TABLE: TYPE] ... [END TABLE], [DEFINITION LIST] ... [END DEFINITION LIST]
+  - [INLINE JSON] ... [END INLINE JSON], [API RESPONSE url="..."] ... [END API RESPONSE]
+  - [FOOTER CONTENT] for contact/policy/links if relevant
+- Commute POIs: When POIs/distances/times/transport are listed (tables, lists, widgets), populate commute_pois[] alongside the free-text commute.
+- Payments & Policies: Normalize different phrasings into the keys shown; if multiple values, include the most complete text.
+- Formatting: Keep full paragraphs intact with line breaks (\n) preserved if present on the source page.
+- Missing Data: If a sub-section does not exist, use an empty string "" or skip that key.
+
+SMART SECTION MAPPING DETAILS
+- Use [HEADING_SECTION] titles to infer the target field. Example: title contains "Payment" → description.payments; title contains "Policy" → description.cancellation_policy; title contains "FAQ" → description.faqs.
+- If [WIDGET_SECTION type="faq"] contains lines like "Q: ...\nA: ...", split into {question, answer} objects and append to description.faqs.
+- If [WIDGET_SECTION type="policy"] contains cancellation/terms language, assign to description.cancellation_policy using the synonyms below.
+- For [TABLE: PRICING] or [LIST: FEATURES], merge structured items into description.features when they describe amenities; otherwise map to payments when they are fees.
+
+POLICY FIELD SYNONYMS (map to description.cancellation_policy keys):
+- cooling_off_period: cooling off, change of mind window, free cancellation window
+- no_visa_no_pay: no visa no pay, visa refused, visa rejection
+- no_place_no_pay: no place no pay, university place not confirmed, CAS refused
+- university_course_cancellation_or_modification: course cancelled, course changed, course modification
+- early_termination_by_student: early termination, breaking contract, early release, surrender tenancy
+- delayed_arrivals_or_travel_restrictions: delayed arrival, travel restriction, quarantine, covid
+- replacement_tenant_found: replacement tenant, substitute tenant, relet, reassign
+- deferring_studies: defer, deferral, postpone studies
+- university_intake_delayed: intake delayed, semester delayed, term delayed
+- no_questions_asked: no questions asked cancellation, unconditional cancellation
+- extenuating_circumstances: extenuating circumstances, exceptional circumstances, medical reasons
+- other_policies: any remaining relevant policy text not mapped above
+"""
+
+# Node 3: Room Configurations, Pricing, Offers, Availability
+_NODE3_PROMPT = """You are a highly accurate data extraction agent trained to onboard detailed configuration-level data for student housing properties.
+
+📌 Objective:
+From the given property webpage content (including hidden sections, JS-loaded content, linked tabs, or accordions), extract all configurations (room types/units) offered under this property.
+Return structured JSON for each configuration, following the format below.
+
+📦 JSON Output Format
+Return an array named configurations where each object includes:
+{
+  "configurations": [
+    {
+      "Basic": {
+        "Name": "",
+        "Status": ""
+      },
+      "Source Details": {
+        "Source": "",
+        "Source Id": "",
+        "Source Link": ""
+      },
+      "Pricing": {
+        "Price": "",
+        "Min Price": "",
+        "Max Price": "",
+        "Deposit": "",
+        "Min Deposit Amount": "",
+        "Max Deposit Amount": ""
+      },
+      "Meta": {
+        "Price Duration": "",
+        "Price Currency": "",
+        "Advance Rent Multiplier Value": ""
+      },
+      "Area": {
+        "Area": "",
+        "Min Area": "",
+        "Max Area": "",
+        "Area Unit": ""
+      },
+      "Floor Details": {
+        "Floor": "",
+        "Facing": ""
+      },
+      "Configuration": {
+        "Types": [],
+        "Dual Occupancy": "",
+        "Unit Type": "",
+        "Bedroom Count": "",
+        "Min Bedroom Count": "",
+        "Max Bedroom Count": "",
+        "Bathroom Count": "",
+        "Min Bathroom Count": "",
+        "Max Bathroom Count": "",
+        "Unit Count": ""
+      },
+      "Lease Duration": {
+        "Lease Duration": "",
+        "Min Lease Duration": "",
+        "Max Lease Duration": "",
+        "Lease Duration Unit": ""
+      },
+      "Availability": {
+        "Available Units": "",
+        "Available From": ""
+      },
+      "Payments and Forms": {
+        "Jotform Form Id": "",
+        "Accept Payments": "",
+        "Payment Type to Collect": "",
+        "Terms and Conditions Doc URL": "",
+        "Login URL": "",
+        "Property is Non-Commissionable for Locals": "",
+        "Enable Payment Before Bookform": ""
+      },
+      "Description": {
+        "Name": "",
+        "Type": "",
+        "Numeric Value": "",
+        "Description": "",
+        "Safe to Save": ""
+      },
+      "Features": [
+        {
+          "Type": "",
+          "Section Name": "",
+          "Description": ""
+        }
+      ]
+    }
+  ]
+}
+
+🧠 Instructions
+- Scrape every configuration/unit listed on the page and its linked inner pages or tabs if required.
+- Normalize missing fields with "null" or "" where data is not mentioned.
+- Use dropdown values where applicable (e.g., Configuration Types, Dual Occupancy, etc.).
+- If ranges (e.g., price or area) are given, separate them as Min and Max.
+- Ensure all numeric values are extracted as strings for safety and compatibility.
+❌ Do not hallucinate. ✅ Return only what's explicitly or clearly stated in the source content.
+If a property has no configurations or content is missing, return: "configurations": []"""
+
+# Node 4: Tenancy-Level Room Configs with Contracts & Pricing
+_NODE4_PROMPT = """You are a property onboarding assistant tasked with extracting the most detailed, accurate, and structured tenancy-level data for student accommodation listings from a given webpage and all its links.
+Your job now goes beyond property-level details, and you must also extract all configuration (tenancy) level data, including room types, tenancy durations, prices, availability, and any special terms.
+
+📌 DATA SOURCES TO CONSIDER:
+You must extract and consolidate data from:
+- The main webpage
+- All tabs, pop-ups, expandable sections, and linked subpages
+- Content that loads dynamically via JavaScript or user interactions
+- Any JSON embedded in <script> tags or API responses if visible
+- All room cards, booking flows, or floor plan sections on the site
+
+📦 JSON OUTPUT FORMAT
+{
+  "property_level": {
+    "name": "",
+    "guarantor_required": "",
+    "source": "",
+    "source_link": "",
+    "location_name": "",
+    "latitude": "",
+    "longitude": "",
+    "region": ""
+  },
+  "configurations": [
+    {
+      "name": "",
+      "status": "",
+      "source": "",
+      "source_id": "",
+      "source_link": "",
+      "base_price": "",
+      "min_price": "",
+      "max_price": "",
+      "tenancy_options": [
+        {
+          "tenancy_length": "",
+          "price": "",
+          "availability_status": "",
+          "price_type": "",
+          "start_date": "",
+          "end_date": ""
+        }
+      ],
+      "room_type": "",
+      "bathroom_type": "",
+      "kitchen_type": "",
+      "occupancy": "",
+      "floor_area": "",
+      "features": ["..."],
+      "offers": ["..."],
+      "availability_note": ""
+    }
+  ]
+}
+
+📚 FIELD EXPLANATIONS:
+- All property-level data fields mirror those from Node 1
+- Each room configuration includes room-specific tenancy options
+- Each tenancy_option is a separate contract offering
+
+⚠️ RULES:
+❌ Do not merge configs that differ in any detail
+❌ Do not hallucinate or guess
+✅ Extract data as rendered on full UI and booking flow
+✅ Simulate browser interactions if needed (scroll, expand, click)
+✅ Extract deeply nested data (scripts, React/Angular sections, JSON blobs)"""
+
+# Error message fragments per category; a named group per category so one scan finds them all
+_ERROR_CATEGORY_RE = re.compile(
+    r"(?P<timeout>timeout|timed out)|(?P<connection>connection|network)|(?P<rate_limit>rate limit|too many requests)",
+    re.IGNORECASE,
+)
+# Category precedence when a message matches more than one
+_ERROR_CATEGORY_ORDER = ('timeout', 'connection', 'rate_limit')
+
+
+def _categorize_error(error_msg: str) -> str:
+    """Map an extraction failure message to timeout, connection, rate_limit or unknown"""
+    found = {m.lastgroup for m in _ERROR_CATEGORY_RE.finditer(error_msg)}
+    for category in _ERROR_CATEGORY_ORDER:
+        if category in found:
+            return category
+    return 'unknown'
+
+
 @dataclass
 class ExtractionResult:
     """Result of an extraction operation"""
@@ -42,7 +821,7 @@ class GPTExtractionClient:
     
     def extract_property_data(self, url: str, node_name: str, job_id: int) -> ExtractionResult:
         """Extract property data using GPT-4o with browsing for a specific node"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             self.logger.log_node_start(job_id, node_name)
@@ -230,7 +1009,7 @@ ADDITIONAL HINTS (if present):
             ]
             
             def _call_and_parse(msgs):
-                api_start = time.time()
+                api_start = time.perf_counter()
                 resp = self.client.chat.completions.create(
                 model=self.config.api.openai_model,
                     messages=msgs,
@@ -238,7 +1017,7 @@ ADDITIONAL HINTS (if present):
                 temperature=self.config.api.temperature,
                     response_format={"type": "json_object"}
                 )
-                dur = time.time() - api_start
+                dur = time.perf_counter() - api_start
                 self.logger.log_api_call(job_id, node_name, "OpenAI GPT-4o", dur, True)
                 raw = resp.choices[0].message.content
                 data = self._parse_json_response(raw)
@@ -324,7 +1103,7 @@ Context (reduced):
             # Calculate confidence score based on data completeness
             confidence_score = self._calculate_confidence_score(extracted_data, node_name)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             self.logger.log_node_complete(job_id, node_name, execution_time, confidence_score)
             
@@ -338,18 +1117,11 @@ Context (reduced):
             )
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_msg = str(e)
             
             # Categorize errors for better handling
-            if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
-                error_category = 'timeout'
-            elif 'connection' in error_msg.lower() or 'network' in error_msg.lower():
-                error_category = 'connection'
-            elif 'rate limit' in error_msg.lower() or 'too many requests' in error_msg.lower():
-                error_category = 'rate_limit'
-            else:
-                error_category = 'unknown'
+            error_category = _categorize_error(error_msg)
             
             self.logger.log_node_failed(job_id, node_name, error_msg, duration=execution_time)
             
@@ -363,9 +1135,15 @@ Context (reduced):
                 error_category=error_category
             )
     
+    async def extract_property_data_async(self, url: str, node_name: str, job_id: int,
+                                          executor: Optional[Executor] = None) -> ExtractionResult:
+        """Run extract_property_data on an executor so the event loop stays free while it blocks"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.extract_property_data, url, node_name, job_id)
+    
     async def extract_basic_info(self, url: str, context_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Extract basic property information and location data"""
-        result = self.extract_property_data(url, 'node1_basic_info', 0)  # job_id 0 for context calls
+        result = await self.extract_property_data_async(url, 'node1_basic_info', 0)  # job_id 0 for context calls
         if result.success:
             return result.data
         else:
@@ -373,7 +1151,7 @@ Context (reduced):
     
     async def extract_description(self, url: str, context_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Extract property description and features"""
-        result = self.extract_property_data(url, 'node2_description', 0)  # job_id 0 for context calls
+        result = await self.extract_property_data_async(url, 'node2_description', 0)  # job_id 0 for context calls
         if result.success:
             return result.data
         else:
@@ -381,7 +1159,7 @@ Context (reduced):
     
     async def extract_room_configurations(self, url: str, context_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Extract room configurations and pricing"""
-        result = self.extract_property_data(url, 'node3_configuration', 0)  # job_id 0 for context calls
+        result = await self.extract_property_data_async(url, 'node3_configuration', 0)  # job_id 0 for context calls
         if result.success:
             return result.data
         else:
@@ -389,7 +1167,7 @@ Context (reduced):
     
     async def extract_tenancy_information(self, url: str, context_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Extract tenancy information and policies"""
-        result = self.extract_property_data(url, 'node4_tenancy', 0)  # job_id 0 for context calls
+        result = await self.extract_property_data_async(url, 'node4_tenancy', 0)  # job_id 0 for context calls
         if result.success:
             return result.data
         else:
@@ -607,14 +1385,12 @@ Context (reduced):
         """Generate a stable slug ID for a configuration using name and key attributes.
         Falls back gracefully when fields are missing.
         """
-        import re as _re
-
         def _norm(s: str) -> str:
             s = (s or '').lower().strip()
-            s = _re.sub(r"[^a-z0-9\s\-_/]", "", s)
+            s = re.sub(r"[^a-z0-9\s\-_/]", "", s)
             s = s.replace("/", "-")
-            s = _re.sub(r"\s+", "-", s)
-            s = _re.sub(r"-+", "-", s)
+            s = re.sub(r"\s+", "-", s)
+            s = re.sub(r"-+", "-", s)
             return s.strip('-')
 
         # Try multiple possible name fields
@@ -652,15 +1428,10 @@ Context (reduced):
                     ok = False
                     break
             if ok and cur:
-                try:
-                    # extract first number
-                    import re as _re2
-                    m = _re2.search(r"(\d+\.?\d*)", str(cur))
-                    if m:
-                        if min_area is None:
-                            min_area = m.group(1)
-                except Exception:
-                    pass
+                # extract first number
+                m = re.search(r"(\d+\.?\d*)", str(cur))
+                if m and min_area is None:
+                    min_area = m.group(1)
         for path in [['Area', 'Max Area']]:
             cur = config
             ok = True
@@ -671,13 +1442,9 @@ Context (reduced):
                     ok = False
                     break
             if ok and cur:
-                try:
-                    import re as _re3
-                    m = _re3.search(r"(\d+\.?\d*)", str(cur))
-                    if m:
-                        max_area = m.group(1)
-                except Exception:
-                    pass
+                m = re.search(r"(\d+\.?\d*)", str(cur))
+                if m:
+                    max_area = m.group(1)
 
         area_part = None
         if min_area and max_area and min_area != max_area:
@@ -885,575 +1652,265 @@ Context (reduced):
 
         # Helper: extract blocks between markers
         def _extract_blocks(marker: str, end_marker: str) -> List[str]:
-            import re as _re
             blocks: List[str] = []
-            try:
-                pattern = _re.compile(_re.escape(marker) + r"[\s\S]*?" + _re.escape(end_marker))
-                for m in pattern.finditer(context_text or ""):
-                    block = m.group(0)
-                    # strip wrapper lines
-                    try:
-                        start_idx = block.find('\n')
-                        end_idx = block.rfind('\n')
-                        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                            blocks.append(block[start_idx+1:end_idx].strip())
-                        else:
-                            blocks.append(block)
-                    except Exception:
-                        blocks.append(block)
-            except Exception:
-                pass
+            pattern = re.compile(re.escape(marker) + r"[\s\S]*?" + re.escape(end_marker))
+            for m in pattern.finditer(context_text or ""):
+                block = m.group(0)
+                # strip wrapper lines
+                start_idx = block.find('\n')
+                end_idx = block.rfind('\n')
+                if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+                    blocks.append(block[start_idx+1:end_idx].strip())
+                else:
+                    blocks.append(block)
             return blocks
 
         # Extract FAQs from widget sections when missing/sparse
-        try:
-            if len(faqs) < 2:
-                widget_faq_blocks = []
-                # Match [WIDGET_SECTION type="faq" ...] ... [END WIDGET_SECTION]
-                import re as _re
-                faq_open_pattern = _re.compile(r"\[WIDGET_SECTION[^\]]*type=\"faq\"[^\]]*\]\s*", _re.IGNORECASE)
-                end_tag = "[END WIDGET_SECTION]"
-                text = context_text or ""
-                for m in faq_open_pattern.finditer(text):
-                    start = m.end()
-                    end = text.find(end_tag, start)
-                    if end != -1:
-                        widget_faq_blocks.append(text[start:end].strip())
-
-                parsed_qas: List[Dict[str, str]] = []
-                for block in widget_faq_blocks:
-                    lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
-                    current_q: Optional[str] = None
-                    current_a: Optional[str] = None
-                    for ln in lines:
-                        if ln.lower().startswith('q:'):
-                            # flush previous pair
-                            if current_q and current_a:
-                                parsed_qas.append({"question": current_q, "answer": current_a})
-                            current_q = ln[2:].strip(" :\t")
-                            current_a = None
-                        elif ln.lower().startswith('a:'):
-                            current_a = ln[2:].strip(" :\t")
-                        elif ln.endswith('?') and not current_q:
-                            current_q = ln.strip()
-                        elif current_q and not current_a:
-                            # accumulate answer lines until next Q or end
-                            current_a = (current_a + " " if current_a else "") + ln
-                    if current_q and current_a:
-                        parsed_qas.append({"question": current_q, "answer": current_a})
-
-                # Also parse [DEFINITION LIST] entries with question-like terms
-                def_blocks = _extract_blocks('[DEFINITION LIST]', '[END DEFINITION LIST]')
-                for block in def_blocks:
-                    for ln in block.splitlines():
-                        if ':' in ln:
-                            k, v = ln.split(':', 1)
-                            if k.strip().endswith('?') and v.strip():
-                                parsed_qas.append({"question": k.strip(), "answer": v.strip()})
-
-                # Deduplicate and merge into desc.faqs
-                seen = set()
-                for qa in parsed_qas:
-                    q = qa.get('question', '')
-                    a = qa.get('answer', '')
-                    if not (q or a):
-                        continue
-                    key = (q.lower(), a.lower())
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    faqs.append({"question": q, "answer": a})
-        except Exception:
-            pass
-
-        # Normalize / fill cancellation_policy from policy widgets and headings
-        try:
-            # Aggregate policy-like text
-            policy_texts: List[str] = []
-            policy_texts.extend(_extract_blocks('[FOOTER CONTENT]', '[END FOOTER CONTENT]'))
-            policy_texts.extend(_extract_blocks('[HEADING_SECTION title="', '[END HEADING_SECTION]'))  # may include many sections
-            # Include only sections whose title suggests policy terms
-            filtered_policy_texts: List[str] = []
-            for t in policy_texts:
-                tl = t.lower()
-                if any(w in tl for w in ['policy', 'policies', 'term', 'rule', 'cancellation', 'refund']):
-                    filtered_policy_texts.append(t)
-            # Add policy widget sections
-            import re as _re
-            pol_open_pattern = _re.compile(r"\[WIDGET_SECTION[^\]]*type=\"policy\"[^\]]*\]\s*", _re.IGNORECASE)
+        if len(faqs) < 2:
+            widget_faq_blocks = []
+            # Match [WIDGET_SECTION type="faq" ...] ... [END WIDGET_SECTION]
+            faq_open_pattern = re.compile(r"\[WIDGET_SECTION[^\]]*type=\"faq\"[^\]]*\]\s*", re.IGNORECASE)
             end_tag = "[END WIDGET_SECTION]"
             text = context_text or ""
-            for m in pol_open_pattern.finditer(text):
+            for m in faq_open_pattern.finditer(text):
                 start = m.end()
                 end = text.find(end_tag, start)
                 if end != -1:
-                    filtered_policy_texts.append(text[start:end].strip())
-
-            # Synonym patterns
-            synonym_patterns: List[Tuple[str, str]] = [
-                (r'cooling\s*off', 'cooling_off_period'),
-                (r'no\s*visa\s*no\s*pay|visa\s*(rejected|refused)', 'no_visa_no_pay'),
-                (r'no\s*place\s*no\s*pay', 'no_place_no_pay'),
-                (r'course\s*(cancel|change|modif)', 'university_course_cancellation_or_modification'),
-                (r'early\s*(termination|release|surrender)', 'early_termination_by_student'),
-                (r'delayed\s*arrivals|travel\s*restriction|quarantine', 'delayed_arrivals_or_travel_restrictions'),
-                (r'replacement\s*tenant|re[- ]?let|reassign', 'replacement_tenant_found'),
-                (r'defer|deferral|postpone', 'deferring_studies'),
-                (r'intake\s*delayed|semester\s*delayed|term\s*delayed', 'university_intake_delayed'),
-                (r'no\s*questions\s*asked', 'no_questions_asked'),
-                (r'extenuating\s*circumstances|exceptional\s*circumstances|medical\s*reason', 'extenuating_circumstances'),
-            ]
-
-            combined = "\n\n".join(filtered_policy_texts)
-            for pattern, key in synonym_patterns:
-                try:
-                    import re as _re
-                    if cancellation.get(key):
-                        continue
-                    m = _re.search(pattern, combined, flags=_re.IGNORECASE)
-                    if m:
-                        # capture a nearby sentence as value
-                        span_start = max(0, m.start() - 120)
-                        span_end = min(len(combined), m.end() + 240)
-                        snippet = combined[span_start:span_end]
-                        # Trim to sentence boundaries if possible
-                        # Simple heuristic: cut at nearest period
-                        left_cut = snippet.find('.')
-                        right_cut = snippet.rfind('.')
-                        value = snippet.strip()
-                        if len(value) > 800:
-                            value = value[:800] + '...'
-                        cancellation[key] = value
-                except Exception:
+                    widget_faq_blocks.append(text[start:end].strip())
+
+            parsed_qas: List[Dict[str, str]] = []
+            for block in widget_faq_blocks:
+                lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
+                current_q: Optional[str] = None
+                current_a: Optional[str] = None
+                for ln in lines:
+                    if ln.lower().startswith('q:'):
+                        # flush previous pair
+                        if current_q and current_a:
+                            parsed_qas.append({"question": current_q, "answer": current_a})
+                        current_q = ln[2:].strip(" :\t")
+                        current_a = None
+                    elif ln.lower().startswith('a:'):
+                        current_a = ln[2:].strip(" :\t")
+                    elif ln.endswith('?') and not current_q:
+                        current_q = ln.strip()
+                    elif current_q and not current_a:
+                        # accumulate answer lines until next Q or end
+                        current_a = (current_a + " " if current_a else "") + ln
+                if current_q and current_a:
+                    parsed_qas.append({"question": current_q, "answer": current_a})
+
+            # Also parse [DEFINITION LIST] entries with question-like terms
+            def_blocks = _extract_blocks('[DEFINITION LIST]', '[END DEFINITION LIST]')
+            for block in def_blocks:
+                for ln in block.splitlines():
+                    if ':' in ln:
+                        k, v = ln.split(':', 1)
+                        if k.strip().endswith('?') and v.strip():
+                            parsed_qas.append({"question": k.strip(), "answer": v.strip()})
+
+            # Deduplicate and merge into desc.faqs
+            seen = set()
+            for qa in parsed_qas:
+                q = qa.get('question', '')
+                a = qa.get('answer', '')
+                if not (q or a):
                     continue
-            # Ensure keys exist
-            for k in ['cooling_off_period','no_visa_no_pay','no_place_no_pay','university_course_cancellation_or_modification','early_termination_by_student','delayed_arrivals_or_travel_restrictions','replacement_tenant_found','deferring_studies','university_intake_delayed','no_questions_asked','extenuating_circumstances','other_policies']:
-                if k not in cancellation:
-                    cancellation[k] = cancellation.get(k, '')
-        except Exception:
-            pass
+                key = (q.lower(), a.lower())
+                if key in seen:
+                    continue
+                seen.add(key)
+                faqs.append({"question": q, "answer": a})
+
+        # Normalize / fill cancellation_policy from policy widgets and headings
+        # Aggregate policy-like text
+        policy_texts: List[str] = []
+        policy_texts.extend(_extract_blocks('[FOOTER CONTENT]', '[END FOOTER CONTENT]'))
+        policy_texts.extend(_extract_blocks('[HEADING_SECTION title="', '[END HEADING_SECTION]'))  # may include many sections
+        # Include only sections whose title suggests policy terms
+        filtered_policy_texts: List[str] = []
+        for t in policy_texts:
+            tl = t.lower()
+            if any(w in tl for w in ['policy', 'policies', 'term', 'rule', 'cancellation', 'refund']):
+                filtered_policy_texts.append(t)
+        # Add policy widget sections
+        pol_open_pattern = re.compile(r"\[WIDGET_SECTION[^\]]*type=\"policy\"[^\]]*\]\s*", re.IGNORECASE)
+        end_tag = "[END WIDGET_SECTION]"
+        text = context_text or ""
+        for m in pol_open_pattern.finditer(text):
+            start = m.end()
+            end = text.find(end_tag, start)
+            if end != -1:
+                filtered_policy_texts.append(text[start:end].strip())
+
+        combined = "\n\n".join(filtered_policy_texts)
+        wanted = {key for _, key in _POLICY_SYNONYM_PATTERNS if not cancellation.get(key)}
+        spans = _get_policy_matcher().scan(combined, wanted) if wanted else {}
+        for _, key in _POLICY_SYNONYM_PATTERNS:
+            if key not in spans:
+                continue
+            match_start, match_end = spans[key]
+            # capture a nearby sentence as value
+            span_start = max(0, match_start - 120)
+            span_end = min(len(combined), match_end + 240)
+            value = combined[span_start:span_end].strip()
+            if len(value) > 800:
+                value = value[:800] + '...'
+            cancellation[key] = value
+        # Ensure keys exist
+        for k in ['cooling_off_period','no_visa_no_pay','no_place_no_pay','university_course_cancellation_or_modification','early_termination_by_student','delayed_arrivals_or_travel_restrictions','replacement_tenant_found','deferring_studies','university_intake_delayed','no_questions_asked','extenuating_circumstances','other_policies']:
+            cancellation.setdefault(k, '')
 
         return data
 
     def _is_node2_sparse(self, data: Dict[str, Any]) -> bool:
         """Heuristic to decide if Node 2 description is underfilled and warrants a second crawl pass."""
-        try:
-            desc = data.get('description', {}) if isinstance(data, dict) else {}
-            score = 0
-            if desc.get('about'): score += 1
-            if desc.get('features'): score += 1
-            if desc.get('faqs') and isinstance(desc.get('faqs'), list) and len(desc['faqs']) >= 2: score += 1
-            if desc.get('payments') and any(desc.get('payments', {}).get(k) for k in ['booking_deposit','security_deposit','payment_installment_plan','mode_of_payment']): score += 1
-            if desc.get('cancellation_policy') and any(desc.get('cancellation_policy', {}).get(k) for k in ['cooling_off_period','no_visa_no_pay','no_place_no_pay']): score += 1
-            if desc.get('commute') or desc.get('distance') or (desc.get('commute_pois') and len(desc.get('commute_pois') or []) >= 1): score += 1
-            return score <= 2
-        except Exception:
+        desc = data.get('description', {}) if isinstance(data, dict) else {}
+        # Malformed output is not treated as underfilled, so it does not trigger a second pass
+        if not isinstance(desc, dict):
             return False
+        payments = desc.get('payments') or {}
+        cancel = desc.get('cancellation_policy') or {}
+        if not isinstance(payments, dict) or not isinstance(cancel, dict):
+            return False
+        faqs = desc.get('faqs')
+        score = (
+            bool(desc.get('about'))
+            + bool(desc.get('features'))
+            + (isinstance(faqs, list) and len(faqs) >= 2)
+            + any(payments.get(k) for k in _SPARSE_PAYMENT_KEYS)
+            + any(cancel.get(k) for k in _SPARSE_CANCELLATION_KEYS)
+            + bool(desc.get('commute') or desc.get('distance') or desc.get('commute_pois'))
+        )
+        return score <= 2
     
     def _count_non_empty_values(self, data: Any) -> int:
         """Count non-empty values in nested data structure"""
         if isinstance(data, dict):
             count = 0
-            for value in data.values():
-                count += self._count_non_empty_values(value)
-            return count
-        elif isinstance(data, list):
-            count = 0
-            for item in data:
-                count += self._count_non_empty_values(item)
-            return count
-        elif data and str(data).strip():
-            return 1
-        else:
-            return 0
-            
-    def _derive_node1_hints_from_pages(self, pages: List[Dict[str, str]]) -> Dict[str, Any]:
-        """Derive helpful hints for Node 1 from crawled pages' text.
-        Extracts lat/lng, candidate name, amenity features, guarantor info, and best source link.
-        Pages contain cleaned text and may include markers like [STRUCTURED DATA], [MAP COORDINATES], etc.
-        """
-        hints: Dict[str, Any] = {
-            "derived_location": {},
-            "derived_basic_info": {},
-            "derived_features": [],
-            "derived_guarantor": {},
-            "best_source_link": pages[0]["url"] if pages else ""
-        }
-
-        # Regex patterns for coordinates
-        latlng_patterns = [
-            r"lat(?:itude)?\s*[:=]?\s*([\-\d\.]{2,})\s*[,;\s]+lng|long(?:itude)?\s*[:=]?\s*([\-\d\.]{2,})",
-            r"\b([-\d\.]{2,}),\s*([-\d\.]{2,})\b",  # generic pair
-        ]
-
-        # Try to parse JSON-LD blocks from [STRUCTURED DATA] markers in text
-        def _extract_jsonld_blocks(text: str) -> List[Dict[str, Any]]:
-            blocks: List[Dict[str, Any]] = []
-            try:
-                # Find segments between markers
-                parts = re.split(r"\[STRUCTURED DATA\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END STRUCTURED DATA]")
-                    if end_idx > 0:
-                        payload = part[:end_idx].strip()
-                        # Some sites include multiple JSON objects; try to parse best-effort
-                        try:
-                            data = json.loads(payload)
-                            blocks.append(data)
-                        except Exception:
-                            # Attempt to locate first {...} JSON object
-                            m = re.search(r"\{[\s\S]*\}", payload)
-                            if m:
-                                try:
-                                    data = json.loads(m.group(0))
-                                    blocks.append(data)
-                                except Exception:
-                                    pass
-            except Exception:
-                pass
-            return blocks
-
-        # Extract map coordinates from [MAP COORDINATES] markers
-        def _extract_map_coordinates(text: str) -> Tuple[Optional[str], Optional[str]]:
-            lat, lng = None, None
-            try:
-                parts = re.split(r"\[MAP COORDINATES\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END MAP COORDINATES]")
-                    if end_idx > 0:
-                        coord_text = part[:end_idx].strip()
-                        lat_match = re.search(r"Latitude:\s*([-\d\.]+)", coord_text)
-                        lng_match = re.search(r"Longitude:\s*([-\d\.]+)", coord_text)
-                        if lat_match and lng_match:
-                            lat = lat_match.group(1)
-                            lng = lng_match.group(1)
-                            # Validate coordinates
-                            try:
-                                lat_f, lng_f = float(lat), float(lng)
-                                if -90 <= lat_f <= 90 and -180 <= lng_f <= 180:
-                                    return lat, lng
-                            except ValueError:
-                                pass
-            except Exception:
-                pass
-            return None, None
-
-        # Extract address info from [ADDRESS INFO] markers
-        def _extract_address_info(text: str) -> Dict[str, str]:
-            address_data = {}
-            try:
-                parts = re.split(r"\[ADDRESS INFO\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END ADDRESS INFO]")
-                    if end_idx > 0:
-                        address_text = part[:end_idx].strip()
-                        # Try to parse address components
-                        # Look for postcode pattern (UK: A1A 1AA, US: 12345 or 12345-6789)
-                        postcode_match = re.search(r'\b[A-Z]{1,2}[0-9][A-Z0-9]?\s*[0-9][A-Z]{2}\b', address_text, re.IGNORECASE)
-                        if postcode_match:
-                            address_data['postcode'] = postcode_match.group(0)
-                        
-                        # Look for city/region patterns
-                        city_patterns = [
-                            r'\b(?:in|at|near)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
-                            r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*(?:West\s+)?(?:Yorkshire|England|UK|United\s+Kingdom)\b'
-                        ]
-                        for pattern in city_patterns:
-                            city_match = re.search(pattern, address_text, re.IGNORECASE)
-                            if city_match:
-                                address_data['city'] = city_match.group(1).strip()
-                                break
-                        
-                        # Look for street address
-                        street_match = re.search(r'\b\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Street|Road|Avenue|Lane|Drive|Close|Way)\b', address_text, re.IGNORECASE)
-                        if street_match:
-                            address_data['street'] = street_match.group(0)
-            except Exception:
-                pass
-            return address_data
-
-        # Extract property type information
-        def _extract_property_type(text: str) -> Dict[str, str]:
-            property_data = {}
-            try:
-                parts = re.split(r"\[PROPERTY TYPE\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END PROPERTY TYPE]")
-                    if end_idx > 0:
-                        type_text = part[:end_idx].strip()
-                        if type_text:
-                            property_data['property_type'] = type_text
-                            break
-            except Exception:
-                pass
-            return property_data
-
-        # Extract contact information
-        def _extract_contact_info(text: str) -> Dict[str, str]:
-            contact_data = {}
-            try:
-                parts = re.split(r"\[CONTACT INFO\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END CONTACT INFO]")
-                    if end_idx > 0:
-                        contact_text = part[:end_idx].strip()
-                        # Extract phone number
-                        phone_match = re.search(r'Phone:\s*([+\d\s\(\)\-]+)', contact_text)
-                        if phone_match:
-                            contact_data['phone'] = phone_match.group(1).strip()
-                        # Extract other contact info
-                        elif contact_text and not contact_data.get('phone'):
-                            contact_data['contact_details'] = contact_text
-                        break
-            except Exception:
-                pass
-            return contact_data
-
-        # Extract structured data from tables
-        def _extract_table_data(text: str) -> Dict[str, List[str]]:
-            table_data = {}
-            try:
-                parts = re.split(r"\[TABLE:", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END TABLE]")
-                    if end_idx > 0:
-                        table_content = part[:end_idx].strip()
-                        # Extract table type from first line
-                        lines = table_content.split('\n')
-                        if lines:
-                            table_type = lines[0].strip()
-                            table_rows = lines[1:] if len(lines) > 1 else []
-                            
-                            if table_type not in table_data:
-                                table_data[table_type] = []
-                            
-                            for row in table_rows:
-                                if row.strip():
-                                    table_data[table_type].append(row.strip())
-            except Exception:
-                pass
-            return table_data
-
-        # Extract structured data from lists
-        def _extract_list_data(text: str) -> Dict[str, List[str]]:
-            list_data = {}
-            try:
-                parts = re.split(r"\[LIST:", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END LIST]")
-                    if end_idx > 0:
-                        list_content = part[:end_idx].strip()
-                        # Extract list type from first line
-                        lines = list_content.split('\n')
-                        if lines:
-                            list_type = lines[0].strip()
-                            list_items = lines[1:] if len(lines) > 1 else []
-                            
-                            if list_type not in list_data:
-                                list_data[list_type] = []
-                            
-                            for item in list_items:
-                                if item.strip() and item.startswith('•'):
-                                    list_data[list_type].append(item.strip()[1:].strip())
-            except Exception:
-                pass
-            return list_data
-
-        # Extract definition list data
-        def _extract_definition_list_data(text: str) -> Dict[str, str]:
-            definition_data = {}
-            try:
-                parts = re.split(r"\[DEFINITION LIST\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END DEFINITION LIST]")
-                    if end_idx > 0:
-                        dl_content = part[:end_idx].strip()
-                        lines = dl_content.split('\n')
-                        for line in lines:
-                            if ':' in line:
-                                parts = line.split(':', 1)
-                                if len(parts) == 2:
-                                    key = parts[0].strip()
-                                    value = parts[1].strip()
-                                    if key and value:
-                                        definition_data[key] = value
-            except Exception:
-                pass
-            return definition_data
-
-        # Extract footer content
-        def _extract_footer_data(text: str) -> Dict[str, str]:
-            footer_data = {}
-            try:
-                parts = re.split(r"\[FOOTER CONTENT\]", text)
-                for part in parts[1:]:
-                    end_idx = part.find("[END FOOTER CONTENT]")
-                    if end_idx > 0:
-                        footer_content = part[:end_idx].strip()
-                        if footer_content:
-                            footer_data['footer_text'] = footer_content
-                            
-                            # Try to extract specific info from footer
-                            # Phone numbers
-                            phone_match = re.search(r'(\+44\s*\d{1,4}\s*\d{1,4}\s*\d{1,4}|\(0\)\d{1,4}\s*\d{1,4}\s*\d{1,4}|0\d{1,4}\s*\d{1,4}\s*\d{1,4})', footer_content)
-                            if phone_match:
-                                footer_data['footer_phone'] = phone_match.group(1)
-                            
-                            # Email addresses
-                            email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', footer_content)
-                            if email_match:
-                                footer_data['footer_email'] = email_match.group(1)
-                            
-                            # Address information
-                            address_match = re.search(r'(\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Street|Road|Avenue|Lane|Drive|Close|Way))', footer_content, re.IGNORECASE)
-                            if address_match:
-                                footer_data['footer_address'] = address_match.group(1)
-            except Exception:
-                pass
-            return footer_data
-
-        # Extract guarantor requirements
-        def _extract_guarantor_info(text: str) -> Dict[str, str]:
-            guarantor_data = {}
-            text_lower = text.lower()
-            
-            # Look for guarantor-related patterns
-            guarantor_patterns = [
-                (r'guarantor\s+(?:is\s+)?(?:required|needed|mandatory)', 'guarantor_required'),
-                (r'(?:no|not\s+required)\s+guarantor', 'no_guarantor'),
-                (r'guarantor\s+(?:not\s+)?(?:required|needed)', 'guarantor_optional'),
-                (r'international\s+guarantor', 'international_guarantor'),
-                (r'local\s+guarantor\s+only', 'local_guarantor_only'),
-                (r'third\s+party\s+guarantor\s+service', 'third_party_guarantor'),
-                (r'parent.*signature.*required', 'parent_signature_required'),
-                (r'co.?signer', 'co_signer_required'),
-            ]
-            
-            for pattern, key in guarantor_patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    guarantor_data[key] = 'true'
-                    break
-            
-            # If no specific pattern found, look for general guarantor mentions
-            if not guarantor_data and 'guarantor' in text_lower:
-                guarantor_data['guarantor_mentioned'] = 'true'
+            for value in data.values():
+                count += self._count_non_empty_values(value)
+            return count
+        elif isinstance(data, list):
+            count = 0
+            for item in data:
+                count += self._count_non_empty_values(item)
+            return count
+        elif data and str(data).strip():
+            return 1
+        else:
+            return 0
             
-            return guarantor_data
+    def _derive_node1_hints_from_pages(self, pages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Derive helpful hints for Node 1 from crawled pages' text.
+        Extracts lat/lng, candidate name, amenity features, guarantor info, and best source link.
+        Pages contain cleaned text and may include markers like [STRUCTURED DATA], [MAP COORDINATES], etc.
+        """
+        hints: Dict[str, Any] = {
+            "derived_location": {},
+            "derived_basic_info": {},
+            "derived_features": [],
+            "derived_guarantor": {},
+            "best_source_link": pages[0]["url"] if pages else ""
+        }
 
-        candidate_names: List[str] = []
+        # Only the longest JSON-LD name is kept, so track the winner instead of every candidate
+        best_name: Optional[str] = None
+        best_name_len = 0
         lat: Optional[str] = None
         lng: Optional[str] = None
         features_accum: List[Dict[str, str]] = []
         address_components: Dict[str, str] = {}
         property_type_info: Dict[str, str] = {}
         contact_info: Dict[str, str] = {}
-        table_info: Dict[str, List[str]] = {}
-        list_info: Dict[str, List[str]] = {}
+        table_info: Dict[str, List[str]] = defaultdict(list)
+        list_info: Dict[str, List[str]] = defaultdict(list)
         definition_info: Dict[str, str] = {}
         footer_info: Dict[str, str] = {}
         guarantor_info: Dict[str, str] = {}
 
         for p in pages:
             text = p.get("text", "") or ""
+            text_lower = text.lower()
+            # Walk the page once and hand each helper only its own marker blocks
+            markers = _scan_page_markers(text)
             
             # Extract map coordinates from new markers
-            map_lat, map_lng = _extract_map_coordinates(text)
+            map_lat, map_lng = _extract_map_coordinates(markers["MAP COORDINATES"])
             if map_lat and map_lng and not (lat and lng):
                 lat, lng = map_lat, map_lng
             
             # Extract address information
-            page_address = _extract_address_info(text)
-            for key, value in page_address.items():
-                if key not in address_components:
-                    address_components[key] = value
+            page_address = _extract_address_info(markers["ADDRESS INFO"])
+            if page_address:
+                address_components = _merge_first_wins(address_components, page_address)
             
             # Extract property type information
-            page_property_type = _extract_property_type(text)
-            for key, value in page_property_type.items():
-                if key not in property_type_info:
-                    property_type_info[key] = value
+            page_property_type = _extract_property_type(markers["PROPERTY TYPE"])
+            if page_property_type:
+                property_type_info = _merge_first_wins(property_type_info, page_property_type)
             
             # Extract contact information
-            page_contact_info = _extract_contact_info(text)
-            for key, value in page_contact_info.items():
-                if key not in contact_info:
-                    contact_info[key] = value
+            page_contact_info = _extract_contact_info(markers["CONTACT INFO"])
+            if page_contact_info:
+                contact_info = _merge_first_wins(contact_info, page_contact_info)
             
             # Extract structured data from tables
-            page_table_data = _extract_table_data(text)
+            page_table_data = _extract_table_data(markers["TABLE"])
             for key, value in page_table_data.items():
-                if key not in table_info:
-                    table_info[key] = []
                 table_info[key].extend(value)
             
             # Extract structured data from lists
-            page_list_data = _extract_list_data(text)
+            page_list_data = _extract_list_data(markers["LIST"])
             for key, value in page_list_data.items():
-                if key not in list_info:
-                    list_info[key] = []
                 list_info[key].extend(value)
             
             # Extract definition list data
-            page_definition_data = _extract_definition_list_data(text)
-            for key, value in page_definition_data.items():
-                if key not in definition_info:
-                    definition_info[key] = value
+            page_definition_data = _extract_definition_list_data(markers["DEFINITION LIST"])
+            if page_definition_data:
+                definition_info = _merge_first_wins(definition_info, page_definition_data)
             
             # Extract footer data
-            page_footer_data = _extract_footer_data(text)
-            for key, value in page_footer_data.items():
-                if key not in footer_info:
-                    footer_info[key] = value
+            page_footer_data = _extract_footer_data(markers["FOOTER CONTENT"])
+            if page_footer_data:
+                footer_info = _merge_first_wins(footer_info, page_footer_data)
             
             # Extract guarantor information
-            page_guarantor = _extract_guarantor_info(text)
-            for key, value in page_guarantor.items():
-                if key not in guarantor_info:
-                    guarantor_info[key] = value
+            page_guarantor = _extract_guarantor_info(text_lower)
+            if page_guarantor:
+                guarantor_info = _merge_first_wins(guarantor_info, page_guarantor)
             
             # JSON-LD extraction (existing logic)
-            for block in _extract_jsonld_blocks(text):
-                try:
-                    if isinstance(block, list):
-                        for item in block:
-                            if isinstance(item, dict):
-                                n = item.get("name") or item.get("@name")
-                                if n:
-                                    candidate_names.append(str(n))
-                                geo = item.get("geo") or {}
-                                lat_v = geo.get("latitude")
-                                lng_v = geo.get("longitude")
-                                if lat_v and lng_v and not (lat and lng):
-                                    lat, lng = str(lat_v), str(lng_v)
-                                # Features
-                                amen = item.get("amenityFeature") or []
-                                if isinstance(amen, list):
-                                    for a in amen:
-                                        nm = a.get("name") if isinstance(a, dict) else None
-                                        if nm:
-                                            features_accum.append({"type": "Amenities", "name": str(nm)})
-                    elif isinstance(block, dict):
-                        n = block.get("name") or block.get("@name")
-                        if n:
-                            candidate_names.append(str(n))
-                        geo = block.get("geo") or {}
+            for block in _extract_jsonld_blocks(markers["STRUCTURED DATA"]):
+                items = block if isinstance(block, list) else [block]
+                for item in items:
+                    if not isinstance(item, dict):
+                        continue
+                    n = item.get("name") or item.get("@name")
+                    if n and len(str(n)) > best_name_len:
+                        best_name = str(n)
+                        best_name_len = len(best_name)
+                    geo = item.get("geo")
+                    if isinstance(geo, dict):
                         lat_v = geo.get("latitude")
                         lng_v = geo.get("longitude")
                         if lat_v and lng_v and not (lat and lng):
                             lat, lng = str(lat_v), str(lng_v)
-                        amen = block.get("amenityFeature") or []
-                        if isinstance(amen, list):
-                            for a in amen:
-                                nm = a.get("name") if isinstance(a, dict) else None
-                                if nm:
-                                    features_accum.append({"type": "Amenities", "name": str(nm)})
-                except Exception:
-                    continue
+                    # Features
+                    amen = item.get("amenityFeature") or []
+                    if isinstance(amen, list):
+                        for a in amen:
+                            if len(features_accum) >= _MAX_DERIVED_FEATURES:
+                                break
+                            nm = a.get("name") if isinstance(a, dict) else None
+                            if nm:
+                                # Sites repeat the same amenity JSON-LD on every page; share one str per name
+                                features_accum.append({"type": "Amenities", "name": sys.intern(str(nm))})
 
             # Fallback lat/lng from free text (avoid false positives)
             if not (lat and lng):
-                for pat in latlng_patterns:
-                    m = re.search(pat, text, flags=re.IGNORECASE)
+                for latlng_re in _LATLNG_RES:
+                    m = latlng_re.search(text_lower)
                     if m and len(m.groups()) >= 2:
                         g1, g2 = m.group(1), m.group(2)
                         # Simple sanity check for lat/lng ranges
@@ -1467,9 +1924,8 @@ Context (reduced):
                             continue
 
         # Set derived hints
-        if candidate_names:
-            # Choose the longest meaningful name
-            best_name = max(candidate_names, key=lambda s: len(s))
+        if best_name:
+            # Longest meaningful name seen across pages
             hints["derived_basic_info"]["name"] = best_name.strip()
         
         if lat and lng:
@@ -1486,465 +1942,325 @@ Context (reduced):
             hints["derived_basic_info"]["contact"] = contact_info
         
         if table_info:
-            hints["derived_structured_data"] = {"tables": table_info}
+            hints["derived_structured_data"] = {"tables": dict(table_info)}
         
         if list_info:
             if "derived_structured_data" not in hints:
                 hints["derived_structured_data"] = {}
-            hints["derived_structured_data"]["lists"] = list_info
-        
-        if definition_info:
-            if "derived_structured_data" not in hints:
-                hints["derived_structured_data"] = {}
-            hints["derived_structured_data"]["definitions"] = definition_info
-        
-        if footer_info:
-            hints["derived_footer"] = footer_info
-        
-        if features_accum:
-            hints["derived_features"] = features_accum[:50]
-        
-        if guarantor_info:
-            hints["derived_guarantor"] = guarantor_info
-
-        return hints
-
-    def _highlight_key_information(self, context_text: str, node_name: str) -> str:
-        """Highlight key information in context text based on node type"""
-        if not context_text:
-            return ""
-            
-        # Define node-specific highlight patterns
-        highlight_patterns = {
-            'node1_basic_info': [
-                r'property\s+name', r'address', r'location', r'guarantor', 
-                r'feature', r'amenity', r'facility', r'rule', r'security'
-            ],
-            'node2_description': [
-                r'about', r'description', r'overview', r'feature', 
-                r'commute', r'location', r'payment', r'deposit', r'security\s+deposit', r'booking\s+deposit', r'holding\s+fee', r'installment|instalment', r'mode\s+of\s+payment', r'platform\s+fee', r'additional\s+fees',
-                r'policy', r'policies', r'house\s+rules', r'rules', r'cancellation', r'no\s+visa\s+no\s+pay', r'no\s+place\s+no\s+pay', r'refund', r'deferring', r'delayed\s+arrivals', r'extenuating', r'replacement\s+tenant', r'intake\s+delayed', r'pet\s+policy|pets', r'faq'
-            ],
-            'node3_configuration': [
-                r'room', r'studio', r'apartment', r'flat', r'accommodation',
-                r'price', r'cost', r'fee', r'rent', r'area', r'size', r'floor',
-                r'bedroom', r'bathroom', r'ensuite', r'en-suite', r'kitchen',
-                r'furniture', r'equipped', r'feature', r'amenity'
-            ],
-            'node4_tenancy': [
-                r'tenancy', r'contract', r'lease', r'term', r'duration',
-                r'week', r'month', r'year', r'availability', r'available',
-                r'start', r'end', r'date', r'price', r'cost', r'deposit'
-            ]
-        }
-        
-        patterns = highlight_patterns.get(node_name, [])
-        if not patterns:
-            return context_text
-            
-        # Split context into sections by source markers
-        sections = re.split(r'(===\s+[^=]+\s+===)', context_text)
-        highlighted_sections = []
-        
-        for i in range(0, len(sections), 2):
-            header = sections[i] if i == 0 else sections[i-1]
-            content = sections[i] if i == 0 else sections[i]
-            
-            # Apply highlighting to content
-            for pattern in patterns:
-                try:
-                    content = re.sub(
-                        f'({pattern}[\\w\\s\\-.,;:()]+)', 
-                        r'[IMPORTANT] \1 [/IMPORTANT]', 
-                        content, 
-                        flags=re.IGNORECASE
-                    )
-                except Exception:
-                    continue
-            
-            highlighted_sections.append(header if i > 0 else '')
-            highlighted_sections.append(content)
-        
-        return ''.join(highlighted_sections)
-    
-    def _get_node1_prompt(self) -> str:
-        """Get prompt for Node 1: Basic Info, Location, Features, Rules, Safety"""
-        return """You are a professional property data extraction assistant. Your task is to extract structured, authentic, and complete data from the provided student accommodation listing webpage and all linked content on that page.
-
-📌 Scope of Extraction:
-Parse the following sources:
-- The main webpage content.
-- All internal links, buttons, tabs, and expandable sections within the page that may contain additional content (e.g., amenities, policies, features, location).
-- Content loaded asynchronously via JavaScript, including dynamically rendered HTML elements.
-- Ensure everything is extracted as if rendered in a headless browser (with scrolling, clicking, expanding done).
-
-🧠 Your Objective:
-Return the extracted information in the following structured JSON format:
-{
-  "basic_info": {
-    "name": "",
-    "guarantor_required": "",
-    "source": "",
-    "source_link": "",
-    "property_type": "",
-    "contact": {
-      "phone": "",
-      "contact_details": ""
-    }
-  },
-  "location": {
-    "location_name": "",
-    "address": "",
-    "city": "",
-    "region": "",
-    "country": "",
-    "latitude": "",
-    "longitude": "",
-    "postcode": ""
-  },
-  "features": [
-    {
-      "type": "",
-      "name": ""
-    }
-  ],
-  "property_rules": [
-    {
-      "type": "",
-      "name": ""
-    }
-  ],
-  "safety_and_security": [
-    {
-      "type": "",
-      "name": ""
-    }
-  ]
-}
-
-🔍 Field-Level Details
-🟠 Basic Info
-- name: Full property name including city (e.g., "iQ Broderick House, Birmingham")
-- guarantor_required: Choose one from:
-  * No guarantor required
-  * International and local guarantors allowed
-  * Local guarantor only (third party guarantor service not allowed)
-  * Local guarantor only (third party guarantor service allowed)
-  * Information unavailable
-- source: Brand or operator name (e.g., "IQ Student Accommodation")
-- source_link: The original URL you are extracting from
-- property_type: Type of accommodation (e.g., "Student Accommodation", "Student Residence", "Purpose Built Student Residence")
-- contact: Contact information including phone and other details
-
-🟢 Location (ENHANCED - Extract ALL available fields)
-- location_name: Full name or address as mentioned
-- address: Complete street address if available
-- city: City name (e.g., "Leeds", "Birmingham")
-- region: State/County/Region (e.g., "West Yorkshire", "England")
-- country: Country name (e.g., "United Kingdom", "UK")
-- latitude: Extract from map, metadata, or page scripts (decimal format)
-- longitude: Extract from map, metadata, or page scripts (decimal format)
-- postcode: Postal/ZIP code if available
-
-🟡 Features
-Each item must contain:
-- type: Must match one from predefined dropdown (see below)
-- name: Amenity or label as shown on the page
-
-🔵 Property Rules
-Same structure as features.
-
-🔴 Safety and Security
-If the feature doesn't match any dropdown value, use:
-{
-  "type": "Others",
-  "name": "CCTV / Smart Entry / etc."
-}
-
-📎 Allowed Dropdown Values for type
-Air Conditioner & Heating, Balcony or Patios, Barbeque & Grill, Business Center, Cafe & Restaurant, Fan, Cinema Room, Clubhouse, Courtyard, Disability Access, Fireplace, Tile Flooring, Wooden Flooring, Carpet Flooring, Food & Meals, Garbage Disposal, Gas Stove, Gym & Fitness, Prayer Room, Internet Access, Wifi, Jogging, Kitchen with Appliance, Laundry Facility, Library & Study Area, Lounge, Maintenance, Medical Facility, Microwave, Parking, Electronic Payments, Pet Friendly, Playground, Snow Removal, Social Events, Spa & Salon, Sport Golf, Room Storage, Swimming Pool, Television, Sports, Pets Not Allowed, Blinds, Telephone, Breakfast Bar, Home Linen, Industry Accreditation & Awards, Common Social Area, Unfurnished Accommodations, Mattress, Games Area, Household Supplies, Sundeck, Vending Machine, Bean Bag, Terrace, Noticeboard, Property Rules, Content Insurance, Ironing Facility, Flatmate, Alarm Clock, Classroom, Den, Newly Refurbished, Fire Extinguisher, Coffee Machine, Basic Essentials, Parcel Collection, Location Benefit, Dining Area, Locker & Safes, Shuttle & Cab Service, Shops, Electric Vehicle Charging Station, Double Occupancy, Guarantor Requirement, Reception & Staff, Common Service, Fully Furnished, Fridge, Accommodation Features, Bathroom, Others
-
-⚠️ Extraction Rules
-❌ Do not guess values
-❌ Do not hallucinate information
-✅ Only extract what is explicitly available
-✅ Match dropdown values exactly
-✅ Leave missing data as empty string or "Information unavailable"
-✅ PRIORITIZE extracting coordinates and address information from any available source
-✅ Look for guarantor requirements in terms, FAQ, and application sections
-✅ Extract property type from meta tags, structured data, and page content
-✅ Look for contact information including phone numbers in contact sections"""
-    
-    def _get_node2_prompt(self) -> str:
-        """Get prompt for Node 2: Description Section (Detailed)"""
-        return """You are an expert data extraction agent for student accommodation platforms.
-Your task is to extract the entire description section, with all available sub-sections and nested tags, from a given student accommodation webpage.
-Return your output in strictly valid JSON format, as specified below.
-Maintain:
-- Original phrasing and language wherever possible
-- Full detail for all sections (do not truncate or paraphrase)
-- Empty string ("") or omit keys only if the data is truly not present
-
-📦 JSON Output Format
-{
-  "description": {
-    "about": "",
-    "features": "",
-    "highlights": [""],
-    "commute": "",
-    "location_and_whats_hot": "",
-    "distance": "",
-    "commute_pois": [
-      { "poi_name": "", "distance": "", "time": "", "transport": "" }
-    ],
-    "payments": {
-      "booking_deposit": "",
-      "security_deposit": "",
-      "payment_installment_plan": "",
-      "mode_of_payment": "",
-      "guarantor_requirement": "",
-      "fully_refundable_holding_fee": "",
-      "platform_fee": "",
-      "additional_fees": ""
-    },
-    "cancellation_policy": {
-      "cooling_off_period": "",
-      "no_visa_no_pay": "",
-      "no_place_no_pay": "",
-      "university_course_cancellation_or_modification": "",
-      "early_termination_by_student": "",
-      "delayed_arrivals_or_travel_restrictions": "",
-      "replacement_tenant_found": "",
-      "deferring_studies": "",
-      "university_intake_delayed": "",
-      "no_questions_asked": "",
-      "extenuating_circumstances": "",
-      "other_policies": ""
-    },
-    "pet_policy": "",
-    "faqs": [
-      {
-        "question": "",
-        "answer": ""
-      }
-    ],
-    "booking_disclaimer": "",
-    "email": ""
-  }
-}
-
-✅ Parsing Guidelines
-- Section Headings (Smart Mapping): Prefer content grouped under headings (About, Features, Payments, Policies, FAQs, Commute). Use heading boundaries when present. Map by title synonyms:
-  - About/Overview/Summary/Why this property → description.about
-  - Features/Amenities/Facilities/Inclusions → description.features
-  - Location/What's Hot/Nearby/Neighborhood/Area → description.location_and_whats_hot
-  - Distance/Commute/Transport/Travel → description.commute, description.distance, description.commute_pois
-  - Payments/Fees/Deposit/Charges/Installments/Instalments → description.payments (split into booking_deposit, security_deposit, installments, mode_of_payment, platform_fee, additional_fees, holding_fee)
-  - Policies/Terms/House Rules/Cancellation → description.cancellation_policy (map to specific keys using synonyms below)
-  - Pet Policy/Pets → description.pet_policy
-- Markers: Utilize content from markers produced by the scraper, including:
-  - [HEADING_SECTION title="..."] ... [END HEADING_SECTION]
-  - [WIDGET_SECTION type="..." selector="..."] ... [END WIDGET_SECTION]
-  - [LIST: TYPE] ... [END LIST], [TABLE: TYPE] ... [END TABLE], [DEFINITION LIST] ... [END DEFINITION LIST]
-  - [INLINE JSON] ... [END INLINE JSON], [API RESPONSE url="..."] ... [END API RESPONSE]
-  - [FOOTER CONTENT] for contact/policy/links if relevant
-- Commute POIs: When POIs/distances/times/transport are listed (tables, lists, widgets), populate commute_pois[] alongside the free-text commute.
-- Payments & Policies: Normalize different phrasings into the keys shown; if multiple values, include the most complete text.
-- Formatting: Keep full paragraphs intact with line breaks (\n) preserved if present on the source page.
-- Missing Data: If a sub-section does not exist, use an empty string "" or skip that key.
+            hints["derived_structured_data"]["lists"] = dict(list_info)
+        
+        if definition_info:
+            if "derived_structured_data" not in hints:
+                hints["derived_structured_data"] = {}
+            hints["derived_structured_data"]["definitions"] = definition_info
+        
+        if footer_info:
+            hints["derived_footer"] = footer_info
+        
+        if features_accum:
+            hints["derived_features"] = features_accum
+        
+        if guarantor_info:
+            hints["derived_guarantor"] = guarantor_info
 
-SMART SECTION MAPPING DETAILS
-- Use [HEADING_SECTION] titles to infer the target field. Example: title contains "Payment" → description.payments; title contains "Policy" → description.cancellation_policy; title contains "FAQ" → description.faqs.
-- If [WIDGET_SECTION type="faq"] contains lines like "Q: ...\nA: ...", split into {question, answer} objects and append to description.faqs.
-- If [WIDGET_SECTION type="policy"] contains cancellation/terms language, assign to description.cancellation_policy using the synonyms below.
-- For [TABLE: PRICING] or [LIST: FEATURES], merge structured items into description.features when they describe amenities; otherwise map to payments when they are fees.
+        return hints
 
-POLICY FIELD SYNONYMS (map to description.cancellation_policy keys):
-- cooling_off_period: cooling off, change of mind window, free cancellation window
-- no_visa_no_pay: no visa no pay, visa refused, visa rejection
-- no_place_no_pay: no place no pay, university place not confirmed, CAS refused
-- university_course_cancellation_or_modification: course cancelled, course changed, course modification
-- early_termination_by_student: early termination, breaking contract, early release, surrender tenancy
-- delayed_arrivals_or_travel_restrictions: delayed arrival, travel restriction, quarantine, covid
-- replacement_tenant_found: replacement tenant, substitute tenant, relet, reassign
-- deferring_studies: defer, deferral, postpone studies
-- university_intake_delayed: intake delayed, semester delayed, term delayed
-- no_questions_asked: no questions asked cancellation, unconditional cancellation
-- extenuating_circumstances: extenuating circumstances, exceptional circumstances, medical reasons
-- other_policies: any remaining relevant policy text not mapped above
-"""
+    def _highlight_key_information(self, context_text: str, node_name: str) -> str:
+        """Highlight key information in context text based on node type"""
+        if not context_text:
+            return ""
+            
+        highlight_re = _compiled_highlight_for(node_name)
+        if highlight_re is None:
+            return context_text
+            
+        # Highlight the content between source headers; the headers themselves are kept as-is
+        highlighted_sections = []
+        last = 0
+        for m in _SOURCE_HEADER_RE.finditer(context_text):
+            highlighted_sections.append(highlight_re.sub(r'[IMPORTANT] \g<0> [/IMPORTANT]', context_text[last:m.start()]))
+            highlighted_sections.append(m.group(0))
+            last = m.end()
+        highlighted_sections.append(highlight_re.sub(r'[IMPORTANT] \g<0> [/IMPORTANT]', context_text[last:]))
+        
+        return ''.join(highlighted_sections)
+    
+    def _get_node1_prompt(self) -> str:
+        """Get prompt for Node 1: Basic Info, Location, Features, Rules, Safety"""
+        return _NODE1_PROMPT
+    
+    def _get_node2_prompt(self) -> str:
+        """Get prompt for Node 2: Description Section (Detailed)"""
+        return _NODE2_PROMPT
     
     def _get_node3_prompt(self) -> str:
         """Get prompt for Node 3: Room Configurations, Pricing, Offers, Availability"""
-        return """You are a highly accurate data extraction agent trained to onboard detailed configuration-level data for student housing properties.
+        return _NODE3_PROMPT
+    
+    def _get_node4_prompt(self) -> str:
+        """Get prompt for Node 4: Tenancy-Level Room Configs with Contracts & Pricing"""
+        return _NODE4_PROMPT
+
+
+# Simulated extraction time for MockGPTExtractionClient
+_MOCK_LATENCY_SECONDS = 2
+
+# Sample payloads returned by MockGPTExtractionClient; source links are filled in per call
+_MOCK_NODE1_DATA = {
+    "basic_info": {
+        "name": "Sample Student Accommodation",
+        "guarantor_required": "International and local guarantors allowed",
+        "source": "Sample Provider",
+        "source_link": "",
+        "property_type": "Student Residence",
+        "contact": {
+            "phone": "0123 456 7890",
+            "contact_details": "info@sampleaccommodation.com"
+        }
+    },
+    "location": {
+        "location_name": "Sample Location, City",
+        "latitude": "51.5074",
+        "longitude": "-0.1278",
+        "region": "City, State, Country"
+    },
+    "features": [
+        {"type": "Wifi", "name": "High-speed WiFi"},
+        {"type": "Gym & Fitness", "name": "24/7 Fitness Center"},
+        {"type": "Laundry Facility", "name": "On-site Laundry"}
+    ],
+    "property_rules": [
+        {"type": "Property Rules", "name": "No smoking policy"},
+        {"type": "Property Rules", "name": "Quiet hours 10PM-8AM"}
+    ],
+    "safety_and_security": [
+        {"type": "Others", "name": "24/7 CCTV monitoring"},
+        {"type": "Others", "name": "Secure key card access"}
+    ]
+}
 
-📌 Objective:
-From the given property webpage content (including hidden sections, JS-loaded content, linked tabs, or accordions), extract all configurations (room types/units) offered under this property.
-Return structured JSON for each configuration, following the format below.
+_MOCK_NODE2_DATA = {
+    "description": {
+        "about": "Modern student accommodation in the heart of the city...",
+        "features": "Premium amenities including gym, study areas, and social spaces...",
+        "commute": "5 minutes walk to university campus...",
+        "location_and_whats_hot": "Located in vibrant student district...",
+        "distance": "University: 0.3 miles, City center: 0.8 miles",
+        "payments": {
+            "booking_deposit": "£200 refundable deposit",
+            "security_deposit": "£500 security deposit",
+            "payment_installment_plan": "Monthly payments available",
+            "mode_of_payment": "Bank transfer, credit card",
+            "guarantor_requirement": "UK guarantor or international guarantor service",
+            "fully_refundable_holding_fee": "£100 holding fee",
+            "platform_fee": "No platform fee",
+            "additional_fees": "Utilities included"
+        },
+        "cancellation_policy": {
+            "cooling_off_period": "14 days cooling off period",
+            "no_visa_no_pay": "Full refund if visa rejected",
+            "no_place_no_pay": "Full refund if university place not confirmed",
+            "university_course_cancellation_or_modification": "Flexible cancellation for course changes",
+            "early_termination_by_student": "30 days notice required",
+            "delayed_arrivals_or_travel_restrictions": "Flexible arrival dates",
+            "replacement_tenant_found": "Early termination if replacement found",
+            "deferring_studies": "Option to defer booking",
+            "university_intake_delayed": "Flexible start dates",
+            "no_questions_asked": "Not applicable",
+            "extenuating_circumstances": "Case by case basis",
+            "other_policies": "Standard terms and conditions apply"
+        },
+        "pet_policy": "No pets allowed",
+        "faqs": [
+            {
+                "question": "What is included in the rent?",
+                "answer": "Rent includes utilities, WiFi, and access to all facilities"
+            },
+            {
+                "question": "Is there parking available?",
+                "answer": "Limited parking spaces available for additional fee"
+            }
+        ],
+        "booking_disclaimer": "Prices subject to availability and terms apply",
+        "email": "info@sampleaccommodation.com"
+    }
+}
 
-📦 JSON Output Format
-Return an array named configurations where each object includes:
-{
-  "configurations": [
-    {
-      "Basic": {
-        "Name": "",
-        "Status": ""
-      },
-      "Source Details": {
-        "Source": "",
-        "Source Id": "",
-        "Source Link": ""
-      },
-      "Pricing": {
-        "Price": "",
-        "Min Price": "",
-        "Max Price": "",
-        "Deposit": "",
-        "Min Deposit Amount": "",
-        "Max Deposit Amount": ""
-      },
-      "Meta": {
-        "Price Duration": "",
-        "Price Currency": "",
-        "Advance Rent Multiplier Value": ""
-      },
-      "Area": {
-        "Area": "",
-        "Min Area": "",
-        "Max Area": "",
-        "Area Unit": ""
-      },
-      "Floor Details": {
-        "Floor": "",
-        "Facing": ""
-      },
-      "Configuration": {
-        "Types": [],
-        "Dual Occupancy": "",
-        "Unit Type": "",
-        "Bedroom Count": "",
-        "Min Bedroom Count": "",
-        "Max Bedroom Count": "",
-        "Bathroom Count": "",
-        "Min Bathroom Count": "",
-        "Max Bathroom Count": "",
-        "Unit Count": ""
-      },
-      "Lease Duration": {
-        "Lease Duration": "",
-        "Min Lease Duration": "",
-        "Max Lease Duration": "",
-        "Lease Duration Unit": ""
-      },
-      "Availability": {
-        "Available Units": "",
-        "Available From": ""
-      },
-      "Payments and Forms": {
-        "Jotform Form Id": "",
-        "Accept Payments": "",
-        "Payment Type to Collect": "",
-        "Terms and Conditions Doc URL": "",
-        "Login URL": "",
-        "Property is Non-Commissionable for Locals": "",
-        "Enable Payment Before Bookform": ""
-      },
-      "Description": {
-        "Name": "",
-        "Type": "",
-        "Numeric Value": "",
-        "Description": "",
-        "Safe to Save": ""
-      },
-      "Features": [
+_MOCK_NODE3_DATA = {
+    "configurations": [
         {
-          "Type": "",
-          "Section Name": "",
-          "Description": ""
+            "Basic": {
+                "Name": "Standard Studio",
+                "Status": "Available"
+            },
+            "Source Details": {
+                "Source": "Sample Provider",
+                "Source Id": "STD001",
+                "Source Link": ""
+            },
+            "Pricing": {
+                "Price": "£150",
+                "Min Price": "£140",
+                "Max Price": "£160",
+                "Deposit": "£500",
+                "Min Deposit Amount": "£500",
+                "Max Deposit Amount": "£500"
+            },
+            "Meta": {
+                "Price Duration": "per week",
+                "Price Currency": "GBP",
+                "Advance Rent Multiplier Value": "4"
+            },
+            "Area": {
+                "Area": "18",
+                "Min Area": "16",
+                "Max Area": "20",
+                "Area Unit": "sqm"
+            },
+            "Floor Details": {
+                "Floor": "Various",
+                "Facing": "Mixed"
+            },
+            "Configuration": {
+                "Types": ["Studio"],
+                "Dual Occupancy": "No",
+                "Unit Type": "Studio",
+                "Bedroom Count": "0",
+                "Min Bedroom Count": "0",
+                "Max Bedroom Count": "0",
+                "Bathroom Count": "1",
+                "Min Bathroom Count": "1",
+                "Max Bathroom Count": "1",
+                "Unit Count": "50"
+            },
+            "Lease Duration": {
+                "Lease Duration": "44",
+                "Min Lease Duration": "44",
+                "Max Lease Duration": "51",
+                "Lease Duration Unit": "weeks"
+            },
+            "Availability": {
+                "Available Units": "15",
+                "Available From": "2024-09-01"
+            },
+            "Payments and Forms": {
+                "Jotform Form Id": "",
+                "Accept Payments": "Yes",
+                "Payment Type to Collect": "Deposit",
+                "Terms and Conditions Doc URL": "",
+                "Login URL": "",
+                "Property is Non-Commissionable for Locals": "No",
+                "Enable Payment Before Bookform": "Yes"
+            },
+            "Description": {
+                "Name": "Standard Studio",
+                "Type": "Studio",
+                "Numeric Value": "18",
+                "Description": "Modern studio with kitchenette and en-suite bathroom",
+                "Safe to Save": "Yes"
+            },
+            "Features": [
+                {
+                    "Type": "Kitchen with Appliance",
+                    "Section Name": "Room Features",
+                    "Description": "Fully equipped kitchenette"
+                },
+                {
+                    "Type": "Bathroom",
+                    "Section Name": "Room Features", 
+                    "Description": "Private en-suite bathroom"
+                }
+            ]
         }
-      ]
-    }
-  ]
+    ]
 }
 
-🧠 Instructions
-- Scrape every configuration/unit listed on the page and its linked inner pages or tabs if required.
-- Normalize missing fields with "null" or "" where data is not mentioned.
-- Use dropdown values where applicable (e.g., Configuration Types, Dual Occupancy, etc.).
-- If ranges (e.g., price or area) are given, separate them as Min and Max.
-- Ensure all numeric values are extracted as strings for safety and compatibility.
-❌ Do not hallucinate. ✅ Return only what's explicitly or clearly stated in the source content.
-If a property has no configurations or content is missing, return: "configurations": []"""
-    
-    def _get_node4_prompt(self) -> str:
-        """Get prompt for Node 4: Tenancy-Level Room Configs with Contracts & Pricing"""
-        return """You are a property onboarding assistant tasked with extracting the most detailed, accurate, and structured tenancy-level data for student accommodation listings from a given webpage and all its links.
-Your job now goes beyond property-level details, and you must also extract all configuration (tenancy) level data, including room types, tenancy durations, prices, availability, and any special terms.
-
-📌 DATA SOURCES TO CONSIDER:
-You must extract and consolidate data from:
-- The main webpage
-- All tabs, pop-ups, expandable sections, and linked subpages
-- Content that loads dynamically via JavaScript or user interactions
-- Any JSON embedded in <script> tags or API responses if visible
-- All room cards, booking flows, or floor plan sections on the site
-
-📦 JSON OUTPUT FORMAT
-{
-  "property_level": {
-    "name": "",
-    "guarantor_required": "",
-    "source": "",
-    "source_link": "",
-    "location_name": "",
-    "latitude": "",
-    "longitude": "",
-    "region": ""
-  },
-  "configurations": [
-    {
-      "name": "",
-      "status": "",
-      "source": "",
-      "source_id": "",
-      "source_link": "",
-      "base_price": "",
-      "min_price": "",
-      "max_price": "",
-      "tenancy_options": [
+_MOCK_NODE4_DATA = {
+    "property_level": {
+        "name": "Sample Student Accommodation",
+        "guarantor_required": "International and local guarantors allowed",
+        "source": "Sample Provider",
+        "source_link": "",
+        "location_name": "Sample Location, City",
+        "latitude": "51.5074",
+        "longitude": "-0.1278",
+        "region": "City, State, Country"
+    },
+    "configurations": [
         {
-          "tenancy_length": "",
-          "price": "",
-          "availability_status": "",
-          "price_type": "",
-          "start_date": "",
-          "end_date": ""
+            "name": "Standard Studio",
+            "status": "Available",
+            "source": "Sample Provider",
+            "source_id": "STD001",
+            "source_link": "",
+            "base_price": "£150",
+            "min_price": "£140",
+            "max_price": "£160",
+            "tenancy_options": [
+                {
+                    "tenancy_length": "44 weeks",
+                    "price": "£150",
+                    "availability_status": "Available",
+                    "price_type": "per week",
+                    "start_date": "2024-09-01",
+                    "end_date": "2025-06-30"
+                },
+                {
+                    "tenancy_length": "51 weeks",
+                    "price": "£145",
+                    "availability_status": "Available",
+                    "price_type": "per week",
+                    "start_date": "2024-09-01",
+                    "end_date": "2025-08-31"
+                }
+            ],
+            "room_type": "Studio",
+            "bathroom_type": "En-suite",
+            "kitchen_type": "Kitchenette",
+            "occupancy": "Single",
+            "floor_area": "18 sqm",
+            "features": ["WiFi", "Utilities included", "24/7 security"],
+            "offers": ["Early bird discount", "No admin fees"],
+            "availability_note": "Limited availability - book early"
         }
-      ],
-      "room_type": "",
-      "bathroom_type": "",
-      "kitchen_type": "",
-      "occupancy": "",
-      "floor_area": "",
-      "features": ["..."],
-      "offers": ["..."],
-      "availability_note": ""
-    }
-  ]
+    ]
 }
 
-📚 FIELD EXPLANATIONS:
-- All property-level data fields mirror those from Node 1
-- Each room configuration includes room-specific tenancy options
-- Each tenancy_option is a separate contract offering
 
-⚠️ RULES:
-❌ Do not merge configs that differ in any detail
-❌ Do not hallucinate or guess
-✅ Extract data as rendered on full UI and booking flow
-✅ Simulate browser interactions if needed (scroll, expand, click)
-✅ Extract deeply nested data (scripts, React/Angular sections, JSON blobs)"""
+
+# Each builder copies its template so callers can post-process the result without touching it
+def _build_mock_node1(url: str) -> Dict[str, Any]:
+    data = copy.deepcopy(_MOCK_NODE1_DATA)
+    data["basic_info"]["source_link"] = url
+    return data
+
+
+def _build_mock_node2(url: str) -> Dict[str, Any]:
+    return copy.deepcopy(_MOCK_NODE2_DATA)
+
+
+def _build_mock_node3(url: str) -> Dict[str, Any]:
+    data = copy.deepcopy(_MOCK_NODE3_DATA)
+    for cfg in data["configurations"]:
+        cfg["Source Details"]["Source Link"] = url
+    return data
+
+
+def _build_mock_node4(url: str) -> Dict[str, Any]:
+    data = copy.deepcopy(_MOCK_NODE4_DATA)
+    data["property_level"]["source_link"] = url
+    for cfg in data["configurations"]:
+        cfg["source_link"] = url
+    return data
+
+
+_MOCK_BUILDERS = {
+    'node1_basic_info': _build_mock_node1,
+    'node2_description': _build_mock_node2,
+    'node3_configuration': _build_mock_node3,
+    'node4_tenancy': _build_mock_node4,
+}
+
 
 # Alternative implementation for environments without browsing capability
 class MockGPTExtractionClient(GPTExtractionClient):
@@ -1952,18 +2268,30 @@ class MockGPTExtractionClient(GPTExtractionClient):
     
     def extract_property_data(self, url: str, node_name: str, job_id: int) -> ExtractionResult:
         """Mock extraction that returns sample data"""
-        start_time = time.time()
+        start_time = time.perf_counter()
+        self.logger.log_node_start(job_id, node_name)
+        
+        # Simulate processing time
+        time.sleep(_MOCK_LATENCY_SECONDS)
+        return self._finish_mock_extraction(url, node_name, job_id, start_time)
+    
+    async def extract_property_data_async(self, url: str, node_name: str, job_id: int,
+                                          executor: Optional[Executor] = None) -> ExtractionResult:
+        """Mock extraction that waits on the event loop, so concurrent mock jobs overlap"""
+        start_time = time.perf_counter()
+        self.logger.log_node_start(job_id, node_name)
         
+        # Simulate processing time without holding a worker thread
+        await asyncio.sleep(_MOCK_LATENCY_SECONDS)
+        return self._finish_mock_extraction(url, node_name, job_id, start_time)
+    
+    def _finish_mock_extraction(self, url: str, node_name: str, job_id: int, start_time: float) -> ExtractionResult:
+        """Build the mock result once the simulated processing time has passed"""
         try:
-            self.logger.log_node_start(job_id, node_name)
-            
-            # Simulate processing time
-            time.sleep(2)
-            
             # Return mock data based on node type
             mock_data = self._get_mock_data(node_name, url)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             confidence_score = 0.85  # Mock confidence score
             
             self.logger.log_node_complete(job_id, node_name, execution_time, confidence_score)
@@ -1974,22 +2302,15 @@ class MockGPTExtractionClient(GPTExtractionClient):
                 error=None,
                 confidence_score=confidence_score,
                 execution_time=execution_time,
-                raw_response=json.dumps(mock_data, indent=2)
+                raw_response=_json_dumps_pretty(mock_data)
             )
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_msg = str(e)
             
             # Categorize errors for better handling
-            if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
-                error_category = 'timeout'
-            elif 'connection' in error_msg.lower() or 'network' in error_msg.lower():
-                error_category = 'connection'
-            elif 'rate limit' in error_msg.lower() or 'too many requests' in error_msg.lower():
-                error_category = 'rate_limit'
-            else:
-                error_category = 'unknown'
+            error_category = _categorize_error(error_msg)
             
             self.logger.log_node_failed(job_id, node_name, error_msg, duration=execution_time)
             
@@ -2005,231 +2326,17 @@ class MockGPTExtractionClient(GPTExtractionClient):
     
     def _get_mock_data(self, node_name: str, url: str) -> Dict[str, Any]:
         """Generate mock data for testing"""
-        if node_name == 'node1_basic_info':
-            return {
-                "basic_info": {
-                    "name": "Sample Student Accommodation",
-                    "guarantor_required": "International and local guarantors allowed",
-                    "source": "Sample Provider",
-                    "source_link": url,
-                    "property_type": "Student Residence",
-                    "contact": {
-                        "phone": "0123 456 7890",
-                        "contact_details": "info@sampleaccommodation.com"
-                    }
-                },
-                "location": {
-                    "location_name": "Sample Location, City",
-                    "latitude": "51.5074",
-                    "longitude": "-0.1278",
-                    "region": "City, State, Country"
-                },
-                "features": [
-                    {"type": "Wifi", "name": "High-speed WiFi"},
-                    {"type": "Gym & Fitness", "name": "24/7 Fitness Center"},
-                    {"type": "Laundry Facility", "name": "On-site Laundry"}
-                ],
-                "property_rules": [
-                    {"type": "Property Rules", "name": "No smoking policy"},
-                    {"type": "Property Rules", "name": "Quiet hours 10PM-8AM"}
-                ],
-                "safety_and_security": [
-                    {"type": "Others", "name": "24/7 CCTV monitoring"},
-                    {"type": "Others", "name": "Secure key card access"}
-                ]
-            }
-        elif node_name == 'node2_description':
-            return {
-                "description": {
-                    "about": "Modern student accommodation in the heart of the city...",
-                    "features": "Premium amenities including gym, study areas, and social spaces...",
-                    "commute": "5 minutes walk to university campus...",
-                    "location_and_whats_hot": "Located in vibrant student district...",
-                    "distance": "University: 0.3 miles, City center: 0.8 miles",
-                    "payments": {
-                        "booking_deposit": "£200 refundable deposit",
-                        "security_deposit": "£500 security deposit",
-                        "payment_installment_plan": "Monthly payments available",
-                        "mode_of_payment": "Bank transfer, credit card",
-                        "guarantor_requirement": "UK guarantor or international guarantor service",
-                        "fully_refundable_holding_fee": "£100 holding fee",
-                        "platform_fee": "No platform fee",
-                        "additional_fees": "Utilities included"
-                    },
-                    "cancellation_policy": {
-                        "cooling_off_period": "14 days cooling off period",
-                        "no_visa_no_pay": "Full refund if visa rejected",
-                        "no_place_no_pay": "Full refund if university place not confirmed",
-                        "university_course_cancellation_or_modification": "Flexible cancellation for course changes",
-                        "early_termination_by_student": "30 days notice required",
-                        "delayed_arrivals_or_travel_restrictions": "Flexible arrival dates",
-                        "replacement_tenant_found": "Early termination if replacement found",
-                        "deferring_studies": "Option to defer booking",
-                        "university_intake_delayed": "Flexible start dates",
-                        "no_questions_asked": "Not applicable",
-                        "extenuating_circumstances": "Case by case basis",
-                        "other_policies": "Standard terms and conditions apply"
-                    },
-                    "pet_policy": "No pets allowed",
-                    "faqs": [
-                        {
-                            "question": "What is included in the rent?",
-                            "answer": "Rent includes utilities, WiFi, and access to all facilities"
-                        },
-                        {
-                            "question": "Is there parking available?",
-                            "answer": "Limited parking spaces available for additional fee"
-                        }
-                    ],
-                    "booking_disclaimer": "Prices subject to availability and terms apply",
-                    "email": "info@sampleaccommodation.com"
-                }
-            }
-        elif node_name == 'node3_configuration':
-            return {
-                "configurations": [
-                    {
-                        "Basic": {
-                            "Name": "Standard Studio",
-                            "Status": "Available"
-                        },
-                        "Source Details": {
-                            "Source": "Sample Provider",
-                            "Source Id": "STD001",
-                            "Source Link": url
-                        },
-                        "Pricing": {
-                            "Price": "£150",
-                            "Min Price": "£140",
-                            "Max Price": "£160",
-                            "Deposit": "£500",
-                            "Min Deposit Amount": "£500",
-                            "Max Deposit Amount": "£500"
-                        },
-                        "Meta": {
-                            "Price Duration": "per week",
-                            "Price Currency": "GBP",
-                            "Advance Rent Multiplier Value": "4"
-                        },
-                        "Area": {
-                            "Area": "18",
-                            "Min Area": "16",
-                            "Max Area": "20",
-                            "Area Unit": "sqm"
-                        },
-                        "Floor Details": {
-                            "Floor": "Various",
-                            "Facing": "Mixed"
-                        },
-                        "Configuration": {
-                            "Types": ["Studio"],
-                            "Dual Occupancy": "No",
-                            "Unit Type": "Studio",
-                            "Bedroom Count": "0",
-                            "Min Bedroom Count": "0",
-                            "Max Bedroom Count": "0",
-                            "Bathroom Count": "1",
-                            "Min Bathroom Count": "1",
-                            "Max Bathroom Count": "1",
-                            "Unit Count": "50"
-                        },
-                        "Lease Duration": {
-                            "Lease Duration": "44",
-                            "Min Lease Duration": "44",
-                            "Max Lease Duration": "51",
-                            "Lease Duration Unit": "weeks"
-                        },
-                        "Availability": {
-                            "Available Units": "15",
-                            "Available From": "2024-09-01"
-                        },
-                        "Payments and Forms": {
-                            "Jotform Form Id": "",
-                            "Accept Payments": "Yes",
-                            "Payment Type to Collect": "Deposit",
-                            "Terms and Conditions Doc URL": "",
-                            "Login URL": "",
-                            "Property is Non-Commissionable for Locals": "No",
-                            "Enable Payment Before Bookform": "Yes"
-                        },
-                        "Description": {
-                            "Name": "Standard Studio",
-                            "Type": "Studio",
-                            "Numeric Value": "18",
-                            "Description": "Modern studio with kitchenette and en-suite bathroom",
-                            "Safe to Save": "Yes"
-                        },
-                        "Features": [
-                            {
-                                "Type": "Kitchen with Appliance",
-                                "Section Name": "Room Features",
-                                "Description": "Fully equipped kitchenette"
-                            },
-                            {
-                                "Type": "Bathroom",
-                                "Section Name": "Room Features", 
-                                "Description": "Private en-suite bathroom"
-                            }
-                        ]
-                    }
-                ]
-            }
-        elif node_name == 'node4_tenancy':
-            return {
-                "property_level": {
-                    "name": "Sample Student Accommodation",
-                    "guarantor_required": "International and local guarantors allowed",
-                    "source": "Sample Provider",
-                    "source_link": url,
-                    "location_name": "Sample Location, City",
-                    "latitude": "51.5074",
-                    "longitude": "-0.1278",
-                    "region": "City, State, Country"
-                },
-                "configurations": [
-                    {
-                        "name": "Standard Studio",
-                        "status": "Available",
-                        "source": "Sample Provider",
-                        "source_id": "STD001",
-                        "source_link": url,
-                        "base_price": "£150",
-                        "min_price": "£140",
-                        "max_price": "£160",
-                        "tenancy_options": [
-                            {
-                                "tenancy_length": "44 weeks",
-                                "price": "£150",
-                                "availability_status": "Available",
-                                "price_type": "per week",
-                                "start_date": "2024-09-01",
-                                "end_date": "2025-06-30"
-                            },
-                            {
-                                "tenancy_length": "51 weeks",
-                                "price": "£145",
-                                "availability_status": "Available",
-                                "price_type": "per week",
-                                "start_date": "2024-09-01",
-                                "end_date": "2025-08-31"
-                            }
-                        ],
-                        "room_type": "Studio",
-                        "bathroom_type": "En-suite",
-                        "kitchen_type": "Kitchenette",
-                        "occupancy": "Single",
-                        "floor_area": "18 sqm",
-                        "features": ["WiFi", "Utilities included", "24/7 security"],
-                        "offers": ["Early bird discount", "No admin fees"],
-                        "availability_note": "Limited availability - book early"
-                    }
-                ]
-            }
-        else:
+        builder = _MOCK_BUILDERS.get(node_name)
+        if builder is None:
             return {"error": f"Unknown node: {node_name}"}
+        return builder(url)
 
+@functools.cache
 def get_extraction_client() -> GPTExtractionClient:
-    """Get the appropriate extraction client based on configuration"""
+    """Get the appropriate extraction client based on configuration.
+    The client holds no per-request state, so one instance is built per process and shared;
+    call get_extraction_client.cache_clear() after changing the API key at runtime.
+    """
     config = get_config()
     
     # Check if we have a valid OpenAI API key
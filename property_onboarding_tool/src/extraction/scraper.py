@@ -1,24 +1,246 @@
+import os
 import re
+import json
 import time
+import sqlite3
+import tempfile
+import hashlib
+import functools
+import threading
 from urllib.parse import urljoin, urlparse, urlunparse
-from typing import List, Dict, Set, Tuple, Any
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Dict, Set, Tuple, Any, Deque
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
 
 
 DEFAULT_USER_AGENT = "PropertyOnboardingBot/1.0 (+https://example.com)"
 
+# Map initializers in inline scripts, each capturing (lat, lng)
+_MAP_PATTERNS = (
+    # Google Maps
+    r'google\.maps\.LatLng\(([-\d.]+),\s*([-\d.]+)\)',
+    r'center:\s*\{lat:\s*([-\d.]+),\s*lng:\s*([-\d.]+)\}',
+    r'position:\s*\{lat:\s*([-\d.]+),\s*lng:\s*([-\d.]+)\}',
+    # Mapbox
+    r'center:\s*\[([-\d.]+),\s*([-\d.]+)\]',
+    r'coordinates:\s*\[([-\d.]+),\s*([-\d.]+)\]',
+    # Leaflet
+    r'setView\(\[([-\d.]+),\s*([-\d.]+)\]',
+    # Generic coordinate patterns
+    r'lat(?:itude)?["\']?\s*:\s*([-\d.]+)[,;]\s*lng|long(?:itude)?["\']?\s*:\s*([-\d.]+)',
+    r'["\']lat["\']\s*:\s*([-\d.]+)[,;]\s*["\']lng["\']\s*:\s*([-\d.]+)',
+)
+# All initializers in one alternation so each script body is walked once. Each is wrapped in a
+# named group; _MAP_COORD_GROUPS maps that name to (initializer index, index of its lat group).
+_MAP_COORD_RE = re.compile("|".join(f"(?P<map{i}>{p})" for i, p in enumerate(_MAP_PATTERNS)), re.IGNORECASE)
 
+
+def _map_coord_groups() -> Dict[str, Tuple[int, int]]:
+    groups: Dict[str, Tuple[int, int]] = {}
+    next_group = 1
+    for i, pattern in enumerate(_MAP_PATTERNS):
+        groups[f"map{i}"] = (i, next_group + 1)
+        next_group += 1 + re.compile(pattern).groups
+    return groups
+
+
+_MAP_COORD_GROUPS = _map_coord_groups()
+
+# Every _MAP_PATTERNS match contains one of these (lower-cased); scripts without any skip the regex
+_MAP_COORD_HINTS = ("lat", "long", "center", "coordinates", "setview")
+
+
+# Page text phrases that mark a student accommodation listing
+_STUDENT_ACCOM_RE = re.compile(
+    r'student\s+(?:accommodation|residence|housing|apartments|flats)'
+    r'|residential\s+(?:accommodation|property)'
+    r'|purpose\s+built\s+student\s+residence',
+    re.IGNORECASE,
+)
+
+# Phone number patterns (UK and international)
+_PHONE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\+44\s*\d{1,4}\s*\d{1,4}\s*\d{1,4}',
+    r'\(0\)\d{1,4}\s*\d{1,4}\s*\d{1,4}',
+    r'0\d{1,4}\s*\d{1,4}\s*\d{1,4}',
+    r'07\d{3}\s*\d{3}\s*\d{3}',
+    r'01\d{3}\s*\d{3}\s*\d{3}',
+    r'02\d{3}\s*\d{3}\s*\d{3}',
+))
+
+# Cleaned page text is capped at this many characters (increased to 120k per page)
+_MAX_OUTPUT_CHARS = 120_000
+# Raw HTML beyond this is dropped before parsing; the cleaned output is capped anyway
+_MAX_INPUT_CHARS = 1_500_000
+
+# Cleaned text of recently seen pages, keyed by a digest of the raw HTML. Sites serve the same
+# shell/template/error page under many URLs; a repeat costs a hash instead of a full re-parse.
+_CLEAN_TEXT_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_CLEAN_TEXT_CACHE_SIZE = 256
+_CLEAN_TEXT_CACHE_MIN_CHARS = 1024  # smaller pages are cheaper to clean than to hash
+_CLEAN_TEXT_CACHE_LOCK = threading.Lock()
+
+# Prefer the C-backed lxml parser; fall back to the stdlib parser when lxml is not installed
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+# JSON-LD is parsed with orjson's C parser when installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# JSON-LD keys passed on to extraction; everything nested under them is kept
+_LD_KEYS = ("@type", "name", "@name", "address", "geo", "offers", "amenityFeature")
+
+# What _build_clean_text needs from the page, collected by _single_pass in one walk of the tree.
+# Buckets are keyed by the CSS selector each one stands in for.
+_PASS_NAME_KEYS = {
+    "script": ("script", "strip"), "style": ("strip",), "noscript": ("strip",), "svg": ("strip",),
+    "canvas": ("strip",), "video": ("strip",), "iframe": ("strip",), "header": ("strip",), "nav": ("strip",),
+    "h1": ("headings",), "h2": ("headings",), "h3": ("headings",), "h4": ("headings",),
+    "table": ("table",), "ul": ("ul",), "ol": ("ol",), "dl": ("dl",),
+    "address": ("address",), "footer": ("footer",),
+    "main": ("main",), "article": ("article",), "section": ("section",),
+}
+# class -> ((required tag name or None, bucket key), ...)
+_PASS_CLASS_KEYS = {
+    "address": ((None, ".address"),), "location": ((None, ".location"),),
+    "property-address": ((None, ".property-address"),), "contact-address": ((None, ".contact-address"),),
+    "contact": ((None, ".contact"),), "contact-info": ((None, ".contact-info"),),
+    "contact-details": ((None, ".contact-details"),), "get-in-touch": ((None, ".get-in-touch"),),
+    "phone": ((None, ".phone"),), "telephone": ((None, ".telephone"),),
+    "call-us": ((None, ".call-us"),), "contact-us": ((None, ".contact-us"),),
+    "footer": ((None, ".footer"),),
+    "content": (("div", "div.content"),), "main": (("div", "div.main"),),
+    "description": (("div", "div.description"),), "property": (("div", "div.property"),),
+    "room": (("div", "div.room"),), "pricing": (("div", "div.pricing"),),
+    "tenancy": (("div", "div.tenancy"),), "details": (("div", "div.details"),),
+    "features": (("div", "div.features"),), "amenities": (("div", "div.amenities"),),
+}
+_PASS_ITEMTYPE_KEYS = (("PostalAddress", '[itemtype*="PostalAddress"]'), ("Place", '[itemtype*="Place"]'))
+_PASS_DATA_KEYS = ("data-property-type", "data-accommodation-type")
+
+
+def _single_pass(root: BeautifulSoup) -> Dict[str, List[Tag]]:
+    """Walk root once and bucket the tags _build_clean_text reads, each bucket in document order."""
+    buckets: Dict[str, List[Tag]] = defaultdict(list)
+    for tag in root.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        for key in _PASS_NAME_KEYS.get(tag.name, ()):
+            buckets[key].append(tag)
+        attrs = tag.attrs
+        if not attrs:
+            continue
+        if tag.name == "meta":
+            if "property" in attrs:
+                buckets[f'meta[property="{attrs["property"]}"]'].append(tag)
+            if "name" in attrs:
+                buckets[f'meta[name="{attrs["name"]}"]'].append(tag)
+        classes = attrs.get("class")
+        if classes:
+            for cls in dict.fromkeys(classes):
+                for name, key in _PASS_CLASS_KEYS.get(cls, ()):
+                    if name is None or name == tag.name:
+                        buckets[key].append(tag)
+        itemtype = attrs.get("itemtype")
+        if itemtype:
+            for needle, key in _PASS_ITEMTYPE_KEYS:
+                if needle in itemtype:
+                    buckets[key].append(tag)
+        if attrs.get("id") == "footer":
+            buckets["#footer"].append(tag)
+        if attrs.get("role") == "contentinfo":
+            buckets['[role="contentinfo"]'].append(tag)
+        if "data-lat" in attrs and "data-lng" in attrs:
+            buckets["data-latlng"].append(tag)
+        for attr in _PASS_DATA_KEYS:
+            if attr in attrs:
+                buckets[f"[{attr}]"].append(tag)
+        if ("itemprop" in attrs or "itemtype" in attrs or "itemscope" in attrs
+                or any(attr.startswith("data-") for attr in attrs)):
+            buckets["data-attributes"].append(tag)
+    return buckets
+
+
+
+def _text_prefix(elem: Tag, limit: int) -> str:
+    """First `limit` chars of elem.get_text(strip=True), without materialising the rest of the subtree."""
+    parts: List[str] = []
+    size = 0
+    for text in elem.stripped_strings:
+        parts.append(text)
+        size += len(text)
+        if size >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+def _has_claimed_ancestor(elem: Tag, claimed: Set[int]) -> bool:
+    """True when elem, or any element containing it, has already been read out."""
+    return id(elem) in claimed or any(id(parent) in claimed for parent in elem.parents)
+
+
+def _summarize_ld(data: Any) -> List[Dict[str, Any]]:
+    """The whitelisted keys of each entity in a JSON-LD document (including @graph)."""
+    if isinstance(data, list):
+        entities: List[Dict[str, Any]] = []
+        for item in data:
+            entities.extend(_summarize_ld(item))
+        return entities
+    if not isinstance(data, dict):
+        return []
+    entities = []
+    entity = {key: data[key] for key in _LD_KEYS if key in data}
+    if entity:
+        entities.append(entity)
+    if "@graph" in data:
+        entities.extend(_summarize_ld(data["@graph"]))
+    return entities
+
+
+# The same link is parsed for its host, its normalized form and its score; parse it once
+_urlparse = functools.lru_cache(maxsize=16384)(urlparse)
+
+
+@functools.lru_cache(maxsize=8192)
+def _netloc(url: str) -> str:
+    """Lower-cased host[:port] of url; a crawl pairs the same few hosts with thousands of links."""
+    return _urlparse(url).netloc.lower()
+
+
+@functools.lru_cache(maxsize=8192)
 def _is_same_domain(base_url: str, target_url: str) -> bool:
     try:
-        b = urlparse(base_url)
-        t = urlparse(target_url)
-        return (t.netloc or b.netloc) == b.netloc
+        base = _netloc(base_url)
+        return (_netloc(target_url) or base) == base
     except Exception:
         return False
 
 
+@functools.lru_cache(maxsize=8192)
+def _host_matches_allowed(host: str, extra_allowed: Tuple[str, ...]) -> bool:
+    for pattern in extra_allowed:
+        p = (pattern or '').strip().lower()
+        if not p:
+            continue
+        if host == p or host.endswith('.' + p):
+            return True
+    return False
+
+
 def _is_allowed_domain(base_url: str, target_url: str, extra_allowed: List[str] | None) -> bool:
     """Return True if target is same-domain as base OR its host matches any in extra_allowed.
     Matching for extras is suffix-based to allow subdomains, e.g., help.example.com for example.com
@@ -28,66 +250,97 @@ def _is_allowed_domain(base_url: str, target_url: str, extra_allowed: List[str]
     if not extra_allowed:
         return False
     try:
-        host = (urlparse(target_url).netloc or '').lower()
-        for pattern in extra_allowed:
-            p = (pattern or '').strip().lower()
-            if not p:
-                continue
-            if host == p or host.endswith('.' + p):
-                return True
+        return _host_matches_allowed(_netloc(target_url), tuple(extra_allowed))
     except Exception:
         return False
-    return False
 
 
-def _clean_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+def _parts_len(*sections: Any) -> int:
+    """Combined length of output sections, each a str or a list of str parts."""
+    return sum(len(section) if isinstance(section, str) else sum(map(len, section)) for section in sections)
+
+
+def _parse_html(html: str) -> BeautifulSoup:
+    """Parse a page, dropping raw HTML beyond _MAX_INPUT_CHARS first."""
+    if len(html) > _MAX_INPUT_CHARS:
+        html = html[:_MAX_INPUT_CHARS]
+    return BeautifulSoup(html, _HTML_PARSER)
+
+
+def _clean_text(html: str, soup: BeautifulSoup | None = None) -> str:
+    """Cleaned, section-tagged text of a page. `soup`, when the caller already has
+    _parse_html(html), is reused instead of parsing again; it is consumed (non-content
+    tags are decomposed), so read anything else from it first.
+    """
+    if len(html) < _CLEAN_TEXT_CACHE_MIN_CHARS:
+        return _build_clean_text(html, soup)
+    key = hashlib.blake2b(html.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _CLEAN_TEXT_CACHE_LOCK:
+        cached = _CLEAN_TEXT_CACHE.get(key)
+        if cached is not None:
+            _CLEAN_TEXT_CACHE.move_to_end(key)
+            return cached
+    cleaned = _build_clean_text(html, soup)
+    with _CLEAN_TEXT_CACHE_LOCK:
+        _CLEAN_TEXT_CACHE[key] = cleaned
+        if len(_CLEAN_TEXT_CACHE) > _CLEAN_TEXT_CACHE_SIZE:
+            _CLEAN_TEXT_CACHE.popitem(last=False)
+    return cleaned
+
+
+def _build_clean_text(html: str, soup: BeautifulSoup | None = None) -> str:
+    if soup is None:
+        soup = _parse_html(html)
+    buckets = _single_pass(soup)
     
     # Extract structured data if available (JSON-LD, microdata)
-    structured_data = ""
-    for script in soup.find_all("script", {"type": "application/ld+json"}):
+    structured_data = []
+    for script in buckets["script"]:
+        if script.get("type") != "application/ld+json":
+            continue
+        if not script.string:
+            continue
+        # Only the fields extraction uses; a raw multi-KB blob would crowd everything else out of the cap
         try:
-            structured_data += "\n\n[STRUCTURED DATA]\n" + script.string + "\n[END STRUCTURED DATA]\n\n"
-        except Exception:
-            pass
+            entities = _summarize_ld(_json_loads(str(script.string)))  # orjson rejects str subclasses
+        except ValueError:
+            continue
+        if entities:
+            # Re-emitted as JSON: the node-1 hint pass parses these blocks back into dicts
+            payload = json.dumps(entities[0] if len(entities) == 1 else entities, ensure_ascii=False)
+            structured_data.append("\n\n[STRUCTURED DATA]\n" + payload + "\n[END STRUCTURED DATA]\n\n")
+    
+    # Enhanced structured data extraction
+    enhanced_structured_data = _extract_structured_data(soup)
     
     # Extract map coordinates from JavaScript (high priority for Node 1)
-    map_coordinates = ""
-    for script in soup.find_all("script"):
+    map_coordinates = []
+    for script in buckets["script"]:
         if script.string:
             script_content = script.string
-            # Look for common map initializers
-            map_patterns = [
-                # Google Maps
-                r'google\.maps\.LatLng\(([-\d.]+),\s*([-\d.]+)\)',
-                r'center:\s*\{lat:\s*([-\d.]+),\s*lng:\s*([-\d.]+)\}',
-                r'position:\s*\{lat:\s*([-\d.]+),\s*lng:\s*([-\d.]+)\}',
-                # Mapbox
-                r'center:\s*\[([-\d.]+),\s*([-\d.]+)\]',
-                r'coordinates:\s*\[([-\d.]+),\s*([-\d.]+)\]',
-                # Leaflet
-                r'setView\(\[([-\d.]+),\s*([-\d.]+)\]',
-                # Generic coordinate patterns
-                r'lat(?:itude)?["\']?\s*:\s*([-\d.]+)[,;]\s*lng|long(?:itude)?["\']?\s*:\s*([-\d.]+)',
-                r'["\']lat["\']\s*:\s*([-\d.]+)[,;]\s*["\']lng["\']\s*:\s*([-\d.]+)',
-            ]
-            
-            for pattern in map_patterns:
-                matches = re.findall(pattern, script_content, re.IGNORECASE)
-                for match in matches:
-                    if len(match) >= 2:
-                        lat, lng = match[0], match[1]
-                        # Validate coordinates
-                        try:
-                            lat_f, lng_f = float(lat), float(lng)
-                            if -90 <= lat_f <= 90 and -180 <= lng_f <= 180:
-                                map_coordinates += f"\n\n[MAP COORDINATES]\nLatitude: {lat}\nLongitude: {lng}\n[END MAP COORDINATES]\n\n"
-                                break  # Found valid coordinates, move to next script
-                        except ValueError:
-                            continue
+            script_lower = script_content.lower()
+            if not any(hint in script_lower for hint in _MAP_COORD_HINTS):
+                continue
+            # Look for common map initializers; keep the first valid pair per initializer kind
+            found_coords: Dict[int, Tuple[str, str]] = {}
+            for m in _MAP_COORD_RE.finditer(script_content):
+                kind, first_group = _MAP_COORD_GROUPS[m.lastgroup]
+                if kind in found_coords:
+                    continue
+                lat, lng = m.group(first_group), m.group(first_group + 1)
+                # Validate coordinates
+                try:
+                    lat_f, lng_f = float(lat), float(lng)
+                    if -90 <= lat_f <= 90 and -180 <= lng_f <= 180:
+                        found_coords[kind] = (lat, lng)
+                except (TypeError, ValueError):
+                    continue
+            for kind in sorted(found_coords):
+                lat, lng = found_coords[kind]
+                map_coordinates.append(f"\n\n[MAP COORDINATES]\nLatitude: {lat}\nLongitude: {lng}\n[END MAP COORDINATES]\n\n")
     
     # Extract location data from HTML meta tags and data attributes
-    location_meta = ""
+    location_meta = []
     
     # Open Graph and standard meta tags
     meta_tags = [
@@ -105,36 +358,37 @@ def _clean_text(html: str) -> str:
     ]
     
     for meta_name, field_name in meta_tags:
-        meta_elem = soup.find('meta', {'property': meta_name}) or soup.find('meta', {'name': meta_name})
+        candidates = buckets.get(f'meta[property="{meta_name}"]') or buckets.get(f'meta[name="{meta_name}"]')
+        meta_elem = candidates[0] if candidates else None
         if meta_elem and meta_elem.get('content'):
-            location_meta += f"{field_name}: {meta_elem['content']}\n"
+            location_meta.append(f"{field_name}: {meta_elem['content']}\n")
     
     # Data attributes for coordinates
-    for elem in soup.find_all(attrs={'data-lat': True, 'data-lng': True}):
+    for elem in buckets["data-latlng"]:
         lat = elem.get('data-lat')
         lng = elem.get('data-lng')
         if lat and lng:
             try:
                 lat_f, lng_f = float(lat), float(lng)
                 if -90 <= lat_f <= 90 and -180 <= lng_f <= 180:
-                    location_meta += f"data_latitude: {lat}\ndata_longitude: {lng}\n"
+                    location_meta.append(f"data_latitude: {lat}\ndata_longitude: {lng}\n")
             except ValueError:
                 pass
     
     # Extract address information from structured elements
-    address_info = ""
+    address_info = []
     address_selectors = [
         'address', '[itemtype*="PostalAddress"]', '[itemtype*="Place"]',
         '.address', '.location', '.property-address', '.contact-address'
     ]
     
     for selector in address_selectors:
-        for elem in soup.select(selector):
+        for elem in buckets.get(selector, ()):
             if elem.get_text(strip=True):
-                address_info += f"\n[ADDRESS INFO]\n{elem.get_text(' ', strip=True)}\n[END ADDRESS INFO]\n"
+                address_info.append(f"\n[ADDRESS INFO]\n{elem.get_text(' ', strip=True)}\n[END ADDRESS INFO]\n")
     
     # Extract property type and classification information
-    property_info = ""
+    property_info = []
     
     # Look for property type in meta tags and structured data
     property_type_selectors = [
@@ -146,47 +400,15 @@ def _clean_text(html: str) -> str:
     ]
     
     for selector in property_type_selectors:
-        for elem in soup.select(selector):
+        for elem in buckets.get(selector, ()):
             if elem.get('content') or elem.get('data-property-type') or elem.get('data-accommodation-type'):
                 value = elem.get('content') or elem.get('data-property-type') or elem.get('data-accommodation-type')
                 if value:
-                    property_info += f"\n[PROPERTY TYPE]\n{value}\n[END PROPERTY TYPE]\n"
+                    property_info.append(f"\n[PROPERTY TYPE]\n{value}\n[END PROPERTY TYPE]\n")
                     break
     
-    # Look for property type in text patterns
-    property_type_patterns = [
-        r'student\s+accommodation',
-        r'residential\s+(?:accommodation|property)',
-        r'purpose\s+built\s+student\s+residence',
-        r'student\s+residence',
-        r'student\s+housing',
-        r'student\s+apartments',
-        r'student\s+flats'
-    ]
-    
-    for pattern in property_type_patterns:
-        if re.search(pattern, text.lower()):
-            property_info += f"\n[PROPERTY TYPE]\nStudent Accommodation\n[END PROPERTY TYPE]\n"
-            break
-    
     # Extract contact information
-    contact_info = ""
-    
-    # Phone number patterns (UK and international)
-    phone_patterns = [
-        r'\+44\s*\d{1,4}\s*\d{1,4}\s*\d{1,4}',
-        r'\(0\)\d{1,4}\s*\d{1,4}\s*\d{1,4}',
-        r'0\d{1,4}\s*\d{1,4}\s*\d{1,4}',
-        r'07\d{3}\s*\d{3}\s*\d{3}',
-        r'01\d{3}\s*\d{3}\s*\d{3}',
-        r'02\d{3}\s*\d{3}\s*\d{3}'
-    ]
-    
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            contact_info += f"\n[CONTACT INFO]\nPhone: {match}\n[END CONTACT INFO]\n"
-            break  # Only add first phone number found
+    contact_info = []
     
     # Look for contact sections
     contact_selectors = [
@@ -195,15 +417,15 @@ def _clean_text(html: str) -> str:
     ]
     
     for selector in contact_selectors:
-        for elem in soup.select(selector):
+        for elem in buckets.get(selector, ()):
             if elem.get_text(strip=True):
-                contact_info += f"\n[CONTACT INFO]\n{elem.get_text(' ', strip=True)}\n[END CONTACT INFO]\n"
+                contact_info.append(f"\n[CONTACT INFO]\n{elem.get_text(' ', strip=True)}\n[END CONTACT INFO]\n")
                 break
 
     # Heading-aware section extraction
-    heading_sections = ""
+    heading_sections = []
     try:
-        headings = soup.find_all(['h1','h2','h3','h4'])
+        headings = buckets["headings"]
         for idx, h in enumerate(headings):
             title = h.get_text(" ", strip=True)
             if not title:
@@ -220,489 +442,599 @@ def _clean_text(html: str) -> str:
                     content_parts.append(txt)
             section_text = " ".join(content_parts)
             if len(section_text) > 80:
-                heading_sections += f"\n[HEADING_SECTION title=\"{title}\"]\n{section_text}\n[END HEADING_SECTION]\n"
+                heading_sections.append(f"\n[HEADING_SECTION title=\"{title}\"]\n{section_text}\n[END HEADING_SECTION]\n")
     except Exception:
         pass
 
+    # Everything below lands after these sections in the output. Those can only grow from here,
+    # so once they fill the output cap the remaining sections would be sliced off and are skipped.
+    out_len = _parts_len(structured_data, enhanced_structured_data, map_coordinates, location_meta,
+                         address_info, property_info, contact_info, heading_sections)
+
     # Enhanced multi-tab/accordion/widget content extraction
-    widget_sections = _extract_widget_sections(soup)
+    widget_sections = ""
+    if out_len < _MAX_OUTPUT_CHARS:
+        widget_sections = _extract_widget_sections(soup)
+        out_len += len(widget_sections)
     
     # Enhanced JavaScript and hidden content extraction
-    js_content = _extract_javascript_content(soup)
-    
-    # Enhanced structured data extraction
-    enhanced_structured_data = _extract_structured_data(soup)
+    js_content = ""
+    if out_len < _MAX_OUTPUT_CHARS:
+        js_content = _extract_javascript_content(soup)
+        out_len += len(js_content)
     
     # Extract structured data from tables (high priority for pricing, features, etc.)
-    table_data = ""
-    for table in soup.find_all('table'):
-        try:
-            table_text = ""
-            rows = table.find_all(['tr'])
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if cells:
+    table_data = []
+    if out_len < _MAX_OUTPUT_CHARS:
+        for table in buckets["table"]:
+            try:
+                table_lines = []
+                # One walk for all cells; consecutive cells sharing a <tr> form a row
+                cells = table.find_all(['td', 'th'])
+                for _, row_cells in groupby(cells, key=lambda cell: id(cell.parent)):
                     row_data = []
-                    for cell in cells:
+                    for cell in row_cells:
                         cell_text = cell.get_text(strip=True)
                         if cell_text:
                             row_data.append(cell_text)
                     if row_data:
-                        table_text += " | ".join(row_data) + "\n"
+                        table_lines.append(" | ".join(row_data) + "\n")
             
-            if table_text.strip():
-                # Try to identify table type based on content
-                table_type = "general"
-                if any(word in table_text.lower() for word in ['price', 'cost', 'rent', 'fee', 'deposit']):
-                    table_type = "pricing"
-                elif any(word in table_text.lower() for word in ['feature', 'amenity', 'facility', 'included']):
-                    table_type = "features"
-                elif any(word in table_text.lower() for word in ['date', 'start', 'end', 'duration', 'term']):
-                    table_type = "tenancy"
+                table_text = "".join(table_lines)
+                if table_text.strip():
+                    # Try to identify table type based on content
+                    table_type = "general"
+                    if any(word in table_text.lower() for word in ['price', 'cost', 'rent', 'fee', 'deposit']):
+                        table_type = "pricing"
+                    elif any(word in table_text.lower() for word in ['feature', 'amenity', 'facility', 'included']):
+                        table_type = "features"
+                    elif any(word in table_text.lower() for word in ['date', 'start', 'end', 'duration', 'term']):
+                        table_type = "tenancy"
                 
-                table_data += f"\n[TABLE: {table_type.upper()}]\n{table_text.strip()}\n[END TABLE]\n"
-        except Exception:
-            continue
+                    table_data.append(f"\n[TABLE: {table_type.upper()}]\n{table_text.strip()}\n[END TABLE]\n")
+            except Exception:
+                continue
+        out_len += _parts_len(table_data)
     
     # Extract structured data from lists (features, amenities, rules, etc.)
-    list_data = ""
-    list_selectors = [
-        'ul', 'ol', 'dl'
-    ]
+    list_data = []
+    if out_len < _MAX_OUTPUT_CHARS:
+        list_selectors = [
+            'ul', 'ol', 'dl'
+        ]
     
-    for selector in list_selectors:
-        for elem in soup.select(selector):
-            try:
-                if selector in ['ul', 'ol']:
-                    items = elem.find_all('li')
-                    if items:
-                        list_text = ""
-                        for item in items:
-                            item_text = item.get_text(strip=True)
-                            if item_text:
-                                list_text += f"• {item_text}\n"
+        for selector in list_selectors:
+            for elem in buckets.get(selector, ()):
+                try:
+                    if selector in ['ul', 'ol']:
+                        items = elem.find_all('li')
+                        if items:
+                            list_lines = []
+                            for item in items:
+                                item_text = item.get_text(strip=True)
+                                if item_text:
+                                    list_lines.append(f"• {item_text}\n")
                         
-                        if list_text.strip():
-                            # Identify list type
-                            list_type = "general"
-                            parent_text = elem.get_text(strip=True).lower()
-                            if any(word in parent_text for word in ['feature', 'amenity', 'facility', 'included']):
-                                list_type = "features"
-                            elif any(word in parent_text for word in ['rule', 'policy', 'term', 'condition']):
-                                list_type = "rules"
-                            elif any(word in parent_text for word in ['contact', 'phone', 'email', 'address']):
-                                list_type = "contact"
+                            list_text = "".join(list_lines)
+                            if list_text.strip():
+                                # Identify list type
+                                list_type = "general"
+                                parent_text = elem.get_text(strip=True).lower()
+                                if any(word in parent_text for word in ['feature', 'amenity', 'facility', 'included']):
+                                    list_type = "features"
+                                elif any(word in parent_text for word in ['rule', 'policy', 'term', 'condition']):
+                                    list_type = "rules"
+                                elif any(word in parent_text for word in ['contact', 'phone', 'email', 'address']):
+                                    list_type = "contact"
                             
-                            list_data += f"\n[LIST: {list_type.upper()}]\n{list_text.strip()}\n[END LIST]\n"
+                                list_data.append(f"\n[LIST: {list_type.upper()}]\n{list_text.strip()}\n[END LIST]\n")
                 
-                elif selector == 'dl':
-                    # Definition lists often contain key-value pairs
-                    terms = elem.find_all('dt')
-                    definitions = elem.find_all('dd')
+                    elif selector == 'dl':
+                        # Definition lists often contain key-value pairs
+                        terms = elem.find_all('dt')
+                        definitions = elem.find_all('dd')
                     
-                    if terms and definitions:
-                        dl_text = ""
-                        for i, term in enumerate(terms):
-                            if i < len(definitions):
-                                term_text = term.get_text(strip=True)
-                                def_text = definitions[i].get_text(strip=True)
-                                if term_text and def_text:
-                                    dl_text += f"{term_text}: {def_text}\n"
+                        if terms and definitions:
+                            dl_lines = []
+                            for i, term in enumerate(terms):
+                                if i < len(definitions):
+                                    term_text = term.get_text(strip=True)
+                                    def_text = definitions[i].get_text(strip=True)
+                                    if term_text and def_text:
+                                        dl_lines.append(f"{term_text}: {def_text}\n")
                         
-                        if dl_text.strip():
-                            list_data += f"\n[DEFINITION LIST]\n{dl_text.strip()}\n[END DEFINITION LIST]\n"
-            except Exception:
-                continue
+                            dl_text = "".join(dl_lines)
+                            if dl_text.strip():
+                                list_data.append(f"\n[DEFINITION LIST]\n{dl_text.strip()}\n[END DEFINITION LIST]\n")
+                except Exception:
+                    continue
+        out_len += _parts_len(list_data)
     
     # Extract data attributes and custom properties (often contain structured data)
-    data_attributes = ""
-    data_selectors = [
-        '[data-*]', '[itemprop]', '[itemtype]', '[itemscope]'
-    ]
-    
-    for selector in data_selectors:
-        for elem in soup.select(selector):
+    data_attributes = []
+    if out_len < _MAX_OUTPUT_CHARS:
+        # Elements carrying data-* or microdata attributes, gathered by the single-pass walk
+        for elem in buckets["data-attributes"]:
             try:
                 # Extract data attributes
                 data_attrs = {}
                 for attr, value in elem.attrs.items():
                     if attr.startswith('data-') and value:
                         data_attrs[attr] = value
-                
+            
                 # Extract microdata
                 if elem.get('itemprop'):
                     data_attrs['itemprop'] = elem.get('itemprop')
                 if elem.get('itemtype'):
                     data_attrs['itemtype'] = elem.get('itemtype')
-                
+            
                 if data_attrs:
-                    attr_text = ""
+                    attr_lines = []
                     for attr, value in data_attrs.items():
-                        attr_text += f"{attr}: {value}\n"
-                    
+                        attr_lines.append(f"{attr}: {value}\n")
+                
+                    attr_text = "".join(attr_lines)
                     if attr_text.strip():
-                        data_attributes += f"\n[DATA ATTRIBUTES]\n{attr_text.strip()}\n[END DATA ATTRIBUTES]\n"
+                        data_attributes.append(f"\n[DATA ATTRIBUTES]\n{attr_text.strip()}\n[END DATA ATTRIBUTES]\n")
             except Exception:
                 continue
+        out_len += _parts_len(data_attributes)
     
     # Extract footer content (often contains contact info, policies, etc.)
-    footer_content = ""
-    footer_selectors = [
-        'footer', '.footer', '#footer', '[role="contentinfo"]'
-    ]
+    footer_content = []
+    if out_len < _MAX_OUTPUT_CHARS:
+        footer_selectors = [
+            'footer', '.footer', '#footer', '[role="contentinfo"]'
+        ]
     
-    for selector in footer_selectors:
-        for elem in soup.select(selector):
-            try:
-                footer_text = elem.get_text(' ', strip=True)
-                if footer_text and len(footer_text) > 50:  # Only substantial footer content
-                    footer_content += f"\n[FOOTER CONTENT]\n{footer_text}\n[END FOOTER CONTENT]\n"
-            except Exception:
-                continue
+        # Nested or multiply-matched footers are covered by the outermost one already read
+        footer_claimed: Set[int] = set()
+        for selector in footer_selectors:
+            for elem in buckets.get(selector, ()):
+                if _has_claimed_ancestor(elem, footer_claimed):
+                    continue
+                footer_claimed.add(id(elem))
+                try:
+                    footer_text = elem.get_text(' ', strip=True)
+                    if footer_text and len(footer_text) > 50:  # Only substantial footer content
+                        footer_content.append(f"\n[FOOTER CONTENT]\n{footer_text}\n[END FOOTER CONTENT]\n")
+                except Exception:
+                    continue
+        out_len += _parts_len(footer_content)
     
     # Prioritize important content sections
-    important_content = ""
-    priority_sections = [
-        "main", "article", "section", "div.content", "div.main", "div.description", 
-        "div.property", "div.room", "div.pricing", "div.tenancy", 
-        "div.details", "div.features", "div.amenities"
-    ]
+    important_content = []
+    if out_len < _MAX_OUTPUT_CHARS:
+        priority_sections = [
+            "main", "article", "section", "div.content", "div.main", "div.description", 
+            "div.property", "div.room", "div.pricing", "div.tenancy", 
+            "div.details", "div.features", "div.amenities"
+        ]
     
-    for selector in priority_sections:
-        try:
-            elements = soup.select(selector)
-            for elem in elements:
-                if len(elem.get_text(strip=True)) > 100:  # Only substantial sections
-                    important_content += "\n\n[SECTION: " + selector + "]\n"
-                    important_content += elem.get_text(" ", strip=True) + "\n[END SECTION]\n\n"
-        except Exception:
-            pass
+        # Sections nested in one already read (e.g. <section> inside <main>) add nothing new
+        section_claimed: Set[int] = set()
+        for selector in priority_sections:
+            try:
+                elements = buckets.get(selector, ())
+                for elem in elements:
+                    if _has_claimed_ancestor(elem, section_claimed):
+                        continue
+                    section_claimed.add(id(elem))
+                    if len(elem.get_text(strip=True)) > 100:  # Only substantial sections
+                        important_content.append("\n\n[SECTION: " + selector + "]\n")
+                        important_content.append(elem.get_text(" ", strip=True) + "\n[END SECTION]\n\n")
+            except Exception:
+                pass
+        out_len += _parts_len(important_content)
     
     # Remove non-content elements
-    for tag in soup(["script", "style", "noscript", "svg", "canvas", "video", "iframe", "header", "nav"]):
+    for tag in buckets["strip"]:
         tag.decompose()
     
-    # Get all text
-    text = soup.get_text(" ", strip=True)
+    # Get all text, with whitespace runs collapsed to single spaces
+    text = " ".join(soup.get_text(" ").split())
     
-    # Normalize whitespace
-    text = re.sub(r"\s+", " ", text)
+    # Look for property type in text patterns (needs the page text, so runs after it is built)
+    if _STUDENT_ACCOM_RE.search(text):
+        property_info.append(f"\n[PROPERTY TYPE]\nStudent Accommodation\n[END PROPERTY TYPE]\n")
     
-    # Combine all extracted data with priority order
-    combined = (
-        structured_data +           # Highest priority: structured data
-        enhanced_structured_data +  # High priority: enhanced structured data
-        map_coordinates +           # High priority: map coordinates
-        location_meta +             # High priority: meta tags
-        address_info +              # Medium priority: address elements
-        property_info +             # Medium priority: property type
-        contact_info +              # Medium priority: contact info
-        heading_sections +          # Medium priority: heading sections
-        widget_sections +           # Medium priority: widgets/accordions/tabs
-        js_content +                # High priority: JavaScript/hidden content
-        table_data +                # High priority: table data
-        list_data +                 # High priority: list data
-        data_attributes +           # High priority: data attributes
-        footer_content +            # High priority: footer content
-        important_content +         # Medium priority: important sections
-        text                        # Lower priority: general page text
-    )
+    # Phone numbers found in the page text go ahead of the contact sections
+    phone_info = []
+    for pattern in _PHONE_PATTERNS:
+        matches = pattern.findall(text)
+        for match in matches:
+            phone_info.append(f"\n[CONTACT INFO]\nPhone: {match}\n[END CONTACT INFO]\n")
+            break  # Only add first phone number found
+    contact_info = phone_info + contact_info
     
-    return combined[:120000]  # Increased cap to 120k chars per page
+    # Combine all extracted data with priority order
+    combined = "".join([
+        *structured_data,           # Highest priority: structured data
+        enhanced_structured_data,   # High priority: enhanced structured data
+        *map_coordinates,           # High priority: map coordinates
+        *location_meta,             # High priority: meta tags
+        *address_info,              # Medium priority: address elements
+        *property_info,             # Medium priority: property type
+        *contact_info,              # Medium priority: contact info
+        *heading_sections,          # Medium priority: heading sections
+        widget_sections,            # Medium priority: widgets/accordions/tabs
+        js_content,                 # High priority: JavaScript/hidden content
+        *table_data,                # High priority: table data
+        *list_data,                 # High priority: list data
+        *data_attributes,           # High priority: data attributes
+        *footer_content,            # High priority: footer content
+        *important_content,         # Medium priority: important sections
+        text,                       # Lower priority: general page text
+    ])
+    
+    return combined[:_MAX_OUTPUT_CHARS]
+
+
+# Widget containers and the parts read out of them. Each group is joined and compiled once at
+# import so extraction only walks the tree, without re-parsing selector strings.
+
+# Comprehensive tab detection patterns
+_TAB_SELECTORS = (
+    # Standard tab patterns
+    '[role="tablist"]', '[role="tab"]', '[role="tabpanel"]',
+    '.tabs', '.tab', '.tab-content', '.tab-panel', '.tab-container',
+    '.nav-tabs', '.nav-item', '.nav-link', '.tab-pane',
+
+    # Bootstrap and common frameworks
+    '.nav', '.nav-pills', '.nav-tabs', '.tab-content',
+    '.tabbable', '.tabbable-pane', '.tabbable-content',
+
+    # Custom tab implementations
+    '[data-tab]', '[data-target]', '[data-toggle="tab"]',
+    '.js-tab', '.js-tabs', '.tab-wrapper', '.tab-group',
+
+    # Property-specific tab patterns
+    '.room-tabs', '.pricing-tabs', '.tenancy-tabs', '.amenity-tabs',
+    '.property-tabs', '.accommodation-tabs', '.booking-tabs',
+
+    # Generic interactive elements that might be tabs
+    '.interactive', '.content-tabs', '.section-tabs', '.info-tabs',
+)
+_TAB_SELECTOR = sv.compile(", ".join(dict.fromkeys(_TAB_SELECTORS)))
+
+_TAB_HEADER_SELECTORS = (
+    '[role="tab"]', '.tab', '.nav-link', '.nav-item',
+    '[data-toggle="tab"]', '[data-target]', '[data-tab]',
+    '.tab-header', '.tab-title', '.tab-label', '.tab-name',
+)
+_TAB_HEADER_SELECTOR = sv.compile(", ".join(dict.fromkeys(_TAB_HEADER_SELECTORS)))
+
+_TAB_PANEL_SELECTORS = (
+    '[role="tabpanel"]', '.tab-content', '.tab-panel', '.tab-pane',
+    '.tab-body', '.tab-content-area', '.tab-inner',
+)
+_TAB_PANEL_SELECTOR = sv.compile(", ".join(dict.fromkeys(_TAB_PANEL_SELECTORS)))
+
+# Comprehensive accordion detection patterns
+_ACCORDION_SELECTORS = (
+    # Standard accordion patterns
+    '.accordion', '.accordion-item', '.accordion-header', '.accordion-content',
+    '.accordion-title', '.accordion-body', '.accordion-collapse',
+
+    # Bootstrap accordion
+    '.accordion', '.accordion-item', '.accordion-header', '.accordion-button',
+    '.accordion-collapse', '.accordion-body',
+
+    # Custom accordion implementations
+    '.Accordion', '.Accordion_item', '.Accordion__header', '.Accordion__content',
+    '.Accordion__heading', '.Accordion__content__inner',
+
+    # FAQ accordion patterns
+    '.faq-accordion', '.faq-accordion-item', '.faq-item', '.FAQ_item',
+    '.faq-question', '.faq-answer', '.FAQ_question', '.FAQ_answer',
+
+    # Property-specific accordion patterns
+    '.room-accordion', '.pricing-accordion', '.amenity-accordion',
+    '.tenancy-accordion', '.policy-accordion', '.feature-accordion',
+
+    # Generic expandable patterns
+    '.expandable', '.collapsible', '.toggle', '.Toggle',
+    '.expand-trigger', '.collapse-trigger', '.toggle-trigger',
+)
+_ACCORDION_SELECTOR = sv.compile(", ".join(dict.fromkeys(_ACCORDION_SELECTORS)))
+
+_ACCORDION_HEADER_SELECTORS = (
+    '.accordion-header', '.accordion-title', '.accordion-button',
+    '.Accordion__header', '.Accordion__heading', '.accordion-heading',
+    '.faq-question', '.FAQ_question', '.expand-trigger', '.toggle-trigger',
+    'h3', 'h4', 'h5', 'h6', '.title', '.heading', '.label',
+)
+_ACCORDION_HEADER_SELECTOR = sv.compile(", ".join(dict.fromkeys(_ACCORDION_HEADER_SELECTORS)))
+
+_ACCORDION_CONTENT_SELECTORS = (
+    '.accordion-content', '.accordion-body', '.accordion-collapse',
+    '.Accordion__content', '.Accordion__content__inner',
+    '.faq-answer', '.FAQ_answer', '.expand-content', '.toggle-content',
+    '.content', '.body', '.panel', '.section',
+)
+_ACCORDION_CONTENT_SELECTOR = sv.compile(", ".join(dict.fromkeys(_ACCORDION_CONTENT_SELECTORS)))
+
+# Comprehensive expandable section detection
+_EXPANDABLE_SELECTORS = (
+    # Standard expandable patterns
+    '.expandable', '.collapsible', '.toggle', '.Toggle',
+    '.expand-trigger', '.collapse-trigger', '.toggle-trigger',
+
+    # Bootstrap collapse
+    '.collapse', '.Collapse', '.collapsing',
+
+    # Custom expandable implementations
+    '.expand-section', '.collapsible-section', '.toggle-section',
+    '.expandable-content', '.collapsible-content', '.toggle-content',
+
+    # Property-specific expandable patterns
+    '.room-details', '.pricing-details', '.amenity-details',
+    '.tenancy-details', '.policy-details', '.feature-details',
+
+    # Generic interactive elements
+    '.interactive', '.clickable', '.expandable', '.collapsible',
+    '[data-toggle="collapse"]', '[data-target]', '[data-expand]',
+)
+_EXPANDABLE_SELECTOR = sv.compile(", ".join(dict.fromkeys(_EXPANDABLE_SELECTORS)))
+
+# Trigger/button labels in priority order; the first selector yielding text wins, so these are
+# compiled one by one and matched lazily rather than joined
+_EXPANDABLE_TRIGGER_MATCHERS = tuple(sv.compile(sel) for sel in (
+    '.expand-trigger', '.collapse-trigger', '.toggle-trigger',
+    '.expand-button', '.collapse-button', '.toggle-button',
+    'button', '.btn', '.button', '[role="button"]',
+))
+
+# Comprehensive modal detection patterns
+_MODAL_SELECTORS = (
+    # Standard modal patterns
+    '.modal', '.Modal', '.modal-dialog', '.modal-content',
+    '.modal-header', '.modal-body', '.modal-footer',
+
+    # Bootstrap modal
+    '.modal', '.modal-dialog', '.modal-content',
+
+    # Custom modal implementations
+    '.popup', '.Popup', '.dialog', '.Dialog',
+    '.overlay', '.Overlay', '.lightbox', '.Lightbox',
+
+    # Property-specific modal patterns
+    '.room-modal', '.pricing-modal', '.amenity-modal',
+    '.tenancy-modal', '.policy-modal', '.booking-modal',
+
+    # Generic popup patterns
+    '.popup-content', '.popup-body', '.popup-text',
+    '[data-modal]', '[data-popup]', '[data-dialog]',
+)
+_MODAL_SELECTOR = sv.compile(", ".join(dict.fromkeys(_MODAL_SELECTORS)))
+
+# Modal titles in priority order, matched the same way as the expandable triggers
+_MODAL_TITLE_MATCHERS = tuple(sv.compile(sel) for sel in (
+    '.modal-title', '.modal-header', '.popup-title',
+    '.popup-header', '.dialog-title', '.dialog-header',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', '.title', '.heading',
+))
+
+# Comprehensive carousel detection patterns
+_CAROUSEL_SELECTORS = (
+    # Standard carousel patterns
+    '.carousel', '.Carousel', '.carousel-inner', '.carousel-item',
+    '.carousel-caption', '.carousel-control', '.carousel-indicators',
+
+    # Bootstrap carousel
+    '.carousel', '.carousel-inner', '.carousel-item',
+
+    # Custom carousel implementations
+    '.slider', '.Slider', '.slideshow', '.Slideshow',
+    '.slide', '.Slide', '.slide-content', '.slide-text',
+
+    # Property-specific carousel patterns
+    '.room-carousel', '.pricing-carousel', '.amenity-carousel',
+    '.tenancy-carousel', '.photo-carousel', '.gallery-carousel',
+
+    # Generic slider patterns
+    '.slider-content', '.slide-content', '.carousel-content',
+    '[data-carousel]', '[data-slider]', '[data-slideshow]',
+)
+_CAROUSEL_SELECTOR = sv.compile(", ".join(dict.fromkeys(_CAROUSEL_SELECTORS)))
+
+_CAROUSEL_ITEM_SELECTORS = (
+    '.carousel-item', '.slide', '.Slide', '.slide-content',
+    '.carousel-slide', '.slider-item', '.slideshow-item',
+)
+_CAROUSEL_ITEM_SELECTOR = sv.compile(", ".join(dict.fromkeys(_CAROUSEL_ITEM_SELECTORS)))
+
+_CAROUSEL_CAPTION_SELECTORS = (
+    '.carousel-caption', '.slide-caption', '.slide-description',
+    '.carousel-text', '.slide-text', '.carousel-description',
+)
+_CAROUSEL_CAPTION_SELECTOR = sv.compile(", ".join(dict.fromkeys(_CAROUSEL_CAPTION_SELECTORS)))
+
+# Any widget container at all; pages without one skip the five extractors entirely
+_ANY_WIDGET_SELECTOR = sv.compile(", ".join(dict.fromkeys(
+    _TAB_SELECTORS + _ACCORDION_SELECTORS + _EXPANDABLE_SELECTORS + _MODAL_SELECTORS + _CAROUSEL_SELECTORS
+)))
 
 
 def _extract_widget_sections(soup: BeautifulSoup) -> str:
     """Extract content from interactive widgets, tabs, accordions, and expandable sections"""
-    widget_sections = ""
+    if _ANY_WIDGET_SELECTOR.select_one(soup) is None:
+        return ""
+    widget_sections = []
     
     # Enhanced tab detection and extraction
     tab_content = _extract_tab_content(soup)
     if tab_content:
-        widget_sections += f"\n[TAB CONTENT]\n{tab_content}\n[END TAB CONTENT]\n"
+        widget_sections.append(f"\n[TAB CONTENT]\n{tab_content}\n[END TAB CONTENT]\n")
     
     # Enhanced accordion detection and extraction
     accordion_content = _extract_accordion_content(soup)
     if accordion_content:
-        widget_sections += f"\n[ACCORDION CONTENT]\n{accordion_content}\n[END ACCORDION CONTENT]\n"
+        widget_sections.append(f"\n[ACCORDION CONTENT]\n{accordion_content}\n[END ACCORDION CONTENT]\n")
     
     # Enhanced expandable/collapsible sections
     expandable_content = _extract_expandable_content(soup)
     if expandable_content:
-        widget_sections += f"\n[EXPANDABLE CONTENT]\n{expandable_content}\n[END EXPANDABLE CONTENT]\n"
+        widget_sections.append(f"\n[EXPANDABLE CONTENT]\n{expandable_content}\n[END EXPANDABLE CONTENT]\n")
     
     # Enhanced modal/popup content detection
     modal_content = _extract_modal_content(soup)
     if modal_content:
-        widget_sections += f"\n[MODAL CONTENT]\n{modal_content}\n[END MODAL CONTENT]\n"
+        widget_sections.append(f"\n[MODAL CONTENT]\n{modal_content}\n[END MODAL CONTENT]\n")
     
     # Enhanced carousel/slider content
     carousel_content = _extract_carousel_content(soup)
     if carousel_content:
-        widget_sections += f"\n[CAROUSEL CONTENT]\n{carousel_content}\n[END CAROUSEL CONTENT]\n"
+        widget_sections.append(f"\n[CAROUSEL CONTENT]\n{carousel_content}\n[END CAROUSEL CONTENT]\n")
     
-    return widget_sections
+    return "".join(widget_sections)
 
 
 def _extract_tab_content(soup: BeautifulSoup) -> str:
     """Extract content from all tab interfaces with comprehensive pattern matching"""
-    tab_content = ""
-    
-    # Comprehensive tab detection patterns
-    tab_selectors = [
-        # Standard tab patterns
-        '[role="tablist"]', '[role="tab"]', '[role="tabpanel"]',
-        '.tabs', '.tab', '.tab-content', '.tab-panel', '.tab-container',
-        '.nav-tabs', '.nav-item', '.nav-link', '.tab-pane',
-        
-        # Bootstrap and common frameworks
-        '.nav', '.nav-pills', '.nav-tabs', '.tab-content',
-        '.tabbable', '.tabbable-pane', '.tabbable-content',
-        
-        # Custom tab implementations
-        '[data-tab]', '[data-target]', '[data-toggle="tab"]',
-        '.js-tab', '.js-tabs', '.tab-wrapper', '.tab-group',
-        
-        # Property-specific tab patterns
-        '.room-tabs', '.pricing-tabs', '.tenancy-tabs', '.amenity-tabs',
-        '.property-tabs', '.accommodation-tabs', '.booking-tabs',
-        
-        # Generic interactive elements that might be tabs
-        '.interactive', '.content-tabs', '.section-tabs', '.info-tabs'
-    ]
+    tab_content = []
     
     # Find all potential tab containers
-    tab_containers = []
-    for selector in tab_selectors:
-        tab_containers.extend(soup.select(selector))
+    tab_containers = _TAB_SELECTOR.select(soup)
+    if not tab_containers:
+        return ""
     
     # Remove duplicates while preserving order
     seen = set()
     unique_containers = []
     for container in tab_containers:
-        container_id = container.get('id', '') or container.get('class', [])
-        if str(container_id) not in seen:
-            seen.add(str(container_id))
+        if id(container) not in seen:
+            seen.add(id(container))
             unique_containers.append(container)
     
     for container in unique_containers:
         try:
             # Extract tab headers/labels
             tab_headers = []
-            header_selectors = [
-                '[role="tab"]', '.tab', '.nav-link', '.nav-item',
-                '[data-toggle="tab"]', '[data-target]', '[data-tab]',
-                '.tab-header', '.tab-title', '.tab-label', '.tab-name'
-            ]
-            
-            for header_sel in header_selectors:
-                headers = container.select(header_sel)
-                for header in headers:
-                    header_text = header.get_text(strip=True)
-                    if header_text and header_text not in tab_headers:
-                        tab_headers.append(header_text)
+            for header in _TAB_HEADER_SELECTOR.select(container):
+                header_text = header.get_text(strip=True)
+                if header_text and header_text not in tab_headers:
+                    tab_headers.append(header_text)
             
             # Extract tab content/panels
             tab_panels = []
-            panel_selectors = [
-                '[role="tabpanel"]', '.tab-content', '.tab-panel', '.tab-pane',
-                '.tab-body', '.tab-content-area', '.tab-inner'
-            ]
-            
-            for panel_sel in panel_selectors:
-                panels = container.select(panel_sel)
-                for panel in panels:
-                    panel_text = panel.get_text(strip=True)
-                    if panel_text and panel_text not in tab_panels:
-                        tab_panels.append(panel_text)
+            for panel in _TAB_PANEL_SELECTOR.select(container):
+                panel_text = panel.get_text(strip=True)
+                if panel_text and panel_text not in tab_panels:
+                    tab_panels.append(panel_text)
             
             # If we found both headers and content, structure them
             if tab_headers and tab_panels:
-                tab_content += f"\n[TAB GROUP: {len(tab_headers)} tabs]\n"
+                tab_content.append(f"\n[TAB GROUP: {len(tab_headers)} tabs]\n")
                 for i, (header, panel) in enumerate(zip(tab_headers, tab_panels)):
-                    tab_content += f"TAB {i+1}: {header}\n{panel}\n---\n"
-                tab_content += "[END TAB GROUP]\n"
+                    tab_content.append(f"TAB {i+1}: {header}\n{panel}\n---\n")
+                tab_content.append("[END TAB GROUP]\n")
             
             # If we only found headers, try to extract from parent/sibling elements
             elif tab_headers:
-                tab_content += f"\n[TAB HEADERS: {len(tab_headers)} tabs]\n"
+                tab_content.append(f"\n[TAB HEADERS: {len(tab_headers)} tabs]\n")
                 for i, header in enumerate(tab_headers):
-                    tab_content += f"TAB {i+1}: {header}\n"
+                    tab_content.append(f"TAB {i+1}: {header}\n")
                 
                 # Try to find content in parent or sibling elements
                 parent = container.parent
                 if parent:
-                    parent_text = parent.get_text(strip=True)
+                    parent_text = _text_prefix(parent, 500)
                     if parent_text:
-                        tab_content += f"PARENT CONTENT: {parent_text[:500]}...\n"
+                        tab_content.append(f"PARENT CONTENT: {parent_text}...\n")
                 
-                tab_content += "[END TAB HEADERS]\n"
+                tab_content.append("[END TAB HEADERS]\n")
                 
         except Exception as e:
             continue
     
-    return tab_content
+    return "".join(tab_content)
 
 
 def _extract_accordion_content(soup: BeautifulSoup) -> str:
     """Extract content from accordion interfaces with comprehensive pattern matching"""
-    accordion_content = ""
-    
-    # Comprehensive accordion detection patterns
-    accordion_selectors = [
-        # Standard accordion patterns
-        '.accordion', '.accordion-item', '.accordion-header', '.accordion-content',
-        '.accordion-title', '.accordion-body', '.accordion-collapse',
-        
-        # Bootstrap accordion
-        '.accordion', '.accordion-item', '.accordion-header', '.accordion-button',
-        '.accordion-collapse', '.accordion-body',
-        
-        # Custom accordion implementations
-        '.Accordion', '.Accordion_item', '.Accordion__header', '.Accordion__content',
-        '.Accordion__heading', '.Accordion__content__inner',
-        
-        # FAQ accordion patterns
-        '.faq-accordion', '.faq-accordion-item', '.faq-item', '.FAQ_item',
-        '.faq-question', '.faq-answer', '.FAQ_question', '.FAQ_answer',
-        
-        # Property-specific accordion patterns
-        '.room-accordion', '.pricing-accordion', '.amenity-accordion',
-        '.tenancy-accordion', '.policy-accordion', '.feature-accordion',
-        
-        # Generic expandable patterns
-        '.expandable', '.collapsible', '.toggle', '.Toggle',
-        '.expand-trigger', '.collapse-trigger', '.toggle-trigger'
-    ]
+    accordion_content = []
     
     # Find all potential accordion containers
-    accordion_containers = []
-    for selector in accordion_selectors:
-        accordion_containers.extend(soup.select(selector))
+    accordion_containers = _ACCORDION_SELECTOR.select(soup)
+    if not accordion_containers:
+        return ""
     
     # Remove duplicates while preserving order
     seen = set()
     unique_containers = []
     for container in accordion_containers:
-        container_id = container.get('id', '') or container.get('class', [])
-        if str(container_id) not in seen:
-            seen.add(str(container_id))
+        if id(container) not in seen:
+            seen.add(id(container))
             unique_containers.append(container)
     
     for container in unique_containers:
         try:
             # Extract accordion headers/titles
             headers = []
-            header_selectors = [
-                '.accordion-header', '.accordion-title', '.accordion-button',
-                '.Accordion__header', '.Accordion__heading', '.accordion-heading',
-                '.faq-question', '.FAQ_question', '.expand-trigger', '.toggle-trigger',
-                'h3', 'h4', 'h5', 'h6', '.title', '.heading', '.label'
-            ]
-            
-            for header_sel in header_selectors:
-                header_elements = container.select(header_sel)
-                for header in header_elements:
-                    header_text = header.get_text(strip=True)
-                    if header_text and header_text not in headers:
-                        headers.append(header_text)
+            for header in _ACCORDION_HEADER_SELECTOR.select(container):
+                header_text = header.get_text(strip=True)
+                if header_text and header_text not in headers:
+                    headers.append(header_text)
             
             # Extract accordion content/body
             contents = []
-            content_selectors = [
-                '.accordion-content', '.accordion-body', '.accordion-collapse',
-                '.Accordion__content', '.Accordion__content__inner',
-                '.faq-answer', '.FAQ_answer', '.expand-content', '.toggle-content',
-                '.content', '.body', '.panel', '.section'
-            ]
-            
-            for content_sel in content_selectors:
-                content_elements = container.select(content_sel)
-                for content in content_elements:
-                    content_text = content.get_text(strip=True)
-                    if content_text and content_text not in contents:
-                        contents.append(content_text)
+            for content in _ACCORDION_CONTENT_SELECTOR.select(container):
+                content_text = content.get_text(strip=True)
+                if content_text and content_text not in contents:
+                    contents.append(content_text)
             
             # If we found both headers and content, structure them
             if headers and contents:
-                accordion_content += f"\n[ACCORDION GROUP: {len(headers)} items]\n"
+                accordion_content.append(f"\n[ACCORDION GROUP: {len(headers)} items]\n")
                 for i, (header, content) in enumerate(zip(headers, contents)):
-                    accordion_content += f"ITEM {i+1}: {header}\n{content}\n---\n"
-                accordion_content += "[END ACCORDION GROUP]\n"
+                    accordion_content.append(f"ITEM {i+1}: {header}\n{content}\n---\n")
+                accordion_content.append("[END ACCORDION GROUP]\n")
             
             # If we only found headers, try to extract from parent/sibling elements
             elif headers:
-                accordion_content += f"\n[ACCORDION HEADERS: {len(headers)} items]\n"
+                accordion_content.append(f"\n[ACCORDION HEADERS: {len(headers)} items]\n")
                 for i, header in enumerate(headers):
-                    accordion_content += f"ITEM {i+1}: {header}\n"
+                    accordion_content.append(f"ITEM {i+1}: {header}\n")
                 
                 # Try to find content in parent or sibling elements
                 parent = container.parent
                 if parent:
-                    parent_text = parent.get_text(strip=True)
+                    parent_text = _text_prefix(parent, 500)
                     if parent_text:
-                        accordion_content += f"PARENT CONTENT: {parent_text[:500]}...\n"
+                        accordion_content.append(f"PARENT CONTENT: {parent_text}...\n")
                 
-                accordion_content += "[END ACCORDION HEADERS]\n"
+                accordion_content.append("[END ACCORDION HEADERS]\n")
                 
         except Exception as e:
             continue
     
-    return accordion_content
+    return "".join(accordion_content)
 
 
 def _extract_expandable_content(soup: BeautifulSoup) -> str:
     """Extract content from expandable/collapsible sections"""
-    expandable_content = ""
-    
-    # Comprehensive expandable section detection
-    expandable_selectors = [
-        # Standard expandable patterns
-        '.expandable', '.collapsible', '.toggle', '.Toggle',
-        '.expand-trigger', '.collapse-trigger', '.toggle-trigger',
-        
-        # Bootstrap collapse
-        '.collapse', '.Collapse', '.collapsing',
-        
-        # Custom expandable implementations
-        '.expand-section', '.collapsible-section', '.toggle-section',
-        '.expandable-content', '.collapsible-content', '.toggle-content',
-        
-        # Property-specific expandable patterns
-        '.room-details', '.pricing-details', '.amenity-details',
-        '.tenancy-details', '.policy-details', '.feature-details',
-        
-        # Generic interactive elements
-        '.interactive', '.clickable', '.expandable', '.collapsible',
-        '[data-toggle="collapse"]', '[data-target]', '[data-expand]'
-    ]
+    expandable_content = []
     
     # Find all potential expandable containers
-    expandable_containers = []
-    for selector in expandable_selectors:
-        expandable_containers.extend(soup.select(selector))
+    expandable_containers = _EXPANDABLE_SELECTOR.select(soup)
+    if not expandable_containers:
+        return ""
     
     # Remove duplicates while preserving order
     seen = set()
     unique_containers = []
     for container in expandable_containers:
-        container_id = container.get('id', '') or container.get('class', [])
-        if str(container_id) not in seen:
-            seen.add(str(container_id))
+        if id(container) not in seen:
+            seen.add(id(container))
             unique_containers.append(container)
     
     for container in unique_containers:
         try:
             # Extract trigger/button text
             trigger_text = ""
-            trigger_selectors = [
-                '.expand-trigger', '.collapse-trigger', '.toggle-trigger',
-                '.expand-button', '.collapse-button', '.toggle-button',
-                'button', '.btn', '.button', '[role="button"]'
-            ]
-            
-            for trigger_sel in trigger_selectors:
-                triggers = container.select(trigger_sel)
-                for trigger in triggers:
+            for trigger_matcher in _EXPANDABLE_TRIGGER_MATCHERS:
+                for trigger in trigger_matcher.iselect(container):
                     trigger_text = trigger.get_text(strip=True)
                     if trigger_text:
                         break
@@ -713,69 +1045,39 @@ def _extract_expandable_content(soup: BeautifulSoup) -> str:
             content_text = container.get_text(strip=True)
             
             if trigger_text and content_text:
-                expandable_content += f"\n[EXPANDABLE SECTION: {trigger_text}]\n{content_text}\n[END EXPANDABLE SECTION]\n"
+                expandable_content.append(f"\n[EXPANDABLE SECTION: {trigger_text}]\n{content_text}\n[END EXPANDABLE SECTION]\n")
             elif content_text:
-                expandable_content += f"\n[EXPANDABLE CONTENT]\n{content_text}\n[END EXPANDABLE CONTENT]\n"
+                expandable_content.append(f"\n[EXPANDABLE CONTENT]\n{content_text}\n[END EXPANDABLE CONTENT]\n")
                 
         except Exception as e:
             continue
     
-    return expandable_content
+    return "".join(expandable_content)
 
 
 def _extract_modal_content(soup: BeautifulSoup) -> str:
     """Extract content from modal/popup dialogs"""
-    modal_content = ""
-    
-    # Comprehensive modal detection patterns
-    modal_selectors = [
-        # Standard modal patterns
-        '.modal', '.Modal', '.modal-dialog', '.modal-content',
-        '.modal-header', '.modal-body', '.modal-footer',
-        
-        # Bootstrap modal
-        '.modal', '.modal-dialog', '.modal-content',
-        
-        # Custom modal implementations
-        '.popup', '.Popup', '.dialog', '.Dialog',
-        '.overlay', '.Overlay', '.lightbox', '.Lightbox',
-        
-        # Property-specific modal patterns
-        '.room-modal', '.pricing-modal', '.amenity-modal',
-        '.tenancy-modal', '.policy-modal', '.booking-modal',
-        
-        # Generic popup patterns
-        '.popup-content', '.popup-body', '.popup-text',
-        '[data-modal]', '[data-popup]', '[data-dialog]'
-    ]
+    modal_content = []
     
     # Find all potential modal containers
-    modal_containers = []
-    for selector in modal_selectors:
-        modal_containers.extend(soup.select(selector))
+    modal_containers = _MODAL_SELECTOR.select(soup)
+    if not modal_containers:
+        return ""
     
     # Remove duplicates while preserving order
     seen = set()
     unique_containers = []
     for container in modal_containers:
-        container_id = container.get('id', '') or container.get('class', [])
-        if str(container_id) not in seen:
-            seen.add(str(container_id))
+        if id(container) not in seen:
+            seen.add(id(container))
             unique_containers.append(container)
     
     for container in unique_containers:
         try:
             # Extract modal title/header
             title_text = ""
-            title_selectors = [
-                '.modal-title', '.modal-header', '.popup-title',
-                '.popup-header', '.dialog-title', '.dialog-header',
-                'h1', 'h2', 'h3', 'h4', 'h5', 'h6', '.title', '.heading'
-            ]
-            
-            for title_sel in title_selectors:
-                titles = container.select(title_sel)
-                for title in titles:
+            for title_matcher in _MODAL_TITLE_MATCHERS:
+                for title in title_matcher.iselect(container):
                     title_text = title.get_text(strip=True)
                     if title_text:
                         break
@@ -786,270 +1088,303 @@ def _extract_modal_content(soup: BeautifulSoup) -> str:
             content_text = container.get_text(strip=True)
             
             if title_text and content_text:
-                modal_content += f"\n[MODAL: {title_text}]\n{content_text}\n[END MODAL]\n"
+                modal_content.append(f"\n[MODAL: {title_text}]\n{content_text}\n[END MODAL]\n")
             elif content_text:
-                modal_content += f"\n[MODAL CONTENT]\n{content_text}\n[END MODAL CONTENT]\n"
+                modal_content.append(f"\n[MODAL CONTENT]\n{content_text}\n[END MODAL CONTENT]\n")
                 
         except Exception as e:
             continue
     
-    return modal_content
+    return "".join(modal_content)
 
 
 def _extract_carousel_content(soup: BeautifulSoup) -> str:
     """Extract content from carousel/slider interfaces"""
-    carousel_content = ""
-    
-    # Comprehensive carousel detection patterns
-    carousel_selectors = [
-        # Standard carousel patterns
-        '.carousel', '.Carousel', '.carousel-inner', '.carousel-item',
-        '.carousel-caption', '.carousel-control', '.carousel-indicators',
-        
-        # Bootstrap carousel
-        '.carousel', '.carousel-inner', '.carousel-item',
-        
-        # Custom carousel implementations
-        '.slider', '.Slider', '.slideshow', '.Slideshow',
-        '.slide', '.Slide', '.slide-content', '.slide-text',
-        
-        # Property-specific carousel patterns
-        '.room-carousel', '.pricing-carousel', '.amenity-carousel',
-        '.tenancy-carousel', '.photo-carousel', '.gallery-carousel',
-        
-        # Generic slider patterns
-        '.slider-content', '.slide-content', '.carousel-content',
-        '[data-carousel]', '[data-slider]', '[data-slideshow]'
-    ]
+    carousel_content = []
     
     # Find all potential carousel containers
-    carousel_containers = []
-    for selector in carousel_selectors:
-        carousel_containers.extend(soup.select(selector))
+    carousel_containers = _CAROUSEL_SELECTOR.select(soup)
+    if not carousel_containers:
+        return ""
     
     # Remove duplicates while preserving order
     seen = set()
     unique_containers = []
     for container in carousel_containers:
-        container_id = container.get('id', '') or container.get('class', [])
-        if str(container_id) not in seen:
-            seen.add(str(container_id))
+        if id(container) not in seen:
+            seen.add(id(container))
             unique_containers.append(container)
     
     for container in unique_containers:
         try:
             # Extract carousel items/slides
             items = []
-            item_selectors = [
-                '.carousel-item', '.slide', '.Slide', '.slide-content',
-                '.carousel-slide', '.slider-item', '.slideshow-item'
-            ]
-            
-            for item_sel in item_selectors:
-                item_elements = container.select(item_sel)
-                for item in item_elements:
-                    item_text = item.get_text(strip=True)
-                    if item_text and item_text not in items:
-                        items.append(item_text)
+            items_seen = set()
+            for item in _CAROUSEL_ITEM_SELECTOR.select(container):
+                item_text = item.get_text(strip=True)
+                if item_text and item_text not in items_seen:
+                    items_seen.add(item_text)
+                    items.append(item_text)
             
             # Extract carousel captions/descriptions
             captions = []
-            caption_selectors = [
-                '.carousel-caption', '.slide-caption', '.slide-description',
-                '.carousel-text', '.slide-text', '.carousel-description'
-            ]
-            
-            for caption_sel in caption_selectors:
-                caption_elements = container.select(caption_sel)
-                for caption in caption_elements:
-                    caption_text = caption.get_text(strip=True)
-                    if caption_text and caption_text not in captions:
-                        captions.append(caption_text)
+            captions_seen = set()
+            for caption in _CAROUSEL_CAPTION_SELECTOR.select(container):
+                caption_text = caption.get_text(strip=True)
+                if caption_text and caption_text not in captions_seen:
+                    captions_seen.add(caption_text)
+                    captions.append(caption_text)
             
             # If we found items, structure them
             if items:
-                carousel_content += f"\n[CAROUSEL: {len(items)} items]\n"
+                carousel_content.append(f"\n[CAROUSEL: {len(items)} items]\n")
                 for i, item in enumerate(items):
-                    carousel_content += f"ITEM {i+1}: {item}\n"
+                    carousel_content.append(f"ITEM {i+1}: {item}\n")
                     # Try to match with captions
                     if i < len(captions):
-                        carousel_content += f"CAPTION: {captions[i]}\n"
-                    carousel_content += "---\n"
-                carousel_content += "[END CAROUSEL]\n"
+                        carousel_content.append(f"CAPTION: {captions[i]}\n")
+                    carousel_content.append("---\n")
+                carousel_content.append("[END CAROUSEL]\n")
             
             # If we only found captions
             elif captions:
-                carousel_content += f"\n[CAROUSEL CAPTIONS: {len(captions)} items]\n"
+                carousel_content.append(f"\n[CAROUSEL CAPTIONS: {len(captions)} items]\n")
                 for i, caption in enumerate(captions):
-                    carousel_content += f"CAPTION {i+1}: {caption}\n"
-                carousel_content += "[END CAROUSEL CAPTIONS]\n"
+                    carousel_content.append(f"CAPTION {i+1}: {caption}\n")
+                carousel_content.append("[END CAROUSEL CAPTIONS]\n")
                 
         except Exception as e:
             continue
     
-    return carousel_content
+    return "".join(carousel_content)
+
+
+def _selector_group(selectors: Tuple[str, ...]) -> Tuple[Any, Tuple[Tuple[str, Any], ...]]:
+    """Compile a labelled selector list into one union matcher plus a matcher per entry."""
+    selectors = tuple(dict.fromkeys(selectors))
+    return sv.compile(", ".join(selectors)), tuple((sel, sv.compile(sel)) for sel in selectors)
+
+
+def _select_grouped(soup: BeautifulSoup, group) -> List[Tuple[str, Tag]]:
+    """Return (selector, element) pairs ordered by selector then document, as separate
+    per-selector selects would, but walking the tree once with the union matcher."""
+    union, matchers = group
+    candidates = union.select(soup)
+    if not candidates:
+        return []
+    return [(sel, elem) for sel, matcher in matchers for elem in candidates if matcher.match(elem)]
+
+
+_HIDDEN_GROUP = _selector_group((
+    '[style*="display: none"]', '[style*="display:none"]', '[style*="visibility: hidden"]',
+    '[hidden]', '[aria-hidden="true"]', '.hidden', '.d-none', '.invisible',
+    '[data-hidden="true"]', '[data-visible="false"]', '.js-hidden', '.js-hidden-content',
+))
+
+_DATA_ATTRS = (
+    'data-content', 'data-text', 'data-description', 'data-info',
+    'data-details', 'data-features', 'data-amenities', 'data-pricing',
+    'data-tenancy', 'data-rooms', 'data-configuration',
+)
+_DATA_GROUP = _selector_group(tuple(f'[{attr}]' for attr in _DATA_ATTRS))
+
+_SCRIPT_JSON_GROUP = _selector_group((
+    'script[type="application/json"]', 'script[type="application/ld+json"]',
+    'script[data-config]', 'script[data-content]', 'script[data-property]',
+))
+
+_ARIA_ATTRS = ('aria-label', 'title', 'alt', 'data-tooltip', 'data-title')
+_ARIA_GROUP = _selector_group(tuple(f'[{attr}]' for attr in _ARIA_ATTRS))
+
+_META_GROUP = _selector_group((
+    'meta[name="description"]', 'meta[name="keywords"]', 'meta[property="og:description"]',
+    'meta[property="og:title"]', 'meta[property="og:type"]', 'meta[name="author"]',
+    'meta[name="robots"]', 'meta[name="viewport"]', 'meta[charset]',
+))
+
+_SCHEMA_GROUP = _selector_group((
+    '[itemtype*="schema.org"]', '[itemtype*="schema.org/Place"]',
+    '[itemtype*="schema.org/Residence"]', '[itemtype*="schema.org/Apartment"]',
+    '[itemtype*="schema.org/Product"]', '[itemtype*="schema.org/Offer"]',
+))
+
+_OG_GROUP = _selector_group((
+    'meta[property^="og:"]', 'meta[property^="twitter:"]', 'meta[name^="twitter:"]',
+))
 
 
 def _extract_javascript_content(soup: BeautifulSoup) -> str:
     """Extract content from JavaScript-loaded or hidden elements that might contain important data"""
-    js_content = ""
+    js_content = []
     
     # Look for hidden elements that might contain data
-    hidden_selectors = [
-        '[style*="display: none"]', '[style*="display:none"]', '[style*="visibility: hidden"]',
-        '[hidden]', '[aria-hidden="true"]', '.hidden', '.d-none', '.invisible',
-        '[data-hidden="true"]', '[data-visible="false"]', '.js-hidden', '.js-hidden-content'
-    ]
-    
-    for selector in hidden_selectors:
+    for selector, elem in _select_grouped(soup, _HIDDEN_GROUP):
         try:
-            elements = soup.select(selector)
-            for elem in elements:
-                elem_text = elem.get_text(strip=True)
-                if elem_text and len(elem_text) > 20:  # Only substantial content
-                    js_content += f"\n[HIDDEN CONTENT: {selector}]\n{elem_text}\n[END HIDDEN CONTENT]\n"
+            elem_text = elem.get_text(strip=True)
+            if elem_text and len(elem_text) > 20:  # Only substantial content
+                js_content.append(f"\n[HIDDEN CONTENT: {selector}]\n{elem_text}\n[END HIDDEN CONTENT]\n")
         except Exception:
             continue
     
     # Look for data attributes that might contain content
-    data_selectors = [
-        '[data-content]', '[data-text]', '[data-description]', '[data-info]',
-        '[data-details]', '[data-features]', '[data-amenities]', '[data-pricing]',
-        '[data-tenancy]', '[data-rooms]', '[data-configuration]'
-    ]
-    
-    for selector in data_selectors:
+    for selector, elem in _select_grouped(soup, _DATA_GROUP):
         try:
-            elements = soup.select(selector)
-            for elem in elements:
-                # Get the data attribute value
-                data_attr = None
-                for attr in ['data-content', 'data-text', 'data-description', 'data-info', 
-                           'data-details', 'data-features', 'data-amenities', 'data-pricing',
-                           'data-tenancy', 'data-rooms', 'data-configuration']:
-                    if elem.has_attr(attr):
-                        data_attr = elem.get(attr)
-                        break
-                
-                if data_attr:
-                    js_content += f"\n[DATA ATTRIBUTE: {selector}]\n{data_attr}\n[END DATA ATTRIBUTE]\n"
-                
-                # Also get the element text if it exists
-                elem_text = elem.get_text(strip=True)
-                if elem_text and len(elem_text) > 20:
-                    js_content += f"\n[DATA ELEMENT TEXT: {selector}]\n{elem_text}\n[END DATA ELEMENT TEXT]\n"
+            # Get the data attribute value
+            data_attr = None
+            for attr in _DATA_ATTRS:
+                if elem.has_attr(attr):
+                    data_attr = elem.get(attr)
+                    break
+            
+            if data_attr:
+                js_content.append(f"\n[DATA ATTRIBUTE: {selector}]\n{data_attr}\n[END DATA ATTRIBUTE]\n")
+            
+            # Also get the element text if it exists
+            elem_text = elem.get_text(strip=True)
+            if elem_text and len(elem_text) > 20:
+                js_content.append(f"\n[DATA ELEMENT TEXT: {selector}]\n{elem_text}\n[END DATA ELEMENT TEXT]\n")
         except Exception:
             continue
     
     # Look for script tags that might contain JSON data
-    script_selectors = [
-        'script[type="application/json"]', 'script[type="application/ld+json"]',
-        'script[data-config]', 'script[data-content]', 'script[data-property]'
-    ]
-    
-    for selector in script_selectors:
+    for selector, script in _select_grouped(soup, _SCRIPT_JSON_GROUP):
         try:
-            scripts = soup.select(selector)
-            for script in scripts:
-                if script.string:
-                    script_content = script.string.strip()
-                    if script_content and len(script_content) > 50:  # Only substantial JSON
-                        # Truncate very long JSON for readability
-                        if len(script_content) > 2000:
-                            script_content = script_content[:2000] + "..."
-                        js_content += f"\n[JAVASCRIPT JSON: {selector}]\n{script_content}\n[END JAVASCRIPT JSON]\n"
+            if script.string:
+                script_content = script.string.strip()
+                if script_content and len(script_content) > 50:  # Only substantial JSON
+                    # Truncate very long JSON for readability
+                    if len(script_content) > 2000:
+                        script_content = script_content[:2000] + "..."
+                    js_content.append(f"\n[JAVASCRIPT JSON: {selector}]\n{script_content}\n[END JAVASCRIPT JSON]\n")
         except Exception:
             continue
     
     # Look for elements with aria-label or title attributes that might contain descriptions
-    aria_selectors = [
-        '[aria-label]', '[title]', '[alt]', '[data-tooltip]', '[data-title]'
-    ]
-    
-    for selector in aria_selectors:
+    for selector, elem in _select_grouped(soup, _ARIA_GROUP):
         try:
-            elements = soup.select(selector)
-            for elem in elements:
-                aria_text = ""
-                for attr in ['aria-label', 'title', 'alt', 'data-tooltip', 'data-title']:
-                    if elem.has_attr(attr):
-                        aria_text = elem.get(attr)
-                        if aria_text and len(aria_text) > 10:  # Only substantial descriptions
-                            js_content += f"\n[ARIA CONTENT: {attr}]\n{aria_text}\n[END ARIA CONTENT]\n"
-                        break
+            aria_text = ""
+            for attr in _ARIA_ATTRS:
+                if elem.has_attr(attr):
+                    aria_text = elem.get(attr)
+                    if aria_text and len(aria_text) > 10:  # Only substantial descriptions
+                        js_content.append(f"\n[ARIA CONTENT: {attr}]\n{aria_text}\n[END ARIA CONTENT]\n")
+                    break
         except Exception:
             continue
     
-    return js_content
+    return "".join(js_content)
 
 
 def _extract_structured_data(soup: BeautifulSoup) -> str:
     """Extract structured data from meta tags, schema.org markup, and other structured formats"""
-    structured_data = ""
+    structured_data = []
     
     # Extract meta tags that might contain property information
-    meta_selectors = [
-        'meta[name="description"]', 'meta[name="keywords"]', 'meta[property="og:description"]',
-        'meta[property="og:title"]', 'meta[property="og:type"]', 'meta[name="author"]',
-        'meta[name="robots"]', 'meta[name="viewport"]', 'meta[charset]'
-    ]
-    
-    for selector in meta_selectors:
+    for selector, meta in _select_grouped(soup, _META_GROUP):
         try:
-            metas = soup.select(selector)
-            for meta in metas:
-                content = meta.get('content', '') or meta.get('charset', '')
-                if content and len(content) > 5:
-                    name = meta.get('name', '') or meta.get('property', '') or meta.get('charset', '')
-                    structured_data += f"\n[META: {name}]\n{content}\n[END META]\n"
+            content = meta.get('content', '') or meta.get('charset', '')
+            if content and len(content) > 5:
+                name = meta.get('name', '') or meta.get('property', '') or meta.get('charset', '')
+                structured_data.append(f"\n[META: {name}]\n{content}\n[END META]\n")
         except Exception:
             continue
     
     # Extract schema.org structured data
-    schema_selectors = [
-        '[itemtype*="schema.org"]', '[itemtype*="schema.org/Place"]', 
-        '[itemtype*="schema.org/Residence"]', '[itemtype*="schema.org/Apartment"]',
-        '[itemtype*="schema.org/Product"]', '[itemtype*="schema.org/Offer"]'
-    ]
-    
-    for selector in schema_selectors:
+    for selector, elem in _select_grouped(soup, _SCHEMA_GROUP):
         try:
-            schema_elements = soup.select(selector)
-            for elem in schema_elements:
-                # Extract itemtype
-                itemtype = elem.get('itemtype', '')
-                if itemtype:
-                    structured_data += f"\n[SCHEMA: {itemtype}]\n"
-                    
-                    # Extract itemprops
-                    itemprops = elem.find_all(attrs={'itemprop': True})
-                    for prop in itemprops:
-                        prop_name = prop.get('itemprop', '')
-                        prop_content = prop.get('content', '') or prop.get_text(strip=True)
-                        if prop_content:
-                            structured_data += f"{prop_name}: {prop_content}\n"
-                    
-                    structured_data += "[END SCHEMA]\n"
+            # Extract itemtype
+            itemtype = elem.get('itemtype', '')
+            if itemtype:
+                structured_data.append(f"\n[SCHEMA: {itemtype}]\n")
+                
+                # Extract itemprops
+                itemprops = elem.find_all(attrs={'itemprop': True})
+                for prop in itemprops:
+                    prop_name = prop.get('itemprop', '')
+                    prop_content = prop.get('content', '') or prop.get_text(strip=True)
+                    if prop_content:
+                        structured_data.append(f"{prop_name}: {prop_content}\n")
+                
+                structured_data.append("[END SCHEMA]\n")
         except Exception:
             continue
     
     # Extract Open Graph and Twitter Card data
-    og_selectors = [
-        'meta[property^="og:"]', 'meta[property^="twitter:"]', 'meta[name^="twitter:"]'
-    ]
-    
-    for selector in og_selectors:
+    for selector, elem in _select_grouped(soup, _OG_GROUP):
         try:
-            og_elements = soup.select(selector)
-            for elem in og_elements:
-                property_name = elem.get('property', '') or elem.get('name', '')
-                content = elem.get('content', '')
-                if property_name and content:
-                    structured_data += f"\n[OPEN GRAPH: {property_name}]\n{content}\n[END OPEN GRAPH]\n"
+            property_name = elem.get('property', '') or elem.get('name', '')
+            content = elem.get('content', '')
+            if property_name and content:
+                structured_data.append(f"\n[OPEN GRAPH: {property_name}]\n{content}\n[END OPEN GRAPH]\n")
         except Exception:
             continue
     
-    return structured_data
+    return "".join(structured_data)
+
+
+# Response bodies are streamed and cut at these sizes (4 bytes per char covers any UTF-8 page
+# the parser would still see in full)
+_MAX_FETCH_BYTES = 4 * _MAX_INPUT_CHARS
+_MAX_API_BODY_CHARS = 4000
+
+# On-disk HTTP cache location (requests-cache adds the .sqlite suffix). Set SCRAPER_CACHE_DIR to
+# move it; the default keeps it out of the source tree, which may be read-only when deployed.
+_HTTP_CACHE_PATH = os.path.join(
+    os.getenv("SCRAPER_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "property_onboarding_tool"),
+    "scraper_cache",
+)
+
+
+def _fits_fetch_cap(resp: requests.Response) -> bool:
+    """Cache only responses that declare a body within the fetch cap.
+
+    requests-cache downloads the whole body to store it, which would bypass the capped
+    streamed read; anything larger or of unknown length is fetched uncached instead.
+    """
+    try:
+        return int(resp.headers.get("Content-Length", "")) <= _MAX_FETCH_BYTES
+    except ValueError:
+        return False
+
+
+# Shared session so page and API fetches reuse pooled keep-alive connections instead of paying a
+# TCP/TLS handshake per request. Retries stay in _fetch, so the adapter does not add its own.
+# With requests-cache installed, GET responses also persist on disk for an hour across runs.
+# If the cache cannot be opened (not installed, unwritable directory), fetches go uncached.
+try:
+    import requests_cache
+    os.makedirs(os.path.dirname(_HTTP_CACHE_PATH), exist_ok=True)
+    _SESSION = requests_cache.CachedSession(
+        _HTTP_CACHE_PATH, expire_after=3600, allowable_methods=("GET",), filter_fn=_fits_fetch_cap
+    )
+    _HTTP_CACHE_ENABLED = True
+except (ImportError, OSError, sqlite3.Error):
+    _SESSION = requests.Session()
+    _HTTP_CACHE_ENABLED = False
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+
+# Concurrent page prefetches per crawl when no crawl delay is set (with one, pages are fetched
+# one at a time), and concurrent API-endpoint fetches, which run on their own pool
+_FETCH_WORKERS = 8
+_API_FETCH_WORKERS = 4
+
+
+def _read_capped_text(resp: requests.Response, max_bytes: int) -> str:
+    """Decode at most max_bytes of a streamed response body, leaving the rest undownloaded."""
+    chunks = []
+    total = 0
+    for chunk in resp.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= max_bytes:
+            break
+    body = b"".join(chunks)[:max_bytes]
+    try:
+        return body.decode(resp.encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
 
 
 def _fetch(url: str, timeout: int, headers: Dict[str, str]) -> str:
@@ -1059,9 +1394,9 @@ def _fetch(url: str, timeout: int, headers: Dict[str, str]) -> str:
     
     for attempt in range(max_retries):
         try:
-            resp = requests.get(url, timeout=timeout, headers=headers)
-            resp.raise_for_status()
-            return resp.text
+            with _SESSION.get(url, timeout=timeout, headers=headers, stream=True) as resp:
+                resp.raise_for_status()
+                return _read_capped_text(resp, _MAX_FETCH_BYTES)
         except requests.exceptions.Timeout:
             if attempt < max_retries - 1:
                 time.sleep(retry_delay)
@@ -1084,12 +1419,33 @@ def _fetch(url: str, timeout: int, headers: Dict[str, str]) -> str:
     raise Exception(f"Failed to fetch {url} after {max_retries} attempts")
 
 
-_CACHE: Dict[str, str] = {}
+# Raw HTML of recently fetched pages by normalized URL, least recently used evicted first.
+# Shared by concurrent crawls, so every access holds the lock.
+_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_CACHE_SIZE = 200
+_CACHE_LOCK = threading.Lock()
+
+
+def _cached_page(norm_url: str) -> str | None:
+    with _CACHE_LOCK:
+        html = _CACHE.get(norm_url)
+        if html is not None:
+            _CACHE.move_to_end(norm_url)
+        return html
 
 
+def _cache_page(norm_url: str, html: str) -> None:
+    with _CACHE_LOCK:
+        _CACHE[norm_url] = html
+        _CACHE.move_to_end(norm_url)
+        if len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+
+@functools.lru_cache(maxsize=8192)
 def _normalize_url(url: str) -> str:
     try:
-        parsed = urlparse(url)
+        parsed = _urlparse(url)
         # drop fragment and query for stability
         normalized = parsed._replace(query="", fragment="")
         s = urlunparse(normalized)
@@ -1100,58 +1456,126 @@ def _normalize_url(url: str) -> str:
         return url
 
 
-def _score_link(url: str, anchor_text: str, allow_patterns: List[str]) -> int:
+# Enhanced scoring for Node 3 (Configuration) and Node 4 (Tenancy) priority
+_CONFIGURATION_KEYWORDS = {
+    # High priority room configuration keywords
+    'room': 8, 'studio': 8, 'apartment': 8, 'flat': 8, 'accommodation': 8,
+    'ensuite': 9, 'en-suite': 9, 'bedroom': 8, 'bathroom': 7, 'kitchen': 6,
+    'configuration': 10, 'config': 9, 'option': 8, 'variant': 8, 'type': 7,
+    'detail': 8, 'specification': 8, 'spec': 7, 'info': 6, 'information': 6,
+    'floor\\s*plan': 9, 'layout': 8, 'diagram': 7, 'gallery': 6, 'photo': 5,
+    'premium': 7, 'deluxe': 7, 'standard': 6, 'basic': 5, 'economy': 5
+}
+
+_TENANCY_KEYWORDS = {
+    # High priority tenancy and contract keywords
+    'tenancy': 10, 'contract': 10, 'lease': 10, 'term': 9, 'duration': 9,
+    'agreement': 8, 'booking': 8, 'reservation': 8, 'availability': 7,
+    'price': 9, 'pricing': 9, 'cost': 8, 'fee': 8, 'rent': 9, 'deposit': 8,
+    'weekly': 8, 'monthly': 7, 'per\\s*week': 8, 'per\\s*month': 7, 'pw': 8, 'pm': 7,
+    'start': 7, 'end': 7, 'date': 6, 'move': 6, 'arrival': 6, 'departure': 6,
+    'semester': 8, 'academic\\s*year': 8, 'term': 7, 'session': 6,
+    'guarantor': 8, 'guarantee': 7, 'reference': 6, 'requirement': 6,
+    'cancellation': 7, 'refund': 7, 'modification': 6, 'transfer': 6,
+    'offer': 6, 'deal': 6, 'promotion': 6, 'discount': 6, 'incentive': 6
+}
+
+
+def _build_link_keyword_table(*tables: Dict[str, int]) -> Tuple[Tuple[str, "re.Pattern[str]", int, int], ...]:
+    """(stem, word-bounded pattern, path score, anchor score) for every keyword.
+
+    The stem is the keyword's leading literal text. Scored strings are lower-cased, so a keyword
+    can only match where its stem occurs, and the regex runs only after a cheap substring check."""
+    scores: Dict[str, List[int]] = {}
+    for table in tables:
+        for keyword, keyword_score in table.items():
+            totals = scores.setdefault(keyword, [0, 0])
+            totals[0] += keyword_score
+            totals[1] += keyword_score // 2  # Anchor text gets half the score
+    return tuple(
+        (keyword.split('\\s*')[0], re.compile(rf'\b{keyword}\b', re.IGNORECASE), full, half)
+        for keyword, (full, half) in scores.items()
+    )
+
+
+# Configuration (Node 3) and tenancy (Node 4) keywords
+_LINK_KEYWORDS = _build_link_keyword_table(_CONFIGURATION_KEYWORDS, _TENANCY_KEYWORDS)
+
+
+# Candidate endpoint URLs in raw page HTML (absolute, or quoted root-relative paths)
+_ABSOLUTE_URL_RE = re.compile(r"https?://[^\'\"\s<>]+")
+_QUOTED_PATH_RE = re.compile(r"[\'\"](/[^\'\"\s<>]+)[\'\"]")
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_allow_patterns(allow_patterns: Tuple[str, ...]) -> Tuple[Tuple[str, "re.Pattern[str]"], ...]:
+    """Compile allow patterns case-insensitively as (literal prefix, pattern) pairs, skipping any
+    that are not valid regexes. The prefix is lower-cased and must occur in any text the pattern
+    matches; it is empty when the pattern has no usable literal start."""
+    compiled = []
+    for pat in allow_patterns:
+        try:
+            compiled.append((_literal_prefix(pat), re.compile(pat, re.IGNORECASE)))
+        except re.error:
+            continue
+    return tuple(compiled)
+
+
+# Characters that match only themselves (ignoring case) at the start of a pattern
+_LITERAL_RUN_RE = re.compile(r"[\w\- /]*")
+
+
+def _literal_prefix(pattern: str) -> str:
+    if "|" in pattern:
+        return ""
+    prefix = _LITERAL_RUN_RE.match(pattern).group()
+    # A quantifier right after the run makes its last character optional
+    if pattern[len(prefix):len(prefix) + 1] in ("?", "*", "{"):
+        prefix = prefix[:-1]
+    return prefix.lower()
+
+
+def _matches_allow_pattern(allow_patterns: Tuple[Tuple[str, "re.Pattern[str]"], ...], text: str) -> bool:
+    text_lower = text.lower()
+    return any(prefix in text_lower and pattern.search(text) for prefix, pattern in allow_patterns)
+
+
+# (any of, and any of, bonus) substring rules applied to a link's lower-cased path
+_PATH_BONUS_RULES = (
+    # Likely configuration detail pages (increased from 5)
+    (frozenset({'room', 'studio', 'apartment', 'ensuite'}), frozenset({'detail', 'info', 'spec', 'configuration'}), 8),
+    # Likely tenancy/pricing pages (increased from 5)
+    (frozenset({'price', 'cost', 'fee', 'rent'}), frozenset({'tenancy', 'contract', 'lease', 'booking'}), 8),
+    # Semester/academic year specific pages
+    (frozenset({'semester', 'academic', 'term'}), frozenset({'tenancy', 'contract', 'booking', 'availability'}), 6),
+    # Room type variations
+    (frozenset({'premium', 'deluxe', 'standard', 'basic', 'economy'}), frozenset({'room', 'studio', 'apartment'}), 6),
+    # Pricing variations
+    (frozenset({'weekly', 'monthly', 'pw', 'pm'}), frozenset({'price', 'cost', 'rent', 'fee'}), 6),
+)
+_PATH_BONUS_KEYWORDS = frozenset().union(*(first | second for first, second, _ in _PATH_BONUS_RULES))
+
+
+@functools.lru_cache(maxsize=8192)
+def _score_link(url: str, anchor_text: str, allow_patterns: Tuple[Tuple[str, "re.Pattern[str]"], ...]) -> int:
     score = 0
-    path = urlparse(url).path.lower()
+    path = _urlparse(url).path.lower()
     anchor_lower = anchor_text.lower() if anchor_text else ''
     
-    # Enhanced scoring for Node 3 (Configuration) and Node 4 (Tenancy) priority
-    configuration_keywords = {
-        # High priority room configuration keywords
-        'room': 8, 'studio': 8, 'apartment': 8, 'flat': 8, 'accommodation': 8,
-        'ensuite': 9, 'en-suite': 9, 'bedroom': 8, 'bathroom': 7, 'kitchen': 6,
-        'configuration': 10, 'config': 9, 'option': 8, 'variant': 8, 'type': 7,
-        'detail': 8, 'specification': 8, 'spec': 7, 'info': 6, 'information': 6,
-        'floor\\s*plan': 9, 'layout': 8, 'diagram': 7, 'gallery': 6, 'photo': 5,
-        'premium': 7, 'deluxe': 7, 'standard': 6, 'basic': 5, 'economy': 5
-    }
-    
-    tenancy_keywords = {
-        # High priority tenancy and contract keywords
-        'tenancy': 10, 'contract': 10, 'lease': 10, 'term': 9, 'duration': 9,
-        'agreement': 8, 'booking': 8, 'reservation': 8, 'availability': 7,
-        'price': 9, 'pricing': 9, 'cost': 8, 'fee': 8, 'rent': 9, 'deposit': 8,
-        'weekly': 8, 'monthly': 7, 'per\\s*week': 8, 'per\\s*month': 7, 'pw': 8, 'pm': 7,
-        'start': 7, 'end': 7, 'date': 6, 'move': 6, 'arrival': 6, 'departure': 6,
-        'semester': 8, 'academic\\s*year': 8, 'term': 7, 'session': 6,
-        'guarantor': 8, 'guarantee': 7, 'reference': 6, 'requirement': 6,
-        'cancellation': 7, 'refund': 7, 'modification': 6, 'transfer': 6,
-        'offer': 6, 'deal': 6, 'promotion': 6, 'discount': 6, 'incentive': 6
-    }
-    
-    # Score based on configuration keywords (Node 3 priority)
-    for keyword, keyword_score in configuration_keywords.items():
-        if re.search(rf'\b{keyword}\b', path, re.IGNORECASE):
-            score += keyword_score
-        if anchor_text and re.search(rf'\b{keyword}\b', anchor_lower, re.IGNORECASE):
-            score += keyword_score // 2  # Anchor text gets half the score
-    
-    # Score based on tenancy keywords (Node 4 priority)
-    for keyword, keyword_score in tenancy_keywords.items():
-        if re.search(rf'\b{keyword}\b', path, re.IGNORECASE):
-            score += keyword_score
-        if anchor_text and re.search(rf'\b{keyword}\b', anchor_lower, re.IGNORECASE):
-            score += keyword_score // 2  # Anchor text gets half the score
+    # Score based on configuration (Node 3) and tenancy (Node 4) keywords
+    for stem, pattern, path_score, anchor_score in _LINK_KEYWORDS:
+        if stem in path and pattern.search(path):
+            score += path_score
+        if stem in anchor_lower and pattern.search(anchor_lower):
+            score += anchor_score
     
     # Apply pattern-based scoring from allow_patterns
-    for pat in allow_patterns:
-        try:
-            if re.search(pat, url, re.IGNORECASE):
-                score += 4  # Increased from 3
-            if anchor_text and re.search(pat, anchor_text, re.IGNORECASE):
-                score += 3  # Increased from 2
-        except Exception:
-            continue
+    url_lower = url.lower()
+    for prefix, pattern in allow_patterns:
+        if prefix in url_lower and pattern.search(url):
+            score += 4  # Increased from 3
+        if anchor_text and prefix in anchor_lower and pattern.search(anchor_text):
+            score += 3  # Increased from 2
     
     # Enhanced path-based scoring
     path_segments = [p for p in path.split('/') if p]
@@ -1160,25 +1584,12 @@ def _score_link(url: str, anchor_text: str, allow_patterns: List[str]) -> int:
     elif len(path_segments) > 3:
         score -= min(len(path_segments) - 3, 4)  # Increased penalty for very deep paths
     
-    # Bonus for likely configuration detail pages
-    if any(kw in path for kw in ['room', 'studio', 'apartment', 'ensuite']) and any(kw in path for kw in ['detail', 'info', 'spec', 'configuration']):
-        score += 8  # Increased from 5
-    
-    # Bonus for likely tenancy/pricing pages
-    if any(kw in path for kw in ['price', 'cost', 'fee', 'rent']) and any(kw in path for kw in ['tenancy', 'contract', 'lease', 'booking']):
-        score += 8  # Increased from 5
-    
-    # Bonus for semester/academic year specific pages
-    if any(kw in path for kw in ['semester', 'academic', 'term']) and any(kw in path for kw in ['tenancy', 'contract', 'booking', 'availability']):
-        score += 6
-    
-    # Bonus for room type variations
-    if any(kw in path for kw in ['premium', 'deluxe', 'standard', 'basic', 'economy']) and any(kw in path for kw in ['room', 'studio', 'apartment']):
-        score += 6
-    
-    # Bonus for pricing variations
-    if any(kw in path for kw in ['weekly', 'monthly', 'pw', 'pm']) and any(kw in path for kw in ['price', 'cost', 'rent', 'fee']):
-        score += 6
+    # Bonuses for paths that pair an accommodation/pricing term with a detail/contract term
+    path_has = {kw for kw in _PATH_BONUS_KEYWORDS if kw in path}
+    if path_has:
+        for first, second, bonus in _PATH_BONUS_RULES:
+            if path_has & first and path_has & second:
+                score += bonus
         
     return score
 
@@ -1228,26 +1639,73 @@ def crawl_site(
             r"policy", r"policies", r"rule", r"condition", r"requirement", r"faq", r"question", r"answer",
             r"terms", r"conditions", r"cancellation", r"refund", r"modification", r"transfer", r"swap"
         ]
+    # Compiled once per crawl; a tuple so _score_link can be memoized on its arguments across pages
+    allow_patterns = _compile_allow_patterns(tuple(allow_patterns))
 
     headers = {
         "User-Agent": DEFAULT_USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
     }
+    if not _HTTP_CACHE_ENABLED:
+        # requests-cache treats these as "revalidate", so they are only sent when nothing is cached locally
+        headers["Cache-Control"] = "no-cache"
+        headers["Pragma"] = "no-cache"
     seen: Set[str] = set()
-    queue: List[tuple[str, int]] = [(main_url, 0)]
+    queue: Deque[Tuple[str, int]] = deque([(main_url, 0)])
     pages: List[Dict[str, str]] = []
+    # Page fetches run on the pool while earlier pages are parsed; results are consumed in queue
+    # order. With a crawl delay the pool has a single worker, so the site still sees one page
+    # request at a time, each starting crawl_delay_ms after the previous one finished.
+    page_pool = ThreadPoolExecutor(max_workers=1 if crawl_delay_ms else _FETCH_WORKERS)
+    api_pool = ThreadPoolExecutor(max_workers=_API_FETCH_WORKERS)
+    prefetched: Dict[str, "Future[str]"] = {}
+    crawl_delay = crawl_delay_ms / 1000.0 if crawl_delay_ms else 0.0
+    last_fetch_done = [0.0]
+    stopped = threading.Event()
+
+    def _paced_fetch(page_url: str) -> str:
+        """Fetch a page once the politeness delay since the previous page fetch has passed."""
+        if crawl_delay:
+            wait = last_fetch_done[0] + crawl_delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        if stopped.is_set():
+            raise Exception(f"Crawl finished before {page_url} was fetched")
+        try:
+            return _fetch(page_url, request_timeout, headers)
+        finally:
+            last_fetch_done[0] = time.monotonic()
+
+    def _prefetch_queued() -> None:
+        """Start fetching queued pages that will be crawled, up to the remaining page budget."""
+        budget = max_total_pages - len(pages)
+        for queued_url, _ in queue:
+            if len(prefetched) >= budget:
+                break
+            nu = _normalize_url(queued_url)
+            if nu in seen or nu in prefetched or _cached_page(nu) is not None:
+                continue
+            prefetched[nu] = page_pool.submit(_paced_fetch, queued_url)
+
+    def _fetch_api_body(api_url: str) -> str:
+        try:
+            with _SESSION.get(api_url, timeout=request_timeout, headers=headers, stream=True) as resp:
+                if resp.status_code == 200:
+                    # One char past the cap tells the caller the body was truncated
+                    return _read_capped_text(resp, 4 * (_MAX_API_BODY_CHARS + 1))
+        except Exception:
+            pass
+        return ""
 
     def _extract_api_urls(html: str, base_url: str) -> List[str]:
         urls: Set[str] = set()
         try:
             # Find absolute/relative URLs in scripts
-            for m in re.findall(r"https?://[^\'\"\s<>]+", html):
+            for m in _ABSOLUTE_URL_RE.findall(html):
                 urls.add(m)
             # JSON-looking endpoints inside quotes
-            for m in re.findall(r"[\'\"](/[^\'\"\s<>]+)[\'\"]", html):
+            for m in _QUOTED_PATH_RE.findall(html):
                 try:
                     urls.add(urljoin(base_url, m))
                 except Exception:
@@ -1277,58 +1735,44 @@ def crawl_site(
                 break
         return uniq
 
-    while queue and len(pages) < max_total_pages:
-        url, depth = queue.pop(0)
-        norm_url = _normalize_url(url)
-        if norm_url in seen:
-            continue
-        seen.add(norm_url)
-        try:
-            if norm_url in _CACHE:
-                html = _CACHE[norm_url]
-            else:
-                html = _fetch(url, request_timeout, headers)
-                # naive cache with simple cap
-                if len(_CACHE) < 200:
-                    _CACHE[norm_url] = html
-
-            extra_blocks = ""
-            # Include inline JSON scripts (application/json)
-            try:
-                soup_local = BeautifulSoup(html, "html.parser")
-                for js in soup_local.find_all("script", {"type": "application/json"}):
-                    if js.string and len(js.string) > 2:
-                        payload = js.string.strip()
-                        if len(payload) > 2000:
-                            payload = payload[:2000] + "..."
-                        extra_blocks += f"\n[INLINE JSON]\n{payload}\n[END INLINE JSON]\n"
-            except Exception:
-                pass
-            # Fetch referenced JSON/API endpoints
+    try:
+        while queue and len(pages) < max_total_pages:
+            _prefetch_queued()
+            url, depth = queue.popleft()
+            norm_url = _normalize_url(url)
+            if norm_url in seen:
+                continue
+            seen.add(norm_url)
             try:
-                api_urls = _extract_api_urls(html, url)
-                for api_url in api_urls:
-                    try:
-                        resp = requests.get(api_url, timeout=request_timeout, headers=headers)
-                        if resp.status_code == 200 and resp.text:
-                            body = resp.text
-                            if len(body) > 4000:
-                                body = body[:4000] + "..."
-                            extra_blocks += f"\n[API RESPONSE url=\"{api_url}\"]\n{body}\n[END API RESPONSE]\n"
-                    except Exception:
-                        continue
-            except Exception:
-                pass
+                html = _cached_page(norm_url)
+                if html is None:
+                    future = prefetched.pop(norm_url, None)
+                    if future is None:
+                        future = page_pool.submit(_paced_fetch, url)
+                    html = future.result()
+                    _cache_page(norm_url, html)
+
+                # One parse per page. Links and inline JSON are read first because _clean_text
+                # consumes the tree (it decomposes scripts, nav and header).
+                soup = _parse_html(html)
 
-            text = _clean_text(html)
-            if extra_blocks:
-                text = extra_blocks + "\n" + text
-            if text:
-                # Append page link inventory to help discovery
+                extra_blocks = []
+                # Include inline JSON scripts (application/json)
+                try:
+                    for js in soup.find_all("script", {"type": "application/json"}):
+                        if js.string and len(js.string) > 2:
+                            payload = js.string.strip()
+                            if len(payload) > 2000:
+                                payload = payload[:2000] + "..."
+                            extra_blocks.append(f"\n[INLINE JSON]\n{payload}\n[END INLINE JSON]\n")
+                except Exception:
+                    pass
+
+                # Page link inventory to help discovery
+                link_inventory = ""
                 try:
-                    soup_links = BeautifulSoup(html, "html.parser")
                     links = []
-                    for a in soup_links.find_all("a", href=True):
+                    for a in soup.find_all("a", href=True):
                         target = urljoin(url, a["href"])
                         if _is_same_domain(main_url, target):
                             links.append(_normalize_url(target))
@@ -1342,162 +1786,220 @@ def crawl_site(
                             unique_links.append(l)
                             if len(unique_links) >= 50:
                                 break
-                        text = f"[PAGE LINKS]\n" + "\n".join(unique_links) + "\n[END PAGE LINKS]\n\n" + text
+                        link_inventory = f"[PAGE LINKS]\n" + "\n".join(unique_links) + "\n[END PAGE LINKS]\n\n"
                 except Exception:
                     pass
-                pages.append({"url": norm_url, "text": text})
-
-            if depth < follow_depth:
-                soup = BeautifulSoup(html, "html.parser")
-                scored: List[Tuple[int, str]] = []
-                for a in soup.find_all("a", href=True):
-                    target = urljoin(url, a["href"])
-                    if not _is_allowed_domain(main_url, target, allow_external_domains):
-                        continue
-                    anchor = a.get_text(strip=True) or ""
-                    # Allow following if URL OR anchor text matches allowed patterns
-                    if not any(
-                        re.search(pat, target, re.IGNORECASE) or (anchor and re.search(pat, anchor, re.IGNORECASE))
-                        for pat in allow_patterns
-                    ):
-                        continue
-                    score = _score_link(target, anchor, allow_patterns)
-                    scored.append((score, _normalize_url(target)))
-                # sort by score desc and unique
-                scored.sort(key=lambda x: x[0], reverse=True)
+
                 unique_targets = []
-                seen_targets = set()
-                for _, t in scored:
-                    if t in seen_targets:
-                        continue
-                    seen_targets.add(t)
-                    unique_targets.append(t)
-                    if len(unique_targets) >= max_links_per_page:
-                        break
+                # A bad link aborts following from this page but keeps the page itself
+                try:
+                    if depth < follow_depth:
+                        scored: List[Tuple[int, str]] = []
+                        for a in soup.find_all("a", href=True):
+                            target = urljoin(url, a["href"])
+                            if not _is_allowed_domain(main_url, target, allow_external_domains):
+                                continue
+                            anchor = a.get_text(strip=True) or ""
+                            # Allow following if URL OR anchor text matches allowed patterns
+                            if not (
+                                _matches_allow_pattern(allow_patterns, target)
+                                or (anchor and _matches_allow_pattern(allow_patterns, anchor))
+                            ):
+                                continue
+                            score = _score_link(target, anchor, allow_patterns)
+                            scored.append((score, _normalize_url(target)))
+                        # sort by score desc and unique
+                        scored.sort(key=lambda x: x[0], reverse=True)
+                        seen_targets = set()
+                        for _, t in scored:
+                            if t in seen_targets:
+                                continue
+                            seen_targets.add(t)
+                            unique_targets.append(t)
+                            if len(unique_targets) >= max_links_per_page:
+                                break
+                except Exception:
+                    unique_targets = []
+
+                # Fetch referenced JSON/API endpoints
+                try:
+                    api_urls = _extract_api_urls(html, url)
+                    for api_url, body in zip(api_urls, api_pool.map(_fetch_api_body, api_urls)):
+                        if body:
+                            if len(body) > _MAX_API_BODY_CHARS:
+                                body = body[:_MAX_API_BODY_CHARS] + "..."
+                            extra_blocks.append(f"\n[API RESPONSE url=\"{api_url}\"]\n{body}\n[END API RESPONSE]\n")
+                except Exception:
+                    pass
+
+                text = _clean_text(html, soup)
+                if extra_blocks:
+                    text = "".join(extra_blocks) + "\n" + text
+                if text:
+                    text = link_inventory + text
+                    pages.append({"url": norm_url, "text": text})
+
                 for nxt in unique_targets:
                     if nxt not in seen:
                         queue.append((nxt, depth + 1))
-            # politeness delay
-            if crawl_delay_ms:
-                time.sleep(crawl_delay_ms / 1000.0)
-        except Exception:
-            # ignore fetch errors silently for robustness
-            continue
+            except Exception:
+                # ignore fetch errors silently for robustness
+                continue
 
+    finally:
+        # Drop prefetches the budget no longer needs and let in-flight requests finish here,
+        # so nothing keeps hitting the site after the crawl returns
+        stopped.set()
+        page_pool.shutdown(wait=True, cancel_futures=True)
+        api_pool.shutdown(wait=True, cancel_futures=True)
     return pages
 
 
+# URL keyword groups for build_context's page categories, matched anywhere in the lower-cased URL
+_URL_ROOM_RE = re.compile(r"room|studio|apartment|flat|accommodation|ensuite|en-suite")
+_URL_ROOM_DETAIL_RE = re.compile(r"detail|info|spec|configuration|option|variant")
+_URL_CONFIG_RE = re.compile(r"configuration|config|option|variant|type|style")
+_URL_VISUAL_RE = re.compile(r"floor\s*plan|layout|diagram|gallery|photo|view")
+_URL_TENANCY_RE = re.compile(r"tenancy|contract|lease|term|duration|agreement")
+_URL_TENANCY_PRICE_RE = re.compile(r"price|cost|fee|rent|deposit|rate")
+_URL_PRICE_RE = re.compile(r"price|pricing|cost|fee|rent|deposit")
+_URL_PRICE_PERIOD_RE = re.compile(r"weekly|monthly|pw|pm|per\s*week|per\s*month")
+_URL_BOOKING_RE = re.compile(r"booking|reservation|availability|apply|enquire")
+_URL_ACADEMIC_RE = re.compile(r"semester|academic\s*year|term|session")
+_URL_ACADEMIC_TENANCY_RE = re.compile(r"tenancy|contract|booking|availability")
+_URL_FEATURES_RE = re.compile(r"feature|amenity|facility|furniture|equipped")
+_URL_POLICIES_RE = re.compile(r"faq|policy|policies|rule|condition|requirement")
+
+
+@functools.lru_cache(maxsize=8192)
+def _classify_url(url: str) -> str:
+    """build_context category of a page, decided from its URL alone."""
+    # Enhanced categorization for Node 3 and 4 priority
+    category = "general"
+    url_l = url.lower()
+    
+    # Configuration-related pages (Node 3 priority)
+    if _URL_ROOM_RE.search(url_l):
+        if _URL_ROOM_DETAIL_RE.search(url_l):
+            category = "room_config_detail"
+        else:
+            category = "room_config"
+    elif _URL_CONFIG_RE.search(url_l):
+        category = "room_config"
+    elif _URL_VISUAL_RE.search(url_l):
+        category = "room_visual"
+    
+    # Tenancy and pricing pages (Node 4 priority)
+    elif _URL_TENANCY_RE.search(url_l):
+        if _URL_TENANCY_PRICE_RE.search(url_l):
+            category = "tenancy_pricing"
+        else:
+            category = "tenancy"
+    elif _URL_PRICE_RE.search(url_l):
+        if _URL_PRICE_PERIOD_RE.search(url_l):
+            category = "tenancy_pricing"
+        else:
+            category = "pricing"
+    elif _URL_BOOKING_RE.search(url_l):
+        category = "tenancy"
+    
+    # Semester and academic year specific
+    elif _URL_ACADEMIC_RE.search(url_l):
+        if _URL_ACADEMIC_TENANCY_RE.search(url_l):
+            category = "tenancy_academic"
+        else:
+            category = "academic"
+    
+    # Features and amenities
+    elif _URL_FEATURES_RE.search(url_l):
+        category = "features"
+    
+    # Policies and information
+    elif _URL_POLICIES_RE.search(url_l):
+        category = "policies"
+    
+    return category
+
+
+# Enhanced priority system for Node 3 and 4
+_CATEGORY_PRIORITY = {
+    # Highest priority for configuration and tenancy
+    "room_config_detail": 1,      # Detailed room configuration pages
+    "tenancy_pricing": 2,         # Tenancy with pricing information
+    "tenancy_academic": 3,        # Academic year specific tenancy
+    "room_config": 4,             # General room configuration
+    "tenancy": 5,                 # General tenancy information
+    "pricing": 6,                 # General pricing information
+    "room_visual": 7,             # Floor plans, photos, layouts
+    "academic": 8,                # Academic information
+    "features": 9,                # Features and amenities
+    "policies": 10,               # Policies and rules
+    "general": 99                 # Everything else
+}
+
+# Enhanced allocation strategy for configuration and tenancy: each page gets max_chars // divisor
+_CATEGORY_ALLOCATION_DIVISORS = {
+    "room_config_detail": 5,      # Maximum allocation for detailed configs
+    "tenancy_pricing": 5,         # Maximum allocation for tenancy with pricing
+    "tenancy_academic": 6,        # High allocation for academic tenancy
+    "room_config": 6,             # High allocation for room configs
+    "tenancy": 7,                 # Good allocation for tenancy
+    "pricing": 7,                 # Good allocation for pricing
+    "room_visual": 8,             # Moderate for visual content
+    "academic": 9,                # Moderate for academic info
+    "features": 10,               # Lower for features
+    "policies": 12,               # Lower for policies
+    "general": 15                 # Lowest for general content
+}
+
+_CATEGORY_HEADER_PREFIXES = {category: f"\n\n=== {category.upper()}: " for category in _CATEGORY_PRIORITY}
+
+
 def build_context(pages: List[Dict[str, str]], max_chars: int = 120000) -> str:
     """Build a concatenated context string from crawled pages, capped by size."""
-    # First pass: extract and categorize content from pages
+    if not pages:
+        return ""
+    # The first crawled page is the main page; it goes first and is not categorized
+    main_page = pages[0]
+    
+    # First pass: extract and categorize content from the other pages
     categorized_pages = []
-    for p in pages:
+    for p in pages[1:]:
         url = p['url']
         text = p['text']
         
-        # Enhanced categorization for Node 3 and 4 priority
-        category = "general"
-        
-        # Configuration-related pages (Node 3 priority)
-        if any(kw in url.lower() for kw in ["room", "studio", "apartment", "flat", "accommodation", "ensuite", "en-suite"]):
-            if any(kw in url.lower() for kw in ["detail", "info", "spec", "configuration", "option", "variant"]):
-                category = "room_config_detail"
-            else:
-                category = "room_config"
-        elif any(kw in url.lower() for kw in ["configuration", "config", "option", "variant", "type", "style"]):
-            category = "room_config"
-        elif any(kw in url.lower() for kw in ["floor\\s*plan", "layout", "diagram", "gallery", "photo", "view"]):
-            category = "room_visual"
-        
-        # Tenancy and pricing pages (Node 4 priority)
-        elif any(kw in url.lower() for kw in ["tenancy", "contract", "lease", "term", "duration", "agreement"]):
-            if any(kw in url.lower() for kw in ["price", "cost", "fee", "rent", "deposit", "rate"]):
-                category = "tenancy_pricing"
-            else:
-                category = "tenancy"
-        elif any(kw in url.lower() for kw in ["price", "pricing", "cost", "fee", "rent", "deposit"]):
-            if any(kw in url.lower() for kw in ["weekly", "monthly", "pw", "pm", "per\\s*week", "per\\s*month"]):
-                category = "tenancy_pricing"
-            else:
-                category = "pricing"
-        elif any(kw in url.lower() for kw in ["booking", "reservation", "availability", "apply", "enquire"]):
-            category = "tenancy"
-        
-        # Semester and academic year specific
-        elif any(kw in url.lower() for kw in ["semester", "academic\\s*year", "term", "session"]):
-            if any(kw in url.lower() for kw in ["tenancy", "contract", "booking", "availability"]):
-                category = "tenancy_academic"
-            else:
-                category = "academic"
-        
-        # Features and amenities
-        elif any(kw in url.lower() for kw in ["feature", "amenity", "facility", "furniture", "equipped"]):
-            category = "features"
-        
-        # Policies and information
-        elif any(kw in url.lower() for kw in ["faq", "policy", "policies", "rule", "condition", "requirement"]):
-            category = "policies"
-        
-        categorized_pages.append({"url": url, "text": text, "category": category})
-    
-    # Enhanced priority system for Node 3 and 4
-    category_priority = {
-        # Highest priority for configuration and tenancy
-        "room_config_detail": 1,      # Detailed room configuration pages
-        "tenancy_pricing": 2,         # Tenancy with pricing information
-        "tenancy_academic": 3,        # Academic year specific tenancy
-        "room_config": 4,             # General room configuration
-        "tenancy": 5,                 # General tenancy information
-        "pricing": 6,                 # General pricing information
-        "room_visual": 7,             # Floor plans, photos, layouts
-        "academic": 8,                # Academic information
-        "features": 9,                # Features and amenities
-        "policies": 10,               # Policies and rules
-        "general": 99                 # Everything else
-    }
-    categorized_pages.sort(key=lambda x: category_priority.get(x["category"], 99))
+        category = _classify_url(url)
+        categorized_pages.append(
+            {"url": url, "text": text, "category": category, "_pri": _CATEGORY_PRIORITY.get(category, 99)}
+        )
+    
+    categorized_pages.sort(key=itemgetter("_pri"))
     
     # Build context with priority to important categories
     parts: List[str] = []
     used = 0
     
     # Add main page first
-    main_page = next((p for p in categorized_pages if p["url"] == pages[0]["url"]), None)
-    if main_page:
-        header = f"\n\n=== MAIN PAGE: {main_page['url']} ===\n"
-        chunk = header + main_page["text"][: max(0, max_chars // 4)]  # Allocate up to 1/4 for main page
-        parts.append(chunk)
-        used += len(chunk)
-        categorized_pages.remove(main_page)
+    header = f"\n\n=== MAIN PAGE: {main_page['url']} ===\n"
+    chunk = header + main_page["text"][: max(0, max_chars // 4)]  # Allocate up to 1/4 for main page
+    parts.append(chunk)
+    used += len(chunk)
     
     # Enhanced allocation for Node 3 and 4 priority categories
     for p in categorized_pages:
         if used >= max_chars:
             break
             
-        header = f"\n\n=== {p['category'].upper()}: {p['url']} ===\n"
-        
-        # Enhanced allocation strategy for configuration and tenancy
-        category_allocation = {
-            "room_config_detail": max_chars // 5,      # Maximum allocation for detailed configs
-            "tenancy_pricing": max_chars // 5,         # Maximum allocation for tenancy with pricing
-            "tenancy_academic": max_chars // 6,        # High allocation for academic tenancy
-            "room_config": max_chars // 6,             # High allocation for room configs
-            "tenancy": max_chars // 7,                 # Good allocation for tenancy
-            "pricing": max_chars // 7,                 # Good allocation for pricing
-            "room_visual": max_chars // 8,             # Moderate for visual content
-            "academic": max_chars // 9,                # Moderate for academic info
-            "features": max_chars // 10,               # Lower for features
-            "policies": max_chars // 12,               # Lower for policies
-            "general": max_chars // 15                 # Lowest for general content
-        }
-        
-        allocation = category_allocation.get(p["category"], max_chars // 10)
-        chunk = header + p["text"][: max(0, min(allocation, max_chars - used - len(header)))]
-        if not chunk:
-            continue
-        parts.append(chunk)
-        used += len(chunk)
+        header = _CATEGORY_HEADER_PREFIXES[p["category"]] + p["url"] + " ===\n"
+        remaining = max_chars - used - len(header)
+        if remaining <= 0:
+            break
+        allocation = max_chars // _CATEGORY_ALLOCATION_DIVISORS.get(p["category"], 10)
+        text = p["text"]
+        take = min(allocation, remaining)
+        parts.append(header)
+        parts.append(text[:take] if take < len(text) else text)
+        used += len(header) + min(take, len(text))
     
     return "".join(parts)
 
@@ -14,7 +14,15 @@ from src.utils.config import get_config
 from src.utils.logging_config import setup_flask_logging, get_logger
 from src.orchestration.job_queue import initialize_job_queue
 import asyncio
+import concurrent.futures
 import threading
+import time
+
+# Seconds a database ping result is reused by /api/health
+DB_PING_INTERVAL = 10.0
+
+# Request threads per gunicorn worker when not running in debug mode
+GUNICORN_THREADS = 8
 
 def create_app():
     """Configure the Flask application"""
@@ -49,47 +57,62 @@ def create_app():
         try:
             loop.run_until_complete(initialize_job_queue())
             get_logger().info("Job queue initialized successfully")
+            # Request handlers hand queue coroutines to this loop instead of spinning up their own
+            app.config['BG_LOOP'] = loop
             loop.run_forever()
         except Exception as e:
             get_logger().error(f"Failed to initialize job queue: {str(e)}")
         finally:
+            app.config.pop('BG_LOOP', None)
             loop.close()
 
     # Start job queue in background
     queue_thread = threading.Thread(target=init_queue, daemon=True)
     queue_thread.start()
 
+    # Last database ping, shared by health probes so they don't each round-trip to the DB
+    db_ping = {'status': None, 'checked_at': 0.0}
+    db_ping_lock = threading.Lock()
+
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """Health check endpoint with orchestration system status"""
-        try:
-            # Test database connection
-            db.session.execute(text('SELECT 1'))
-            db_status = 'healthy'
-        except Exception as e:
-            db_status = f'unhealthy: {str(e)}'
+        with db_ping_lock:
+            if db_ping['status'] is None or time.monotonic() - db_ping['checked_at'] > DB_PING_INTERVAL:
+                try:
+                    # Test database connection
+                    db.session.execute(text('SELECT 1'))
+                    db_ping['status'] = 'healthy'
+                except Exception as e:
+                    db_ping['status'] = f'unhealthy: {str(e)}'
+                db_ping['checked_at'] = time.monotonic()
+            db_status = db_ping['status']
         
         # Validate configuration
-        config_validation = get_config().validate_config()
+        config_validation = get_config().validate_config_cached()
         
         # Check job queue status
         try:
             from src.orchestration.job_queue import get_job_queue
             job_queue = get_job_queue()
             
-            # Use asyncio to get queue stats
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # Ask the queue's own background loop for its stats
+            loop = app.config.get('BG_LOOP')
+            if loop is None:
+                raise RuntimeError('job queue loop is not running')
+            future = asyncio.run_coroutine_threadsafe(job_queue.get_queue_stats(), loop)
             try:
-                stats = loop.run_until_complete(job_queue.get_queue_stats())
-                queue_status = {
-                    'status': 'healthy',
-                    'active_workers': stats.active_workers,
-                    'queue_length': stats.queue_length,
-                    'running_jobs': stats.running_jobs
-                }
-            finally:
-                loop.close()
+                stats = future.result(timeout=2.0)
+            except concurrent.futures.TimeoutError:
+                # Don't leave the stats query running on the queue's loop
+                future.cancel()
+                raise RuntimeError('job queue did not report stats within 2s')
+            queue_status = {
+                'status': 'healthy',
+                'active_workers': stats.active_workers,
+                'queue_length': stats.queue_length,
+                'running_jobs': stats.running_jobs
+            }
         except Exception as e:
             queue_status = {
                 'status': 'unhealthy',
@@ -104,6 +127,20 @@ def create_app():
             'version': '1.0.0'
         })
 
+    # Static files are listed once at startup so serving a path is a set lookup, not a stat call.
+    # An empty listing (nothing built yet, e.g. in development) falls back to checking the disk.
+    static_files = set()
+    if app.static_folder and os.path.isdir(app.static_folder):
+        for root, _, files in os.walk(app.static_folder):
+            for name in files:
+                rel_path = os.path.relpath(os.path.join(root, name), app.static_folder)
+                static_files.add(rel_path.replace(os.sep, '/'))
+
+    def _static_exists(path):
+        if static_files:
+            return path in static_files
+        return os.path.exists(os.path.join(app.static_folder, path))
+
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve(path):
@@ -111,11 +148,10 @@ def create_app():
         if static_folder_path is None:
                 return "Static folder not configured", 404
 
-        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+        if path != "" and _static_exists(path):
             return send_from_directory(static_folder_path, path)
         else:
-            index_path = os.path.join(static_folder_path, 'index.html')
-            if os.path.exists(index_path):
+            if _static_exists('index.html'):
                 return send_from_directory(static_folder_path, 'index.html')
             else:
                 return "index.html not found", 404
@@ -123,11 +159,24 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    app = create_app()
-    logger = get_logger()
-    logger.info("Property Onboarding Tool with Orchestration System startup")
-    
     config = get_config()
-    app.run(host=config.app.host, port=config.app.port, debug=config.app.debug)
-
-
+    if config.app.debug:
+        app = create_app()
+        logger = get_logger()
+        logger.info("Property Onboarding Tool with Orchestration System startup")
+        app.run(host=config.app.host, port=config.app.port, debug=True)
+    else:
+        # The Werkzeug dev server is not built for production traffic; hand
+        # off to gunicorn's threaded workers so health and status polls are
+        # not stuck behind slow requests
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+        os.execv(sys.executable, [
+            sys.executable, '-m', 'gunicorn',
+            '--chdir', project_root,
+            '--workers', os.getenv('WEB_CONCURRENCY', '1'),
+            '--worker-class', 'gthread',
+            '--threads', str(GUNICORN_THREADS),
+            '--timeout', '300',
+            '--bind', f'{config.app.host}:{config.app.port}',
+            'src.main:create_app()',
+        ])
@@ -12,8 +12,15 @@ from src.utils.logging_config import setup_flask_logging, get_logger
 from src.orchestration.job_queue_memory import initialize_job_queue
 from src.storage.memory_store import get_memory_store
 import asyncio
+import logging
 import threading
 
+# Underlying stdlib logger for the per-request hooks
+request_log = get_logger().logger
+
+# Request threads per gunicorn worker when not running in debug mode
+GUNICORN_THREADS = 8
+
 def create_app():
     """Configure the Flask application with in-memory storage"""
     app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
@@ -56,14 +63,16 @@ def create_app():
     @app.before_request
     def _log_request_start():
         try:
-            get_logger().info(f"REQ {request.method} {request.path}")
+            if request_log.isEnabledFor(logging.INFO):
+                request_log.info("REQ %s %s", request.method, request.path)
         except Exception:
             pass
 
     @app.after_request
     def _log_request_end(response):
         try:
-            get_logger().info(f"RES {response.status_code} {response.content_type}")
+            if request_log.isEnabledFor(logging.INFO):
+                request_log.info("RES %s %s", response.status_code, response.content_type)
         except Exception:
             pass
         return response
@@ -72,7 +81,7 @@ def create_app():
     def health_check():
         """Lightweight health endpoint; always 200 with diagnostics."""
         cfg = get_config()
-        validation = cfg.validate_config()
+        validation = cfg.validate_config_cached()
         diagnostics = {
             'status': 'healthy' if validation.get('valid') else 'unhealthy',
             'configuration': {
@@ -92,10 +101,24 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    app = create_app()
-    logger = get_logger()
-    logger.info("Property Onboarding Tool with In-Memory Storage startup")
-    
     config = get_config()
-    app.run(host=config.app.host, port=config.app.port, debug=config.app.debug)
-
+    if config.app.debug:
+        app = create_app()
+        logger = get_logger()
+        logger.info("Property Onboarding Tool with In-Memory Storage startup")
+        app.run(host=config.app.host, port=config.app.port, debug=True)
+    else:
+        # The Werkzeug dev server is not built for production traffic; hand
+        # off to gunicorn's threaded workers so health and status polls are
+        # not stuck behind slow requests
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+        os.execv(sys.executable, [
+            sys.executable, '-m', 'gunicorn',
+            '--chdir', project_root,
+            '--workers', os.getenv('WEB_CONCURRENCY', '1'),
+            '--worker-class', 'gthread',
+            '--threads', str(GUNICORN_THREADS),
+            '--timeout', '300',
+            '--bind', f'{config.app.host}:{config.app.port}',
+            'src.main_memory:create_app()',
+        ])
@@ -1,10 +1,37 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import deferred
 from datetime import datetime
 import json
 from enum import Enum
 
 db = SQLAlchemy()
 
+# JSON text columns go through orjson's C codec when installed
+try:
+    import orjson
+
+    def _json_loads(raw):
+        return orjson.loads(raw)
+
+    def _json_dumps(data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder still accepts
+            return json.dumps(data)
+
+    def _json_dumps_default(data, default):
+        try:
+            return orjson.dumps(data, default=default, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return json.dumps(data, default=default, sort_keys=True, separators=(',', ':')).encode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+    def _json_dumps_default(data, default):
+        return json.dumps(data, default=default, sort_keys=True, separators=(',', ':')).encode()
+
 class ExtractionStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -22,6 +49,10 @@ class NodeStatus(Enum):
 class PropertyExtractionJob(db.Model):
     """Main table for tracking property extraction jobs"""
     __tablename__ = 'property_extraction_jobs'
+    __table_args__ = (
+        # Queue/status filters and newest-first listings
+        db.Index('ix_jobs_status_created', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     url = db.Column(db.Text, nullable=False)
@@ -31,19 +62,19 @@ class PropertyExtractionJob(db.Model):
     completed_at = db.Column(db.DateTime)
     error_message = db.Column(db.Text)
     
-    # Extracted data storage
-    basic_info_data = db.Column(db.Text)  # JSON string
-    description_data = db.Column(db.Text)  # JSON string
-    configuration_data = db.Column(db.Text)  # JSON string
-    tenancy_data = db.Column(db.Text)  # JSON string
-    merged_data = db.Column(db.Text)  # JSON string - final merged result
+    # Extracted data storage, loaded together on first access (or up front with undefer_group('payload'))
+    basic_info_data = deferred(db.Column(db.Text), group='payload')  # JSON string
+    description_data = deferred(db.Column(db.Text), group='payload')  # JSON string
+    configuration_data = deferred(db.Column(db.Text), group='payload')  # JSON string
+    tenancy_data = deferred(db.Column(db.Text), group='payload')  # JSON string
+    merged_data = deferred(db.Column(db.Text), group='payload')  # JSON string - final merged result
     
     # Metadata
     extraction_duration = db.Column(db.Float)  # Duration in seconds
     accuracy_score = db.Column(db.Float)  # Quality score 0-1
     
-    # Relationships
-    node_executions = db.relationship('NodeExecution', backref='job', lazy=True, cascade='all, delete-orphan')
+    # Relationships; to_dict always walks node_executions, so load them for all jobs in one IN query
+    node_executions = db.relationship('NodeExecution', backref='job', lazy='selectin', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<PropertyExtractionJob {self.id}: {self.url[:50]}...>'
@@ -59,37 +90,42 @@ class PropertyExtractionJob(db.Model):
             'error_message': self.error_message,
             'extraction_duration': self.extraction_duration,
             'accuracy_score': self.accuracy_score,
-            'basic_info_data': json.loads(self.basic_info_data) if self.basic_info_data else None,
-            'description_data': json.loads(self.description_data) if self.description_data else None,
-            'configuration_data': json.loads(self.configuration_data) if self.configuration_data else None,
-            'tenancy_data': json.loads(self.tenancy_data) if self.tenancy_data else None,
-            'merged_data': json.loads(self.merged_data) if self.merged_data else None,
+            'basic_info_data': _json_loads(self.basic_info_data) if self.basic_info_data else None,
+            'description_data': _json_loads(self.description_data) if self.description_data else None,
+            'configuration_data': _json_loads(self.configuration_data) if self.configuration_data else None,
+            'tenancy_data': _json_loads(self.tenancy_data) if self.tenancy_data else None,
+            'merged_data': _json_loads(self.merged_data) if self.merged_data else None,
             'node_executions': [node.to_dict() for node in self.node_executions]
         }
     
     def set_basic_info_data(self, data):
         """Set basic info data as JSON string"""
-        self.basic_info_data = json.dumps(data) if data else None
+        self.basic_info_data = _json_dumps(data) if data else None
     
     def set_description_data(self, data):
         """Set description data as JSON string"""
-        self.description_data = json.dumps(data) if data else None
+        self.description_data = _json_dumps(data) if data else None
     
     def set_configuration_data(self, data):
         """Set configuration data as JSON string"""
-        self.configuration_data = json.dumps(data) if data else None
+        self.configuration_data = _json_dumps(data) if data else None
     
     def set_tenancy_data(self, data):
         """Set tenancy data as JSON string"""
-        self.tenancy_data = json.dumps(data) if data else None
+        self.tenancy_data = _json_dumps(data) if data else None
     
     def set_merged_data(self, data):
         """Set merged data as JSON string"""
-        self.merged_data = json.dumps(data) if data else None
+        self.merged_data = _json_dumps(data) if data else None
 
 class NodeExecution(db.Model):
     """Table for tracking individual node execution details"""
     __tablename__ = 'node_executions'
+    __table_args__ = (
+        # Per-job node lookups (also serves job_id alone) and status dashboards
+        db.Index('ix_node_exec_job_name', 'job_id', 'node_name'),
+        db.Index('ix_node_exec_status', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('property_extraction_jobs.id'), nullable=False)
@@ -99,9 +135,9 @@ class NodeExecution(db.Model):
     completed_at = db.Column(db.DateTime)
     execution_duration = db.Column(db.Float)  # Duration in seconds
     
-    # Execution details
-    prompt_used = db.Column(db.Text)  # The prompt sent to GPT-4o
-    raw_response = db.Column(db.Text)  # Raw response from GPT-4o
+    # Execution details; the prompt and raw response are not part of to_dict, so load them on access
+    prompt_used = deferred(db.Column(db.Text), group='transcript')  # The prompt sent to GPT-4o
+    raw_response = deferred(db.Column(db.Text), group='transcript')  # Raw response from GPT-4o
     extracted_data = db.Column(db.Text)  # Parsed JSON data
     error_message = db.Column(db.Text)
     retry_count = db.Column(db.Integer, default=0)
@@ -122,7 +158,7 @@ class NodeExecution(db.Model):
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'execution_duration': self.execution_duration,
-            'extracted_data': json.loads(self.extracted_data) if self.extracted_data else None,
+            'extracted_data': _json_loads(self.extracted_data) if self.extracted_data else None,
             'error_message': self.error_message,
             'retry_count': self.retry_count,
             'confidence_score': self.confidence_score,
@@ -131,7 +167,7 @@ class NodeExecution(db.Model):
     
     def set_extracted_data(self, data):
         """Set extracted data as JSON string"""
-        self.extracted_data = json.dumps(data) if data else None
+        self.extracted_data = _json_dumps(data) if data else None
 
 class CompetitorAnalysis(db.Model):
     """Table for storing competitor property analysis"""
@@ -157,14 +193,14 @@ class CompetitorAnalysis(db.Model):
             'job_id': self.job_id,
             'competitor_url': self.competitor_url,
             'competitor_name': self.competitor_name,
-            'extracted_data': json.loads(self.extracted_data) if self.extracted_data else None,
+            'extracted_data': _json_loads(self.extracted_data) if self.extracted_data else None,
             'similarity_score': self.similarity_score,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
     
     def set_extracted_data(self, data):
         """Set extracted data as JSON string"""
-        self.extracted_data = json.dumps(data) if data else None
+        self.extracted_data = _json_dumps(data) if data else None
 
 class SystemConfiguration(db.Model):
     """Table for storing system configuration and settings"""
@@ -188,3 +224,12 @@ class SystemConfiguration(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+def _model_default(obj):
+    """Encoder hook that serializes model instances through their to_dict"""
+    if isinstance(obj, (PropertyExtractionJob, NodeExecution, CompetitorAnalysis, SystemConfiguration)):
+        return obj.to_dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def dumps_models(data):
+    """Encode data that may contain model instances straight to JSON bytes"""
+    return _json_dumps_default(data, _model_default)
@@ -291,13 +291,11 @@ class AsyncOrchestrationEngine:
                     await asyncio.sleep(node_task.retry_delay * attempt)  # Exponential backoff
                 
                 # Execute extraction in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    self.thread_pool,
-                    self.extraction_client.extract_property_data,
+                result = await self.extraction_client.extract_property_data_async(
                     node_task.url,
                     node_task.node_name,
-                    node_task.job_id
+                    node_task.job_id,
+                    executor=self.thread_pool
                 )
                 
                 # Update node execution with results
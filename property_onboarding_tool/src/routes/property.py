@@ -1,12 +1,13 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from flask_cors import cross_origin
 from src.models.property import (
     PropertyExtractionJob, NodeExecution, CompetitorAnalysis, 
-    ExtractionStatus, NodeStatus, db
+    ExtractionStatus, NodeStatus, db, dumps_models
 )
 from src.orchestration.job_queue import get_job_queue, JobPriority
 from src.orchestration.async_engine import ExecutionStrategy
 from src.orchestration.progress_tracker import get_progress_tracker
+from sqlalchemy.orm import selectinload, undefer_group
 from datetime import datetime
 import validators
 import asyncio
@@ -144,14 +145,20 @@ def get_extraction_jobs():
             except ValueError:
                 return jsonify({'error': f'Invalid status: {status}'}), 400
         
-        jobs = query.order_by(PropertyExtractionJob.created_at.desc()).offset(offset).limit(limit).all()
+        # to_dict reads every payload column and node execution, so fetch them with the page instead of one query per job
+        jobs = (
+            query.options(undefer_group('payload'), selectinload(PropertyExtractionJob.node_executions))
+            .order_by(PropertyExtractionJob.created_at.desc()).offset(offset).limit(limit).all()
+        )
         
-        return jsonify({
-            'jobs': [job.to_dict() for job in jobs],
+        # Jobs are handed to the encoder as-is; each row is converted once, in the encoder's default hook
+        body = dumps_models({
+            'jobs': jobs,
             'total': query.count(),
             'limit': limit,
             'offset': offset
-        }), 200
+        })
+        return Response(body, status=200, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': f'Failed to retrieve jobs: {str(e)}'}), 500
@@ -1,4 +1,6 @@
 import os
+import time
+import threading
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -55,6 +57,9 @@ class ConfigManager:
         self._api_config = None
         self._database_config = None
         self._app_config = None
+        self._validation = None
+        self._validation_at = 0.0
+        self._validation_lock = threading.Lock()
     
     @property
     def extraction(self) -> ExtractionConfig:
@@ -154,6 +159,15 @@ class ConfigManager:
             }
         }
 
+    def validate_config_cached(self, max_age_seconds: float = 5.0) -> Dict[str, Any]:
+        """validate_config() result, reused for up to max_age_seconds (health probes call it per request)"""
+        with self._validation_lock:
+            now = time.monotonic()
+            if self._validation is None or now - self._validation_at > max_age_seconds:
+                self._validation = self.validate_config()
+                self._validation_at = now
+            return self._validation
+
 # Global configuration instance
 config = ConfigManager()
 
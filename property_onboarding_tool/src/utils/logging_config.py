@@ -1,6 +1,8 @@
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from datetime import datetime
 from typing import Optional
 
@@ -72,6 +74,18 @@ class PropertyExtractionLogger:
         )
         error_handler.setFormatter(error_formatter)
         self.logger.addHandler(error_handler)
+        
+        # Hand records to a background listener so callers never block on
+        # formatting or file I/O; the listener fans out to the handlers above
+        handlers = self.logger.handlers[:]
+        self.logger.handlers.clear()
+        log_queue = queue.Queue(-1)
+        self.listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     def log_job_start(self, job_id: int, url: str):
         """Log the start of an extraction job"""